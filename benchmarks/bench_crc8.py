@@ -0,0 +1,36 @@
+"""
+benchmark for compute_crc8_atm
+
+compares the table driven CRC8 with the former bit by bit implementation
+for the frame lengths used by the UART communication
+"""
+
+import timeit
+from src.tmc_driver.com._tmc_com import compute_crc8_atm
+
+
+def compute_crc8_atm_bitwise(datagram, initial_value=0):
+    """bit by bit reference implementation"""
+    crc = initial_value
+    for byte in datagram:
+        for _ in range(0, 8):
+            if (crc >> 7) ^ (byte & 0x01):
+                crc = ((crc << 1) ^ 0x07) & 0xFF
+            else:
+                crc = (crc << 1) & 0xFF
+            byte = byte >> 1
+    return crc
+
+
+def main():
+    """runs the benchmark for read (3 bytes) and write/reply (7 bytes) frames"""
+    for name, frame in [("read frame", [0x55, 0, 0x6F]),
+                        ("write frame", [0x55, 0, 0xEC, 0x10, 0x00, 0x01, 0x00])]:
+        for impl in [compute_crc8_atm_bitwise, compute_crc8_atm]:
+            number = 100000
+            duration = timeit.timeit(lambda f=impl, d=frame: f(d), number=number)
+            print(f"{name:12} {impl.__name__:26} {duration / number * 1e9:8.0f} ns/call")
+
+
+if __name__ == '__main__':
+    main()
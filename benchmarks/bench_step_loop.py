@@ -0,0 +1,56 @@
+#pylint: disable=protected-access
+"""
+benchmark for the STEP/DIR step loop
+
+measures how many calls of make_a_step and run_speed per second
+are possible without the step interval, using the mock GPIO.
+The result shows the overhead of the Python step path,
+e.g. the cost of logging with loglevel INFO and MOVEMENT
+"""
+
+import time
+import logging
+from src.tmc_driver.tmc_2209 import *
+
+
+def bench_make_a_step(tmc:Tmc2209, duration:float = 1.0) -> float:
+    """returns the calls of make_a_step per second"""
+    tmc_mc = tmc.tmc_mc
+    tmc_mc._min_pulse_width = 0
+    count = 0
+    end = time.perf_counter() + duration
+    while time.perf_counter() < end:
+        for _ in range(1000):
+            tmc_mc.make_a_step()
+        count += 1000
+    return count / duration
+
+
+def bench_run_speed(tmc:Tmc2209, duration:float = 1.0) -> float:
+    """returns the steps per second made by run_speed with the smallest possible interval"""
+    tmc_mc = tmc.tmc_mc
+    tmc_mc._min_pulse_width = 0
+    tmc_mc._step_interval = 0.001
+    tmc_mc._last_step_time = 0
+    tmc_mc.current_pos = 0
+    end = time.perf_counter() + duration
+    while time.perf_counter() < end:
+        for _ in range(1000):
+            tmc_mc.run_speed()
+    return abs(tmc_mc.current_pos) / duration
+
+
+def main():
+    """runs the benchmark for loglevel INFO and MOVEMENT"""
+    for loglevel in [Loglevel.INFO, Loglevel.MOVEMENT]:
+        tmc = Tmc2209(None, TmcMotionControlStepDir(16, 20), loglevel=Loglevel.INFO,
+                      log_handlers=[logging.NullHandler()])
+        tmc.tmc_logger.loglevel = loglevel
+        print(f"{loglevel.name:10} make_a_step: {bench_make_a_step(tmc):12.0f} 1/s"
+              f" | run_speed: {bench_run_speed(tmc):12.0f} steps/s")
+        tmc.set_deinitialize_true()
+        del tmc
+
+
+if __name__ == '__main__':
+    main()
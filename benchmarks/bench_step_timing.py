@@ -0,0 +1,42 @@
+"""
+benchmark for the step timing of TmcMotionControlStepDir
+
+records the STEP/DIR outputs of a movement with the Mock.GPIO backend
+and compares the step times with the precomputed ramp.
+Shows the jitter, the missed deadlines and the max achieved step rate
+for increasing max speeds
+"""
+
+import logging
+from src.tmc_driver.tmc_2209 import *
+from src.tmc_driver.motion_control._tmc_mc_ramp import compute_ramp
+from src.tmc_driver.sim._tmc_sim_motor import TmcGpioRecorder, TmcSimMotor
+
+
+def bench(tmc:Tmc2209, max_speed:int, steps:int = 2000) -> dict:
+    """returns the timing stats of one movement with the given max speed in steps/s"""
+    tmc_mc = tmc.tmc_mc
+    tmc_mc.max_speed = max_speed
+    tmc_mc.acceleration = max_speed * 4
+    motor = TmcSimMotor(tmc_mc.pin_step, tmc_mc.pin_dir, tmc_mc.current_pos)
+    with TmcGpioRecorder() as recorder:
+        tmc_mc.run_to_position_steps(steps, MovementAbsRel.RELATIVE)
+    motor.feed(recorder.edges)
+    plan = compute_ramp(steps, tmc_mc.max_speed, tmc_mc.acceleration)
+    return motor.timing_stats(plan.intervals)
+
+
+def main():
+    """runs the benchmark for several max speeds"""
+    tmc = Tmc2209(None, TmcMotionControlStepDir(16, 20), loglevel=Loglevel.INFO,
+                  log_handlers=[logging.NullHandler()])
+    for max_speed in [1000, 5000, 10000, 20000, 50000]:
+        stats = bench(tmc, max_speed)
+        print(f"{max_speed:6} steps/s | achieved: {stats['max_step_rate']:8.0f} steps/s"
+              f" | jitter rms: {stats['jitter_rms_us']:7.2f} µs | max: {stats['jitter_max_us']:8.2f} µs"
+              f" | missed deadlines: {stats['missed_deadlines']:4}")
+    tmc.set_deinitialize_true()
+
+
+if __name__ == '__main__':
+    main()
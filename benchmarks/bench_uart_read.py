@@ -0,0 +1,46 @@
+"""
+benchmark for the UART register access latency
+
+a pseudo terminal emulates a TMC2209 on the other end of the serial port.
+It answers read requests with the timing of the given baudrate
+(echo of the request, SENDDELAY and reply), so the latency of
+TmcComUart.read_int and write_reg can be measured without hardware
+"""
+
+import time
+from src.tmc_driver._tmc_logger import TmcLogger, Loglevel
+from src.tmc_driver.com._tmc_com_uart import TmcComUart
+from src.tmc_driver.sim._tmc_sim_device import TmcSim2209
+from src.tmc_driver.sim._tmc_sim_io import TmcSimPty
+
+
+def bench(baudrate:int, number:int = 200):
+    """returns the mean duration of read_int and write_reg in ms"""
+    sim_pty = TmcSimPty([TmcSim2209(0)], baudrate)
+    tmc_com = TmcComUart(sim_pty.port, baudrate, 0, TmcLogger(Loglevel.ERROR, "bench"))
+    tmc_com.init()
+
+    start = time.perf_counter()
+    for _ in range(number):
+        tmc_com.read_int(0x6C)
+    read_ms = (time.perf_counter() - start) / number * 1000
+
+    start = time.perf_counter()
+    for _ in range(number):
+        tmc_com.write_reg(0x10, 0x1F10)
+    write_ms = (time.perf_counter() - start) / number * 1000
+
+    tmc_com.ser.close()
+    sim_pty.close()
+    return read_ms, write_ms
+
+
+def main():
+    """runs the benchmark for 115200 and 460800 baud"""
+    for baudrate in [115200, 460800]:
+        read_ms, write_ms = bench(baudrate)
+        print(f"{baudrate:7} baud | read_int: {read_ms:6.3f} ms | write_reg: {write_ms:6.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,270 @@
+#pylint: disable=protected-access
+"""
+benchmark suite
+
+runs reproducible scenarios on plain Linux with the Mock.GPIO backend
+and the simulated drivers and saves the results as JSON,
+so that runs can be compared across versions:
+
+    python -m benchmarks.run_benchmarks [--quick] [--output FILE]
+    python -m benchmarks.run_benchmarks --compare OLD.json NEW.json
+
+scenarios:
+    step_dir, step_pwm_dir: planning time, max sustainable steps/s, CPU time per step
+        and step interval jitter for every ramp profile and microstep resolution
+    vactual: VACTUAL updates per second through the UART stack (simulated TMC2209)
+    step_loop, crc8, uart_read: the single benchmarks of this folder
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import platform
+import subprocess
+import statistics
+import configparser
+from datetime import datetime, timezone
+from src.tmc_driver.tmc_2209 import *
+from src.tmc_driver.motion_control._tmc_mc_ramp import compute_ramp, compute_scurve_ramp
+from src.tmc_driver.sim._tmc_sim_device import TmcSim2209
+from src.tmc_driver.sim._tmc_sim_io import TmcSimSerial
+from src.tmc_driver.sim._tmc_sim_motor import TmcGpioRecorder, TmcSimMotor
+from . import bench_step_loop, bench_crc8, bench_uart_read
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROFILES = {
+    "trapezoid":    lambda acceleration: TmcRampTrapezoid(),
+    "scurve":       lambda acceleration: TmcRampSCurve(acceleration * 10),
+}
+MOTION_CONTROLS = {
+    "step_dir":     TmcMotionControlStepDir,
+    "step_pwm_dir": TmcMotionControlStepPwmDir,
+}
+MRES = [1, 16, 256]
+MRES_QUICK = [16]
+MAX_SPEED_FULLSTEP = 200                # 1 revolution per second for the jitter measurement
+ACCELERATION_FULLSTEP = 800
+
+
+def create_tmc(tmc_mc = None, tmc_com = None) -> Tmc2209:
+    """returns a Tmc2209 without log output"""
+    return Tmc2209(None, tmc_mc, tmc_com, loglevel=Loglevel.INFO, log_handlers=[logging.NullHandler()])
+
+
+def percentiles(values:list) -> dict:
+    """returns the 50th, 90th and 99th percentile and the max of the values"""
+    if len(values) < 2:
+        return {"p50": None, "p90": None, "p99": None, "max": None}
+    cuts = statistics.quantiles(values, n=100, method="inclusive")
+    return {"p50": cuts[49], "p90": cuts[89], "p99": cuts[98], "max": max(values)}
+
+
+def bench_planning(profile:TmcRampProfile, distance:int, max_speed:float, acceleration:float,
+                   number:int) -> float:
+    """returns the median time in µs to compute an uncached ramp"""
+    durations = []
+    for _ in range(number):
+        compute_ramp.cache_clear()
+        compute_scurve_ramp.cache_clear()
+        start = time.perf_counter_ns()
+        profile.compute(distance, max_speed, acceleration)
+        durations.append((time.perf_counter_ns() - start) / 1000)
+    return statistics.median(durations)
+
+
+def bench_max_rate(tmc:Tmc2209, create_profile, distance:int) -> dict:
+    """runs a movement, which cannot reach its max speed, so that the step loop never waits.
+    Returns the achieved steps/s and the CPU time per step
+    """
+    tmc_mc = tmc.tmc_mc
+    tmc_mc.max_speed = 1000000
+    tmc_mc.acceleration = 10000000000
+    profile = create_profile(tmc_mc.acceleration)
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    tmc_mc.run_to_position_steps(distance, MovementAbsRel.RELATIVE, profile)
+    wall = time.perf_counter() - wall
+    cpu = time.process_time() - cpu
+    return {"max_steps_per_s": distance / wall, "cpu_per_step_us": cpu / distance * 1e6}
+
+
+def bench_jitter(tmc:Tmc2209, profile:TmcRampProfile, distance:int) -> dict:
+    """runs one movement at MAX_SPEED_FULLSTEP and returns the step interval jitter in µs"""
+    tmc_mc = tmc.tmc_mc
+    tmc_mc.max_speed_fullstep = MAX_SPEED_FULLSTEP
+    tmc_mc.acceleration_fullstep = ACCELERATION_FULLSTEP
+    motor = TmcSimMotor(tmc_mc.pin_step, tmc_mc.pin_dir, tmc_mc.current_pos)
+    with TmcGpioRecorder() as recorder:
+        tmc_mc.run_to_position_steps(distance, MovementAbsRel.RELATIVE, profile)
+    motor.feed(recorder.edges)
+    plan = profile.compute(distance, tmc_mc.max_speed, tmc_mc.acceleration)
+    errors, lateness = motor.deviations(plan.intervals)
+    stats = motor.timing_stats(plan.intervals)
+    return {
+        "steps_per_s": tmc_mc.max_speed,
+        "jitter_us": percentiles([abs(e) for e in errors]),
+        "lateness_us": percentiles(lateness),
+        "missed_deadlines": stats["missed_deadlines"],
+    }
+
+
+def bench_step_scenarios(quick:bool) -> list:
+    """runs the STEP/DIR and STEP_PWM/DIR scenarios"""
+    results = []
+    for name, motion_control in MOTION_CONTROLS.items():
+        tmc = create_tmc(motion_control(16, 20))
+        for mres in MRES_QUICK if quick else MRES:
+            tmc.tmc_mc.mres = mres
+            distance = tmc.tmc_mc.steps_per_rev
+            for profile_name, create_profile in PROFILES.items():
+                acceleration = ACCELERATION_FULLSTEP * mres
+                profile = create_profile(acceleration)
+                metrics = {
+                    "planning_time_us": bench_planning(profile, distance, MAX_SPEED_FULLSTEP * mres,
+                                                       acceleration, 3 if quick else 10)
+                }
+                metrics.update(bench_max_rate(tmc, create_profile, min(distance, 20000)))
+                metrics.update(bench_jitter(tmc, profile, distance))
+                results.append({"scenario": name, "profile": profile_name, "mres": mres, "metrics": metrics})
+                print(f"{name:13} {profile_name:10} mres {mres:3} | "
+                      f"planning: {metrics['planning_time_us']:9.1f} µs | "
+                      f"max: {metrics['max_steps_per_s']:9.0f} steps/s | "
+                      f"cpu: {metrics['cpu_per_step_us']:6.2f} µs/step | "
+                      f"jitter p99: {metrics['jitter_us']['p99'] or 0:8.1f} µs")
+        tmc.set_deinitialize_true()
+    return results
+
+
+def bench_vactual(quick:bool) -> list:
+    """measures the VACTUAL updates per second through the UART stack with a simulated TMC2209"""
+    results = []
+    number = 200 if quick else 1000
+    for realtime in [False, True]:
+        for cache in [False, True]:
+            tmc_com = TmcComUart(None, 115200)
+            tmc_com.ser = TmcSimSerial([TmcSim2209(0)], 115200, realtime)
+            tmc = create_tmc(TmcMotionControlVActual(), tmc_com)
+            tmc.set_register_cache(cache)
+            wall = time.perf_counter()
+            cpu = time.process_time()
+            for i in range(number):
+                tmc.tmc_mc.set_vactual(i % 2 * 1000)
+            wall = time.perf_counter() - wall
+            cpu = time.process_time() - cpu
+            metrics = {"updates_per_s": number / wall, "cpu_per_update_us": cpu / number * 1e6}
+            results.append({"scenario": "vactual", "realtime": realtime, "cache": cache, "metrics": metrics})
+            print(f"vactual       realtime {realtime!s:5} cache {cache!s:5} | "
+                  f"{metrics['updates_per_s']:9.0f} updates/s | cpu: {metrics['cpu_per_update_us']:7.1f} µs/update")
+            tmc.set_deinitialize_true()
+    return results
+
+
+def bench_single(quick:bool) -> list:
+    """runs the single benchmarks of this folder"""
+    results = []
+    tmc = create_tmc(TmcMotionControlStepDir(16, 20))
+    duration = 0.2 if quick else 1.0
+    results.append({"scenario": "step_loop", "metrics": {
+        "make_a_step_per_s": bench_step_loop.bench_make_a_step(tmc, duration),
+        "run_speed_steps_per_s": bench_step_loop.bench_run_speed(tmc, duration)}})
+    tmc.set_deinitialize_true()
+
+    number = 10000 if quick else 100000
+    frame = [0x55, 0, 0xEC, 0x10, 0x00, 0x01, 0x00]
+    start = time.perf_counter()
+    for _ in range(number):
+        bench_crc8.compute_crc8_atm(frame)
+    results.append({"scenario": "crc8", "metrics": {"write_frame_ns": (time.perf_counter() - start) / number * 1e9}})
+
+    for baudrate in [115200, 460800]:
+        read_ms, write_ms = bench_uart_read.bench(baudrate, 50 if quick else 200)
+        results.append({"scenario": "uart_read", "baudrate": baudrate,
+                        "metrics": {"read_int_ms": read_ms, "write_reg_ms": write_ms}})
+    for result in results:
+        print(f"{result['scenario']:13} {result.get('baudrate', ''):6} | {result['metrics']}")
+    return results
+
+
+def metadata(quick:bool) -> dict:
+    """returns the version of the library and the system, on which the benchmark ran"""
+    config = configparser.ConfigParser()
+    config.read(os.path.join(ROOT, "setup.cfg"))
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "version": config.get("metadata", "version", fallback=None),
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "quick": quick,
+    }
+
+
+def flatten(results:list) -> dict:
+    """returns {scenario key: {metric: value}} with percentiles as separate metrics"""
+    flat = {}
+    for result in results:
+        key = "/".join(f"{k}={v}" for k, v in result.items() if k != "metrics")
+        flat[key] = {}
+        for metric, value in result["metrics"].items():
+            if isinstance(value, dict):
+                for sub, sub_value in value.items():
+                    flat[key][f"{metric}.{sub}"] = sub_value
+            else:
+                flat[key][metric] = value
+    return flat
+
+
+def compare(old_path:str, new_path:str):
+    """prints the relative change of every metric between two result files"""
+    with open(old_path, encoding="utf-8") as f:
+        old = json.load(f)
+    with open(new_path, encoding="utf-8") as f:
+        new = json.load(f)
+    print(f"{old['meta']['version']} ({old['meta']['commit']}) -> {new['meta']['version']} ({new['meta']['commit']})")
+    old_flat = flatten(old["results"])
+    for key, metrics in flatten(new["results"]).items():
+        for metric, value in metrics.items():
+            old_value = old_flat.get(key, {}).get(metric)
+            if not old_value or value is None:
+                continue
+            print(f"{key:55} {metric:25} {old_value:14.2f} -> {value:14.2f} ({(value / old_value - 1) * 100:+7.1f} %)")
+
+
+def main():
+    """runs the benchmark suite"""
+    parser = argparse.ArgumentParser(description="PyTmcStepper benchmark suite")
+    parser.add_argument("--quick", action="store_true", help="fewer microstep resolutions and repetitions")
+    parser.add_argument("--output", help="JSON file for the results (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare two result files")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    meta = metadata(args.quick)
+    results = bench_step_scenarios(args.quick) + bench_vactual(args.quick) + bench_single(args.quick)
+
+    output = args.output
+    if output is None:
+        os.makedirs(os.path.join(ROOT, "benchmarks", "results"), exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output = os.path.join(ROOT, "benchmarks", "results", f"{stamp}_{meta['version']}.json")
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({"meta": meta, "results": results}, f, indent=2)
+    print(f"results saved to {output}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
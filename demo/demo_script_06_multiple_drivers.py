@@ -25,20 +25,21 @@ print("---")
 #-----------------------------------------------------------------------
 # initiate the Tmc2209 class
 # use your pins for pin_en, pin_step, pin_dir here
+# both drivers share one UART; the node addresses are set with MS1/MS2
 #-----------------------------------------------------------------------
 # Multiple driver not tested
 if BOARD == Board.RASPBERRY_PI:
-    tmc1 = Tmc2209(TmcEnableControlPin(21), TmcMotionControlStepDir(16, 20), TmcComUart("/dev/serial0"), driver_address=0)
-    tmc2 = Tmc2209(TmcEnableControlPin(26), TmcMotionControlStepDir(13, 19), TmcComUart("/dev/serial0"), driver_address=0)
+    uart_bus = TmcUartBus("/dev/serial0")
 elif BOARD == Board.RASPBERRY_PI5:
-    tmc1 = Tmc2209(TmcEnableControlPin(21), TmcMotionControlStepDir(16, 20), TmcComUart("/dev/ttyAMA0"), driver_address=0)
-    tmc2 = Tmc2209(TmcEnableControlPin(26), TmcMotionControlStepDir(13, 19), TmcComUart("/dev/ttyAMA0"), driver_address=0)
+    uart_bus = TmcUartBus("/dev/ttyAMA0")
 elif BOARD == Board.NVIDIA_JETSON:
     raise Exception("Not tested for Nvidia Jetson, use with caution")
 else:
     # just in case
-    tmc1 = Tmc2209(TmcEnableControlPin(21), TmcMotionControlStepDir(16, 20), TmcComUart("/dev/serial0"), driver_address=0)
-    tmc2 = Tmc2209(TmcEnableControlPin(26), TmcMotionControlStepDir(13, 19), TmcComUart("/dev/serial0"), driver_address=0)
+    uart_bus = TmcUartBus("/dev/serial0")
+
+tmc1 = Tmc2209(TmcEnableControlPin(21), TmcMotionControlStepDir(16, 20), uart_bus.get_com(0), driver_address=0)
+tmc2 = Tmc2209(TmcEnableControlPin(26), TmcMotionControlStepDir(13, 19), uart_bus.get_com(1), driver_address=1)
 
 
 
@@ -79,6 +80,11 @@ print("---\n---")
 
 
 
+#-----------------------------------------------------------------------
+# read the status registers of both drivers in one sweep
+#-----------------------------------------------------------------------
+print(uart_bus.sweep())
+
 
 
 #-----------------------------------------------------------------------
@@ -88,6 +94,7 @@ tmc1.set_motor_enabled(False)
 tmc2.set_motor_enabled(False)
 del tmc1
 del tmc2
+del uart_bus
 
 print("---")
 print("SCRIPT FINISHED")
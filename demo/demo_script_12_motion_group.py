@@ -0,0 +1,99 @@
+#pylint: disable=wildcard-import
+#pylint: disable=unused-wildcard-import
+#pylint: disable=unused-import
+#pylint: disable=broad-exception-raised
+"""
+test file for testing coordinated movement of multiple drivers
+"""
+
+import time
+try:
+    from src.tmc_driver.tmc_2209 import *
+except ModuleNotFoundError:
+    from tmc_driver.tmc_2209 import *
+
+
+print("---")
+print("SCRIPT START")
+print("---")
+
+
+
+
+
+#-----------------------------------------------------------------------
+# initiate the Tmc2209 class
+# use your pins for pin_en, pin_step, pin_dir here
+#-----------------------------------------------------------------------
+if BOARD == Board.RASPBERRY_PI:
+    uart_bus = TmcUartBus("/dev/serial0")
+elif BOARD == Board.RASPBERRY_PI5:
+    uart_bus = TmcUartBus("/dev/ttyAMA0")
+elif BOARD == Board.NVIDIA_JETSON:
+    raise Exception("Not tested for Nvidia Jetson, use with caution")
+else:
+    # just in case
+    uart_bus = TmcUartBus("/dev/serial0")
+
+# both drivers share the serial port through the bus
+tmc1 = Tmc2209(TmcEnableControlPin(21), TmcMotionControlStepDir(16, 20), uart_bus.get_com(0), driver_address=0)
+tmc2 = Tmc2209(TmcEnableControlPin(26), TmcMotionControlStepDir(13, 19), uart_bus.get_com(1), driver_address=1)
+
+tmc_driverlist = [tmc1, tmc2]
+
+
+
+
+#-----------------------------------------------------------------------
+# these functions change settings in the TMC register
+#-----------------------------------------------------------------------
+for tmc in tmc_driverlist:
+    tmc.set_direction_reg(False)
+    tmc.set_current(300)
+    tmc.set_interpolation(True)
+    tmc.set_spreadcycle(False)
+    tmc.set_microstepping_resolution(2)
+    tmc.set_internal_rsense(False)
+    tmc.set_motor_enabled(True)
+
+    tmc.acceleration_fullstep = 1000
+    tmc.max_speed_fullstep = 250
+
+
+print("---\n---")
+
+
+
+
+
+#-----------------------------------------------------------------------
+# the motion group moves both motors in one timing loop,
+# so that they start and finish at the same time
+#-----------------------------------------------------------------------
+group = TmcMotionGroup([tmc1.tmc_mc, tmc2.tmc_mc])
+
+group.run_to_position_steps([800, 400], MovementAbsRel.RELATIVE)   # move both motors on a line
+group.run_to_position_steps([0, 0], MovementAbsRel.ABSOLUTE)       # and back
+
+# threaded movement, stopped softly after 0.5 seconds
+group.run_to_position_steps_threaded([4000, -2000], MovementAbsRel.RELATIVE)
+time.sleep(0.5)
+group.stop(StopMode.SOFTSTOP)
+group.wait_for_movement_finished_threaded()
+print(f"positions: {group.current_pos}")
+
+
+
+
+
+#-----------------------------------------------------------------------
+# deinitiate the Tmc2209 class
+#-----------------------------------------------------------------------
+tmc1.set_motor_enabled(False)
+tmc2.set_motor_enabled(False)
+del tmc1
+del tmc2
+
+print("---")
+print("SCRIPT FINISHED")
+print("---")
@@ -0,0 +1,308 @@
+#pylint: disable=protected-access
+"""
+TmcAsync asyncio front end module
+
+awaitable movements and register accesses, so that many axes can be driven
+from one event loop instead of one thread per axis:
+
+    tmc_async = TmcAsync(tmc)
+    await tmc_async.move_to(400, MovementAbsRel.RELATIVE)
+    drvstatus = await tmc_async.read_register("drvstatus")
+
+Cancelling a movement task stops the motor with the cancel_mode of the movement.
+"""
+
+import time
+import asyncio
+from .motion_control._tmc_mc import MovementAbsRel, MovementPhase, StopMode
+from .motion_control._tmc_mc_ramp import TmcRampProfile
+from .motion_control._tmc_mc_step_dir import TmcMotionControlStepDir
+from .motion_control._tmc_mc_step_dir_process import TmcMotionControlStepDirProcess
+from .motion_control._tmc_mc_vactual import TmcMotionControlVActual
+from .com._tmc_com_uart import TmcComUart
+from .com._tmc_com_uart_async import TmcComUartAsync
+from .reg._tmc_reg import TmcReg
+from ._tmc_exceptions import TmcDriverException
+
+
+class TmcAsync():
+    """TmcAsync
+
+    asyncio front end of one driver.
+    Registers of a UART driver are accessed with TmcComUartAsync,
+    other coms are run in a worker thread of the event loop.
+    STEP/DIR movements run in the step worker of the motion control,
+    VACTUAL movements are timed by the event loop.
+    """
+
+    VACTUAL_UPDATE_INTERVAL = 0.05      # time in seconds between two VACTUAL updates of a ramp
+
+    _tmc = None
+    _com_async:TmcComUartAsync = None
+    _poll_interval:float = 0.005        # for motion controls without awaitable result
+
+
+    @property
+    def tmc(self):
+        """_tmc property"""
+        return self._tmc
+
+    @property
+    def com_async(self):
+        """_com_async property"""
+        return self._com_async
+
+
+    def __init__(self, tmc):
+        """constructor
+
+        Args:
+            tmc (TmcStepperDriver): initialized driver
+        """
+        self._tmc = tmc
+        tmc_com = getattr(tmc, "tmc_com", None)
+        if isinstance(tmc_com, TmcComUart):
+            self._com_async = TmcComUartAsync(tmc_com)
+
+
+    @staticmethod
+    async def _run_in_thread(func, *args):
+        """runs a blocking function in the default executor of the event loop
+        (asyncio.to_thread needs Python 3.9)
+        """
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+
+    def _register(self, name:str) -> TmcReg:
+        """returns the register with the given name"""
+        tmc_com = getattr(self._tmc, "tmc_com", None)
+        if tmc_com is None or tmc_com.tmc_registers is None or name not in tmc_com.tmc_registers:
+            raise TmcDriverException(f"register {name} is not available")
+        return tmc_com.tmc_registers[name]
+
+
+    async def read_register(self, name:str, force:bool = False) -> TmcReg:
+        """reads a register
+
+        Args:
+            name (str): name of the register, e.g. "drvstatus"
+            force (bool): read from the driver, even if the value is cached (Default value = False)
+
+        Returns:
+            TmcReg: the register with the read values
+        """
+        register = self._register(name)
+        if register.cached and not force:
+            register.read()
+        elif self._com_async is not None:
+            data, flags = await self._com_async.read_int(register.addr)
+            register._update(data, flags)
+        else:
+            await self._run_in_thread(register.read, force)
+        return register
+
+
+    async def write_register(self, name:str) -> TmcReg:
+        """writes the current field values of a register and checks the write
+
+        Args:
+            name (str): name of the register
+
+        Returns:
+            TmcReg: the register
+        """
+        register = self._register(name)
+        if not register.dirty:
+            return register
+        if self._com_async is not None:
+            data = register.serialise()
+            await self._com_async.write_reg_check(register.addr, data)
+            register._update_cache(data)
+        else:
+            await self._run_in_thread(register.write_check)
+        return register
+
+
+    async def modify_register(self, name:str, field:str, value) -> TmcReg:
+        """reads a register, changes one field and writes it back
+
+        Args:
+            name (str): name of the register
+            field (str): name of the field
+            value: new value of the field
+
+        Returns:
+            TmcReg: the register
+        """
+        register = await self.read_register(name)
+        setattr(register, field, value)
+        return await self.write_register(name)
+
+
+    async def move_to(self, steps:int, movement_abs_rel:MovementAbsRel = None,
+                      ramp_profile:TmcRampProfile = None,
+                      cancel_mode:StopMode = StopMode.HARDSTOP) -> StopMode:
+        """runs the motor to the given position
+
+        Args:
+            steps (int): amount of steps; can be negative
+            movement_abs_rel (enum): whether the movement should be absolut or relative
+                (Default value = None)
+            ramp_profile (TmcRampProfile): ramp profile for this movement
+                (Default value = None, uses ramp_profile)
+            cancel_mode (StopMode): how the motor is stopped, if the task is cancelled
+                (Default value = StopMode.HARDSTOP)
+
+        Returns:
+            stop (enum): how the movement was finished
+        """
+        tmc_mc = self._tmc.tmc_mc
+        if isinstance(tmc_mc, TmcMotionControlStepDir):
+            future = tmc_mc.run_to_position_steps_threaded(steps, movement_abs_rel, ramp_profile)
+            try:
+                return await asyncio.wrap_future(future)
+            except asyncio.CancelledError:
+                tmc_mc.stop(cancel_mode)
+                if not future.cancelled():
+                    # wait for the stop, so that the position is settled
+                    await asyncio.wrap_future(future)
+                raise
+        if isinstance(tmc_mc, TmcMotionControlStepDirProcess):
+            seq = tmc_mc.run_to_position_steps_threaded(steps, movement_abs_rel, ramp_profile)
+            try:
+                while not tmc_mc.is_movement_finished(seq):
+                    await asyncio.sleep(self._poll_interval)
+            except asyncio.CancelledError:
+                tmc_mc.stop(cancel_mode)
+                while not tmc_mc.is_movement_finished(seq):
+                    await asyncio.sleep(self._poll_interval)
+                raise
+            return tmc_mc.wait_for_movement_finished_threaded()
+        if isinstance(tmc_mc, TmcMotionControlVActual):
+            return await self._run_vactual_schedule(steps, movement_abs_rel, cancel_mode)
+        return await self._run_in_thread(tmc_mc.run_to_position_steps, steps, movement_abs_rel, ramp_profile)
+
+
+    async def _run_vactual_schedule(self, steps:int, movement_abs_rel:MovementAbsRel,
+                                    cancel_mode:StopMode) -> StopMode:
+        """runs a movement of a VACTUAL motion control with its VACTUAL schedule
+        (see TmcMotionControlVActual.run_to_position_steps), timed by the event loop
+
+        Args:
+            steps (int): amount of steps; can be negative
+            movement_abs_rel (enum): whether the movement should be absolut or relative
+            cancel_mode (StopMode): how the motor is stopped, if the task is cancelled
+
+        Returns:
+            stop (enum): how the movement was finished
+        """
+        tmc_mc = self._tmc.tmc_mc
+        if movement_abs_rel is None:
+            movement_abs_rel = tmc_mc.movement_abs_rel
+        if movement_abs_rel == MovementAbsRel.RELATIVE:
+            tmc_mc._target_pos = tmc_mc.current_pos + steps
+        else:
+            tmc_mc._target_pos = steps
+        schedule = tmc_mc.compute_schedule(tmc_mc._target_pos - tmc_mc.current_pos)
+        vactual = 0
+        deadline = time.perf_counter()
+        try:
+            for i, (vactual, _, phase) in enumerate(schedule):
+                await self._write_vactual_only(vactual)
+                tmc_mc._movement_phase = phase
+                deadline = tmc_mc._segment_end(schedule, i, deadline)
+                await asyncio.sleep(max(deadline - time.perf_counter(), 0.0))
+        except asyncio.CancelledError:
+            if cancel_mode == StopMode.SOFTSTOP:
+                for vactual_stop, duration, _ in tmc_mc._stop_schedule(vactual):
+                    await self._write_vactual_only(vactual_stop)
+                    await asyncio.sleep(duration)
+            await self._write_vactual_only(0)
+            tmc_mc._target_pos = tmc_mc.current_pos
+            tmc_mc._movement_phase = MovementPhase.STANDSTILL
+            raise
+        await self._write_vactual_only(0)
+        tmc_mc._movement_phase = MovementPhase.STANDSTILL
+        return StopMode.NO
+
+
+    async def _write_vactual_only(self, vactual:int):
+        """writes the VACTUAL register without check and tracks the position of the motion control"""
+        register = self._register("vactual")
+        register.vactual = vactual
+        if self._com_async is not None:
+            data = register.serialise()
+            await self._com_async.write_reg(register.addr, data)
+            register._update_cache(data)
+        else:
+            await self._run_in_thread(register.write)
+        self._tmc.tmc_mc._set_velocity(vactual)
+
+
+    async def _write_vactual(self, vactual:int):
+        """writes the VACTUAL register"""
+        register = self._register("vactual")
+        register.vactual = int(round(vactual))
+        await self.write_register("vactual")
+
+
+    async def run_vactual(self, vactual:int, duration:float = 0, acceleration:float = 0,
+                          cancel_mode:StopMode = StopMode.HARDSTOP) -> StopMode:
+        """runs the motor with the given VACTUAL.
+        With an acceleration, VACTUAL is ramped up and before the end of the duration down again.
+
+        Args:
+            vactual (int): value for VACTUAL
+            duration (float): after this time in seconds, VACTUAL is set to 0
+                (Default value = 0, the motor keeps running)
+            acceleration (float): VACTUAL change per second (Default value = 0, no ramp)
+            cancel_mode (StopMode): how the motor is stopped, if the task is cancelled;
+                SOFTSTOP ramps down with the acceleration (Default value = StopMode.HARDSTOP)
+
+        Returns:
+            stop (enum): how the movement was finished
+        """
+        loop = asyncio.get_running_loop()
+        acceleration = abs(acceleration)
+        interval = self.VACTUAL_UPDATE_INTERVAL
+        current = 0.0
+        try:
+            if acceleration == 0:
+                current = vactual
+                await self._write_vactual(vactual)
+                if duration == 0:
+                    return StopMode.NO
+                await asyncio.sleep(duration)
+            else:
+                end = loop.time() + duration
+                while duration == 0 or loop.time() < end:
+                    ramp_down = duration != 0 and end - loop.time() <= abs(current) / acceleration
+                    target = 0.0 if ramp_down else vactual
+                    change = acceleration * interval
+                    current = max(current - change, target) if current > target else min(current + change, target)
+                    await self._write_vactual(current)
+                    if duration == 0 and current == vactual:
+                        return StopMode.NO
+                    if ramp_down and current == 0:
+                        break
+                    await asyncio.sleep(interval)
+        except asyncio.CancelledError:
+            if cancel_mode == StopMode.SOFTSTOP and acceleration != 0:
+                while current != 0:
+                    change = acceleration * interval
+                    current = max(current - change, 0.0) if current > 0 else min(current + change, 0.0)
+                    await self._write_vactual(current)
+                    await asyncio.sleep(interval)
+            await self._write_vactual(0)
+            raise
+        await self._write_vactual(0)
+        return StopMode.NO
+
+
+    async def wait_for_movement_finished(self) -> StopMode:
+        """waits for the threaded movements of the motion control to finish
+
+        Returns:
+            stop (enum): how the movement was finished
+        """
+        return await self._run_in_thread(self._tmc.tmc_mc.wait_for_movement_finished_threaded)
@@ -181,13 +181,30 @@ class BaseRPiGPIOWrapper(BaseGPIOWrapper):
 
 
 class MockGPIOWrapper(BaseRPiGPIOWrapper):
-    """Mock.GPIO wrapper"""
+    """Mock.GPIO wrapper
+
+    the outputs can be captured with a TmcGpioRecorder
+    """
+
+    recorder = None                     # TmcGpioRecorder, which captures the outputs
 
     def __init__(self):
         """constructor, imports Mock.GPIO"""
         self.GPIO = import_module('Mock.GPIO')
         dependencies_logger.log("using Mock.GPIO for GPIO mocking", Loglevel.INFO)
 
+    def gpio_setup(self, pin:int, mode:GpioMode, initial:Gpio=Gpio.LOW, pull_up_down:GpioPUD=GpioPUD.PUD_OFF):
+        """setup GPIO pin"""
+        if self.recorder is not None and mode == GpioMode.OUT:
+            self.recorder.record(pin, initial)
+        super().gpio_setup(pin, mode, initial, pull_up_down)
+
+    def gpio_output(self, pin:int, value:int):
+        """write GPIO pin"""
+        if self.recorder is not None:
+            self.recorder.record(pin, value)
+        self.GPIO.output(pin, value)
+
 class RPiGPIOWrapper(BaseRPiGPIOWrapper):
     """RPi.GPIO wrapper"""
 
@@ -28,6 +28,7 @@ class TmcLogger:
     """
 
     _loglevel: Loglevel = Loglevel.INFO
+    _movement_enabled: bool = False     # cached, whether MOVEMENT messages are logged
 
 
     @property
@@ -40,6 +41,16 @@ class TmcLogger:
         """set the loglevel"""
         self._loglevel = loglevel
         self.logger.setLevel(loglevel.value)
+        self._movement_enabled = self.is_enabled(Loglevel.MOVEMENT)
+
+    @property
+    def movement_enabled(self):
+        """whether MOVEMENT messages are logged
+
+        this is cached, so that the step loop can check it on every step
+        without formatting the message or calling into logging
+        """
+        return self._movement_enabled
 
 
     def __init__(self,
@@ -159,6 +170,20 @@ class TmcLogger:
         setattr(logging, method_name, logToRoot)
 
 
+    def is_enabled(self, loglevel: Loglevel) -> bool:
+        """returns whether messages of the given loglevel are logged
+
+        Args:
+            loglevel (enum): loglevel of the message
+
+        Returns:
+            bool: True if messages of this loglevel are logged
+        """
+        if self._loglevel is Loglevel.NONE:
+            return False
+        return self.logger.isEnabledFor(loglevel.value)
+
+
     def log(self, message, loglevel: Loglevel = Loglevel.INFO):
         """logs a message
 
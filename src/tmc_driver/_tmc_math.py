@@ -32,6 +32,32 @@ def vactual_to_rps(vactual:int, steps_per_rev:int, fclk:int = 12000000) -> float
     return vactual * (fclk / 16777216) / steps_per_rev
 
 
+def steps_to_vactual(steps:float, fclk:int = 12000000) -> int:
+    """converts steps/second -> vactual
+
+    Args:
+        steps (float): speed in µsteps per second
+        fclk (int): clock speed of the tmc (Default value = 12000000)
+
+    Returns:
+        vactual (int): value for vactual
+    """
+    return int(round(steps / (fclk / 16777216)))
+
+
+def vactual_to_steps(vactual:int, fclk:int = 12000000) -> float:
+    """converts vactual -> steps/second
+
+    Args:
+        vactual (int): value for VACTUAL
+        fclk (int): clock speed of the tmc (Default value = 12000000)
+
+    Returns:
+        steps (float): speed in µsteps per second
+    """
+    return vactual * (fclk / 16777216)
+
+
 def rps_to_steps(rps:float, steps_per_rev:int) -> int:
     """converts rps -> steps/second
 
@@ -84,6 +110,21 @@ def steps_to_tstep(steps:int, mres:int) -> int:
     return int(round(12000000 / (steps * 256 / mres)))
 
 
+def tstep_to_steps(tstep:int, mres:int) -> float:
+    """converts tstep -> steps/second
+
+    Args:
+        tstep (int): time per step
+        mres (int): µstep resolution
+
+    Returns:
+        steps (float): speed in steps per second; 0 at standstill (TSTEP = 0xFFFFF)
+    """
+    if tstep == 0 or tstep >= 0xFFFFF:
+        return 0.0
+    return 12000000 / (tstep * 256 / mres)
+
+
 def constrain(val:int, min_val:int, max_val:int) -> int:
     """constrains a value between a min and a max
 
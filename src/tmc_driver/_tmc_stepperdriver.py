@@ -17,6 +17,14 @@ from .enable_control._tmc_ec import TmcEnableControl
 from .enable_control._tmc_ec_pin import TmcEnableControlPin
 from .motion_control._tmc_mc_step_dir import TmcMotionControlStepDir
 from .motion_control._tmc_mc_step_pwm_dir import TmcMotionControlStepPwmDir
+from .motion_control._tmc_mc_step_dir_process import TmcMotionControlStepDirProcess
+from .motion_control._tmc_mc_group import TmcMotionGroup
+from .motion_control._tmc_mc_queue import TmcMoveQueue
+from .motion_control._tmc_mc_ramp import TmcRampProfile, TmcRampTrapezoid, TmcRampSCurve
+from .motion_control._tmc_mc_stats import TmcMoveStats
+from .motion_control._tmc_mc_worker import TmcStepWorker, GcMode
+from ._tmc_async import TmcAsync
+from ._tmc_telemetry import TmcTelemetry
 from ._tmc_logger import TmcLogger, Loglevel
 from . import _tmc_math as tmc_math
 
@@ -34,6 +42,7 @@ class TmcStepperDriver:
     tmc_mc:TmcMotionControl = None
     tmc_ec:TmcEnableControl = None
     tmc_logger:TmcLogger = None
+    tmc_registers:dict = None           # {register name: TmcReg}; set by drivers with a com
 
 
     _deinit_finished:bool = False
@@ -254,25 +263,42 @@ class TmcStepperDriver:
             self.tmc_mc.acceleration_fullstep = acceleration_fullstep
 
 
-    def run_to_position_steps(self, steps, movement_abs_rel:MovementAbsRel = None) -> StopMode:
+    def run_to_position_steps(self, steps, movement_abs_rel:MovementAbsRel = None,
+                              ramp_profile:TmcRampProfile = None) -> StopMode:
         """motioncontrol wrapper"""
         if self.tmc_mc is not None:
-            return self.tmc_mc.run_to_position_steps(steps, movement_abs_rel)
+            return self.tmc_mc.run_to_position_steps(steps, movement_abs_rel, ramp_profile)
         return None
 
 
-    def run_to_position_fullsteps(self, steps, movement_abs_rel:MovementAbsRel = None) -> StopMode:
+    def run_to_position_fullsteps(self, steps, movement_abs_rel:MovementAbsRel = None,
+                                  ramp_profile:TmcRampProfile = None) -> StopMode:
         """motioncontrol wrapper"""
-        return self.run_to_position_steps(steps * self.mres, movement_abs_rel)
+        return self.run_to_position_steps(steps * self.mres, movement_abs_rel, ramp_profile)
 
 
-    def run_to_position_revolutions(self, revs, movement_abs_rel:MovementAbsRel = None) -> StopMode:
+    def run_to_position_revolutions(self, revs, movement_abs_rel:MovementAbsRel = None,
+                                    ramp_profile:TmcRampProfile = None) -> StopMode:
         """motioncontrol wrapper"""
-        return self.run_to_position_steps(revs * self.steps_per_rev, movement_abs_rel)
+        return self.run_to_position_steps(revs * self.steps_per_rev, movement_abs_rel, ramp_profile)
 
 
 # StepperDriver methods
 # ----------------------------
+    def set_register_cache(self, enabled:bool):
+        """enables or disables the shadow cache of the configuration registers.
+        Cached registers are read from the cache and only written, if their value changed.
+        The cache is invalidated, when a reset is detected in GSTAT.
+
+        Args:
+            enabled (bool): whether the register cache is used
+        """
+        if self.tmc_registers is None:
+            return
+        for register in self.tmc_registers.values():
+            register.cache_enabled = enabled
+
+
     def test_step(self):
         """test method"""
         for _ in range(100):
@@ -0,0 +1,296 @@
+#pylint: disable=too-many-instance-attributes
+#pylint: disable=import-error
+#pylint: disable=protected-access
+"""
+TmcTelemetry status poller module
+
+reads a set of status registers at a fixed rate into a ring buffer, so that the
+driver state can be monitored without a bus access per request:
+
+    telemetry = TmcTelemetry(tmc)
+    telemetry.start(0.1)
+    telemetry.latest["tstep"]
+    telemetry.stats(10)["adc_temp"]     # (min, mean, max) of the last 10 s
+
+With NumPy installed the ring buffer is a structured array, otherwise every
+field is kept in an array.array.
+"""
+
+import time
+import threading
+from array import array
+from bisect import bisect_left
+from .reg._tmc_reg import read_registers
+from ._tmc_logger import TmcLogger, Loglevel
+from ._tmc_exceptions import TmcComException, TmcDriverException
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class TmcTelemetry():
+    """TmcTelemetry
+
+    every register field of the polled registers is one column of the ring buffer.
+    Fields with a conversion function (e.g. the ADC values) are stored converted,
+    the other fields as int. The column "time" holds the time.monotonic() of the sample.
+    The registers are read into private copies, so the register objects of the driver
+    are not changed by the poll thread and a sample never mixes two reads.
+    Readers of the ring buffer do not take a lock: latest is replaced as a whole
+    with every sample and samples, which are overwritten while they are copied, are dropped.
+    """
+
+    DEFAULT_REGISTERS = ("drvstatus", "sgresult", "tstep", "adc_temp", "adcv_supply_ain")
+
+    _tmc = None
+    _tmc_logger:TmcLogger = None
+    _registers:list = None              # [TmcReg], private copies of the registers of the driver
+    _fields:list = None                 # [(column name, register, field name, conversion function)]
+    _size:int = 0                       # amount of samples in the ring buffer
+    _buffer = None                      # NumPy structured array or {column name: array.array}
+    _head:int = 0                       # amount of samples, whose write was started
+    _count:int = 0                      # amount of samples, whose write is finished
+    _latest:dict = None
+    _poll_thread:threading.Thread = None
+    _poll_stop:threading.Event = None
+
+
+    @property
+    def registers(self):
+        """names of the polled registers"""
+        return [register.name.lower() for register in self._registers]
+
+    @property
+    def columns(self):
+        """names of the columns of the ring buffer"""
+        return ["time"] + [column for column, _, _, _ in self._fields]
+
+    @property
+    def size(self):
+        """_size property"""
+        return self._size
+
+    @property
+    def count(self):
+        """amount of samples taken since the start"""
+        return self._count
+
+    @property
+    def latest(self):
+        """last sample as {column name: value}; None before the first sample"""
+        return self._latest
+
+    @property
+    def running(self):
+        """whether the poll thread is running"""
+        return self._poll_thread is not None
+
+
+    def __init__(self, tmc, registers:tuple = None, size:int = 1000):
+        """constructor
+
+        Args:
+            tmc (TmcStepperDriver): initialized driver
+            registers (tuple): names of the registers to poll
+                (Default value = None, the DEFAULT_REGISTERS the driver has)
+            size (int): amount of samples in the ring buffer (Default value = 1000)
+        """
+        tmc_com = getattr(tmc, "tmc_com", None)
+        if tmc_com is None or tmc_com.tmc_registers is None:
+            raise TmcDriverException("TmcTelemetry needs a driver with a com")
+        if size < 1:
+            raise TmcDriverException(f"invalid ring buffer size {size}")
+        self._tmc = tmc
+        self._tmc_logger = tmc.tmc_logger
+        if registers is None:
+            registers = [name for name in self.DEFAULT_REGISTERS if name in tmc_com.tmc_registers]
+        for name in registers:
+            if name not in tmc_com.tmc_registers:
+                raise TmcDriverException(f"register {name} is not available")
+        self._registers = [tmc_com.tmc_registers[name].__class__(tmc_com) for name in registers]
+        self._fields = self._create_fields(self._registers)
+        self._size = size
+        self._buffer = self._create_buffer()
+        self._poll_stop = threading.Event()
+
+
+    def __del__(self):
+        """destructor"""
+        self.stop()
+
+
+    @staticmethod
+    def _create_fields(registers:list) -> list:
+        """returns the columns of the given registers; a field name,
+        which is already used by another register, is prefixed with the register name
+
+        Args:
+            registers (list): registers
+
+        Returns:
+            list: [(column name, register, field name, conversion function)]
+        """
+        fields = []
+        names = {"time"}
+        for register in registers:
+            for name, _, _, _, conv_func, _ in register.reg_map:
+                column = name if name not in names else f"{register.name.lower()}_{name}"
+                names.add(column)
+                fields.append((column, register, name, conv_func))
+        return fields
+
+
+    def _create_buffer(self):
+        """returns the preallocated ring buffer"""
+        types = [("time", "d")] + [(column, "q" if conv_func is None else "d")
+                                   for column, _, _, conv_func in self._fields]
+        if np is not None:
+            return np.zeros(self._size, dtype=[(column, "i8" if typecode == "q" else "f8")
+                                               for column, typecode in types])
+        return {column: array(typecode, [0] * self._size) for column, typecode in types}
+
+
+    def poll(self) -> dict:
+        """reads the registers from the driver and records a sample
+
+        Returns:
+            dict: the sample
+        """
+        read_registers(self._registers, force=True)
+        return self._record()
+
+
+    def record(self, values:dict) -> dict:
+        """records a sample of register values, which were read by someone else,
+        e.g. by the status sweep of a TmcUartBus. Registers missing in values
+        keep their last value
+
+        Args:
+            values (dict): {register name: register value}, like one driver of a sweep result
+
+        Returns:
+            dict: the sample
+        """
+        for register in self._registers:
+            data = values.get(register.name.lower())
+            if data is not None:
+                register._update(data, None)
+        return self._record()
+
+
+    def _record(self) -> dict:
+        """records a sample of the values of the private register copies
+
+        Returns:
+            dict: the sample
+        """
+        sample = {"time": time.monotonic()}
+        for column, register, name, conv_func in self._fields:
+            sample[column] = conv_func() if conv_func is not None else int(getattr(register, name, 0))
+
+        index = self._head % self._size
+        self._head += 1
+        if np is not None:
+            self._buffer[index] = tuple(sample.values())
+        else:
+            for column, value in sample.items():
+                self._buffer[column][index] = value
+        self._count = self._head
+        self._latest = sample
+        return sample
+
+
+    def samples(self, window:float = None) -> dict:
+        """returns the samples in the ring buffer, oldest first
+
+        Args:
+            window (float): only the samples of the last window seconds
+                (Default value = None, all samples)
+
+        Returns:
+            dict: {column name: NumPy array or array.array}
+        """
+        end = self._count
+        start = max(end - self._size, 0)
+        columns = {column: self._column(column, start, end) for column in self.columns}
+        # samples, which were overwritten while copying, are dropped
+        first = max(self._head - self._size - start, 0)
+        if window is not None and end > start:
+            times = columns["time"]
+            first = max(first, bisect_left(times, times[-1] - window))
+        if first > 0:
+            columns = {column: values[first:] for column, values in columns.items()}
+        return columns
+
+
+    def _column(self, column:str, start:int, end:int):
+        """copies the samples start to end - 1 of one column out of the ring buffer"""
+        values = self._buffer[column]
+        first = start % self._size
+        if end - start == self._size and first > 0:
+            if np is not None:
+                return np.concatenate((values[first:], values[:first]))
+            return values[first:] + values[:first]
+        if np is not None:
+            return values[first:first + end - start].copy()
+        return values[first:first + end - start]
+
+
+    def stats(self, window:float = None) -> dict:
+        """returns min, mean and max of every column except time
+
+        Args:
+            window (float): only the samples of the last window seconds
+                (Default value = None, all samples)
+
+        Returns:
+            dict: {column name: (min, mean, max)}; empty without samples
+        """
+        columns = self.samples(window)
+        if len(columns["time"]) == 0:
+            return {}
+        del columns["time"]
+        if np is not None:
+            return {column: (values.min(), values.mean(), values.max())
+                    for column, values in columns.items()}
+        return {column: (min(values), sum(values) / len(values), max(values))
+                for column, values in columns.items()}
+
+
+    def start(self, interval:float):
+        """starts polling the registers periodically in a thread
+
+        Args:
+            interval (float): time between the start of two polls in seconds
+        """
+        self.stop()
+        self._poll_stop.clear()
+        self._poll_thread = threading.Thread(target=self._poll_loop, args=(interval,), daemon=True)
+        self._poll_thread.start()
+
+
+    def stop(self):
+        """stops the periodic polling"""
+        if self._poll_stop is not None:
+            self._poll_stop.set()
+        if self._poll_thread is not None:
+            self._poll_thread.join()
+            self._poll_thread = None
+
+
+    def _poll_loop(self, interval:float):
+        """poll thread
+
+        Args:
+            interval (float): time between the start of two polls in seconds
+        """
+        next_poll = time.monotonic()
+        while not self._poll_stop.is_set():
+            try:
+                self.poll()
+            except (TmcComException, TmcDriverException) as e:
+                self._tmc_logger.log(f"telemetry poll failed: {e}", Loglevel.ERROR)
+            next_poll += interval
+            self._poll_stop.wait(max(next_poll - time.monotonic(), 0))
@@ -7,32 +7,49 @@ TmcCom stepper driver communication module
 
 import time
 import struct
+import contextlib
 from typing import List
 from .._tmc_logger import TmcLogger, Loglevel
 
 
+def _build_crc8_atm_tables():
+    """builds the lookup tables for compute_crc8_atm
+
+    the TMC CRC8 (polynomial 0x07) shifts the bits of each byte in LSB first,
+    so the byte is bit reversed before the table lookup
+
+    Returns:
+        tuple: crc table, bit reverse table
+    """
+    crc_table = bytearray(256)
+    for i in range(256):
+        crc = i
+        for _ in range(8):
+            if crc & 0x80:
+                crc = ((crc << 1) ^ 0x07) & 0xFF
+            else:
+                crc = (crc << 1) & 0xFF
+        crc_table[i] = crc
+    reverse_table = bytes(int(f"{i:08b}"[::-1], 2) for i in range(256))
+    return bytes(crc_table), reverse_table
+
+
+_CRC8_ATM_TABLE, _BIT_REVERSE_TABLE = _build_crc8_atm_tables()
+
+
 def compute_crc8_atm(datagram, initial_value=0):
     """this function calculates the crc8 parity bit
 
     Args:
-        datagram (list): datagram
+        datagram (bytes-like, list): datagram
         initial_value (int): initial value (Default value = 0)
     """
     crc = initial_value
-    # Iterate bytes in data
     for byte in datagram:
-        # Iterate bits in byte
-        for _ in range(0, 8):
-            if (crc >> 7) ^ (byte & 0x01):
-                crc = ((crc << 1) ^ 0x07) & 0xFF
-            else:
-                crc = (crc << 1) & 0xFF
-            # Shift to next bit
-            byte = byte >> 1
+        crc = _CRC8_ATM_TABLE[crc ^ _BIT_REVERSE_TABLE[byte]]
     return crc
 
 
-
 class TmcCom:
     """TmcCom
     """
@@ -40,8 +57,8 @@ class TmcCom:
     _tmc_registers = None
 
     mtr_id:int = 0
-    r_frame:List[int]
-    w_frame:List[int]
+    r_frame:bytearray
+    w_frame:bytearray
     communication_pause:int = 0
     error_handler_running:bool = False
 
@@ -116,6 +133,17 @@ class TmcCom:
         raise NotImplementedError
 
 
+    def read_many(self, addrs:List[int]) -> List[tuple]:
+        """reads several registers
+
+        Args:
+            addrs (list): HEX, which registers to read
+        Returns:
+            list: (register value, flags) for every register
+        """
+        return [self.read_int(addr) for addr in addrs]
+
+
     def write_reg(self, addr:hex, val:int):
         """this function can write a value to the register of the tmc
         1. use read_int to get the current setting of the TMC
@@ -142,6 +170,14 @@ class TmcCom:
         raise NotImplementedError
 
 
+    @contextlib.contextmanager
+    def batch(self):
+        """context manager to collect register writes and send them together.
+        The base implementation writes every register right away.
+        """
+        yield self
+
+
     def flush_serial_buffer(self):
         """this function clear the communication buffers of the Raspberry Pi"""
         raise NotImplementedError
@@ -37,10 +37,12 @@ class TmcComSpi(TmcCom):
     like the current or the microsteppingmode
     """
 
-    spi = spidev.SpiDev()
+    spi:spidev.SpiDev = None
     _spi_bus: int
     _spi_dev: int
     _spi_speed: int
+    _w_frame: list
+    _dummy_frame: list
 
 
 
@@ -59,12 +61,15 @@ class TmcComSpi(TmcCom):
         """
         super().__init__(mtr_id, tmc_logger)
 
+        self.spi = spidev.SpiDev()
         self._spi_bus = spi_bus
         self._spi_dev = spi_dev
         self._spi_speed = spi_speed
 
-        self._r_frame = [0x55, 0, 0, 0, 0]
+        # spidev converts every sequence other than list/tuple to a list,
+        # so the frames are persistent lists, which are modified in place
         self._w_frame = [0x55, 0, 0, 0, 0]
+        self._dummy_frame = [0x00, 0x00, 0x00, 0x00, 0x00]
 
 
     def init(self):
@@ -98,17 +103,66 @@ class TmcComSpi(TmcCom):
             int: register value
             Dict: flags
         """
-        self._w_frame = [addr, 0x00, 0x00, 0x00, 0x00]
-        dummy_data = [0x00, 0x00, 0x00, 0x00, 0x00]
+        w_frame = self._w_frame
+        w_frame[0] = addr
+        w_frame[1] = w_frame[2] = w_frame[3] = w_frame[4] = 0x00
+
+        self.spi.xfer2(w_frame)
+        rtn = self.spi.xfer2(self._dummy_frame)
+
+        return rtn[1:], self._parse_flags(rtn[0])
 
-        self.spi.xfer2(self._w_frame)
-        rtn = self.spi.xfer2(dummy_data)
 
+    def read_many(self, addrs:List[int]) -> List[tuple]:
+        """reads several registers with N+1 transfers instead of 2N.
+        The TMC2240 answers every datagram with the data requested by the previous one,
+        so the request of the next register clocks out the reply of the current one.
+
+        Args:
+            addrs (list): HEX, which registers to read
+        Returns:
+            list: (register value, flags) for every register
+        """
+        result = []
+        w_frame = self._w_frame
+        w_frame[1] = w_frame[2] = w_frame[3] = w_frame[4] = 0x00
+        for i, addr in enumerate(addrs):
+            w_frame[0] = addr
+            rtn = self.spi.xfer2(w_frame)
+            if i > 0:
+                result.append(self._decode_reply(rtn))
+        if addrs:
+            rtn = self.spi.xfer2(self._dummy_frame)
+            result.append(self._decode_reply(rtn))
+        return result
+
+
+    def _decode_reply(self, rtn:list) -> tuple:
+        """decodes the reply of a read access
+
+        Args:
+            rtn (list): received bytes (status, 4 data bytes)
+        Returns:
+            int: register value
+            Dict: flags
+        """
+        val = rtn[1] << 24 | rtn[2] << 16 | rtn[3] << 8 | rtn[4]
+        return val, self._parse_flags(rtn[0])
+
+
+    def _parse_flags(self, status:int) -> dict:
+        """parses the status flags, which are sent with every reply
+
+        Args:
+            status (int): status byte
+        Returns:
+            Dict: flags
+        """
         flags = {
-                "reset_flag":      rtn[0] >> 0 & 0x01,
-                "driver_error":    rtn[0] >> 1 & 0x01,
-                "sg2":             rtn[0] >> 2 & 0x01,
-                "standstill":      rtn[0] >> 3 & 0x01
+                "reset_flag":      status >> 0 & 0x01,
+                "driver_error":    status >> 1 & 0x01,
+                "sg2":             status >> 2 & 0x01,
+                "standstill":      status >> 3 & 0x01
                 }
 
         if flags["reset_flag"]:
@@ -120,8 +174,7 @@ class TmcComSpi(TmcCom):
         if flags["standstill"]:
             self._tmc_logger.log("TMC standstill flag is set", Loglevel.MOVEMENT)
 
-
-        return rtn[1:], flags
+        return flags
 
 
     def read_int(self, addr:hex, tries:int = 10):
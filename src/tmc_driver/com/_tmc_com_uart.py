@@ -1,4 +1,5 @@
 #pylint: disable=import-error
+#pylint: disable=too-many-instance-attributes
 #pylint: disable=broad-exception-caught
 #pylint: disable=wildcard-import
 #pylint: disable=unused-wildcard-import
@@ -7,6 +8,7 @@
 TmcComUart stepper driver uart module
 """
 
+import threading
 import serial
 from ._tmc_com import *
 from .._tmc_exceptions import TmcComException, TmcDriverException
@@ -19,9 +21,38 @@ class TmcComUart(TmcCom):
     this class is used to communicate with the TMC via UART
     it can be used to change the settings of the TMC.
     like the current or the microsteppingmode
+    Every instance has its own serial port object and lock.
+    Drivers, which share one serial port, have to get their com from a TmcUartBus.
     """
 
-    ser:serial.Serial = serial.Serial()
+    ser:serial.Serial = None
+    _lock:threading.RLock = None        # serializes the access to the serial port
+    _bus = None                         # TmcUartBus, if the serial port is shared
+    _batch:dict = None                  # pending writes of the current batch {addr: val}
+    _senddelay:int = 0                  # SENDDELAY setting of the NODECONF register
+    _r_frame_crc:memoryview = None      # view of r_frame without the crc byte
+    _w_frame_crc:memoryview = None      # view of w_frame without the crc byte
+    _rx_buffer:bytearray = None         # receive buffer for the echo and the reply of a read access
+    _rx_view:memoryview = None
+
+
+    @property
+    def bus(self):
+        """_bus property"""
+        return self._bus
+
+    @property
+    def senddelay(self):
+        """_senddelay property"""
+        return self._senddelay
+
+    @senddelay.setter
+    def senddelay(self, senddelay:int):
+        """_senddelay setter
+        this does not write the register, it only adjusts the timing to the given setting
+        """
+        self._senddelay = senddelay
+        self._update_timing()
 
 
     def __init__(self,
@@ -40,20 +71,28 @@ class TmcComUart(TmcCom):
         """
         super().__init__(mtr_id, tmc_logger)
 
+        self.ser = serial.Serial()
+        self._lock = threading.RLock()
+        # the frames and the receive buffer are allocated once and reused for every access
+        self.r_frame = bytearray([0x55, 0, 0, 0])
+        self.w_frame = bytearray([0x55, 0, 0, 0, 0, 0, 0, 0])
+        self._r_frame_crc = memoryview(self.r_frame)[:-1]
+        self._w_frame_crc = memoryview(self.w_frame)[:-1]
+        self._rx_buffer = bytearray(12)
+        self._rx_view = memoryview(self._rx_buffer)
+
         if serialport is None:
             return
 
         self.ser.port = serialport
         self.ser.baudrate = baudrate
 
-        self.r_frame = [0x55, 0, 0, 0  ]
-        self.w_frame = [0x55, 0, 0, 0 , 0, 0, 0, 0 ]
-
 
     def init(self):
         """init"""
         try:
-            self.ser.open()
+            if not self.ser.is_open:
+                self.ser.open()
         except Exception as e:
             errnum = e.args[0]
             self._tmc_logger.log(f"SERIAL ERROR: {e}")
@@ -68,8 +107,7 @@ class TmcComUart(TmcCom):
                                     with \"sudo usermod -a -G dialout pi\"""", Loglevel.ERROR)
                 raise SystemExit from e
 
-        # adjust per baud and hardware. Sequential reads without some delay fail.
-        self.communication_pause = 500 / self.ser.baudrate
+        self._update_timing()
 
         if self.ser is None:
             return
@@ -87,10 +125,23 @@ class TmcComUart(TmcCom):
 
     def __del__(self):
         """destructor"""
-        if self.ser is not None and isinstance(self.ser, serial.Serial):
+        if self._bus is None and self.ser is not None and isinstance(self.ser, serial.Serial):
             self.ser.close()
 
 
+    def _update_timing(self):
+        """computes the gap between two datagrams from the baudrate and SENDDELAY
+
+        the driver answers a read access after SENDDELAY bit times
+        (0,1: 8; 2,3: 3*8; 4,5: 5*8; ... 14,15: 15*8 bit times).
+        The same time is waited after every datagram, before the next one is sent.
+        """
+        if self.ser is None or not self.ser.baudrate:
+            return
+        senddelay_bits = 8 * (self._senddelay | 1)
+        self.communication_pause = senddelay_bits / self.ser.baudrate
+
+
     def read_reg(self, addr:hex):
         """reads the registry on the TMC with a given address.
         returns the binary value of that register
@@ -105,28 +156,27 @@ class TmcComUart(TmcCom):
             self._tmc_logger.log("Cannot read reg, serial is not initialized", Loglevel.ERROR)
             return False
 
-        self.ser.reset_output_buffer()
-        self.ser.reset_input_buffer()
+        with self._lock:
+            self.ser.reset_output_buffer()
+            self.ser.reset_input_buffer()
 
-        self.r_frame[1] = self.mtr_id
-        self.r_frame[2] = addr
-        self.r_frame[3] = compute_crc8_atm(self.r_frame[:-1])
+            self.r_frame[1] = self.mtr_id
+            self.r_frame[2] = addr
+            self.r_frame[3] = compute_crc8_atm(self._r_frame_crc)
 
-        rtn = self.ser.write(self.r_frame)
-        if rtn != len(self.r_frame):
-            self._tmc_logger.log("Err in write", Loglevel.ERROR)
-            return False
+            rtn = self.ser.write(self.r_frame)
+            if rtn != len(self.r_frame):
+                self._tmc_logger.log("Err in write", Loglevel.ERROR)
+                return False
 
-        # adjust per baud and hardware. Sequential reads without some delay fail.
-        time.sleep(self.communication_pause)
+            # returns as soon as the echo of the request and the reply (12 bytes) are received
+            rtn = self.ser.readinto(self._rx_buffer)
+            #self._tmc_logger.log(f"received {rtn} bytes; {rtn*8} bits")
 
-        rtn = self.ser.read(12)
-        #self._tmc_logger.log(f"received {len(rtn)} bytes; {len(rtn*8)} bits")
-        #self._tmc_logger.log(rtn.hex())
+            time.sleep(self.communication_pause)
 
-        time.sleep(self.communication_pause)
-
-        return rtn, None
+            # view of the receive buffer; only valid while the caller holds _lock
+            return self._rx_view[:rtn], None
 
 
     def read_int(self, addr:hex, tries:int = 10):
@@ -143,30 +193,33 @@ class TmcComUart(TmcCom):
         if self.ser is None:
             self._tmc_logger.log("Cannot read int, serial is not initialized", Loglevel.ERROR)
             return -1
-        while True:
-            tries -= 1
-            rtn, flags = self.read_reg(addr)
-            rtn_data = rtn[7:11]
-            not_zero_count = len([elem for elem in rtn if elem != 0])
-
-            if(len(rtn)<12 or not_zero_count == 0):
-                self._tmc_logger.log(f"""UART Communication Error:
-                                    {len(rtn_data)} data bytes |
-                                    {len(rtn)} total bytes""", Loglevel.ERROR)
-            elif rtn[11] != compute_crc8_atm(rtn[4:11]):
-                self._tmc_logger.log("UART Communication Error: CRC MISMATCH", Loglevel.ERROR)
-            else:
-                break
-
-            if tries<=0:
-                self._tmc_logger.log("after 10 tries not valid answer", Loglevel.ERROR)
-                self._tmc_logger.log(f"addr:\t{addr}", Loglevel.DEBUG)
-                self._tmc_logger.log(f"rtn:\t{rtn}", Loglevel.DEBUG)
-                self.handle_error()
-                return -1
-
-        val = struct.unpack(">i",rtn_data)[0]
-        return val, flags
+        if self._batch is not None and addr in self._batch:
+            # the driver does not have the pending value yet
+            return self._batch[addr], None
+        # the reply is decoded, before another thread can reuse the receive buffer
+        with self._lock:
+            while True:
+                tries -= 1
+                rtn, flags = self.read_reg(addr)
+
+                if(len(rtn)<12 or not any(rtn)):
+                    self._tmc_logger.log(f"""UART Communication Error:
+                                        {max(len(rtn) - 7, 0)} data bytes |
+                                        {len(rtn)} total bytes""", Loglevel.ERROR)
+                elif rtn[11] != compute_crc8_atm(rtn[4:11]):
+                    self._tmc_logger.log("UART Communication Error: CRC MISMATCH", Loglevel.ERROR)
+                else:
+                    break
+
+                if tries<=0:
+                    self._tmc_logger.log("after 10 tries not valid answer", Loglevel.ERROR)
+                    self._tmc_logger.log(f"addr:\t{addr}", Loglevel.DEBUG)
+                    self._tmc_logger.log(f"rtn:\t{bytes(rtn)}", Loglevel.DEBUG)
+                    self.handle_error()
+                    return -1
+
+            val = struct.unpack_from(">i", rtn, 7)[0]
+            return val, flags
 
 
     def write_reg(self, addr:hex, val:int):
@@ -182,29 +235,24 @@ class TmcComUart(TmcCom):
         if self.ser is None:
             self._tmc_logger.log("Cannot write reg, serial is not initialized", Loglevel.ERROR)
             return False
+        if self._batch is not None:
+            self._batch[addr] = val
+            return True
 
-        self.ser.reset_output_buffer()
-        self.ser.reset_input_buffer()
+        with self._lock:
+            self.ser.reset_output_buffer()
+            self.ser.reset_input_buffer()
 
-        self.w_frame[1] = self.mtr_id
-        self.w_frame[2] = addr | 0x80  # set write bit
-
-        self.w_frame[3] = 0xFF & (val>>24)
-        self.w_frame[4] = 0xFF & (val>>16)
-        self.w_frame[5] = 0xFF & (val>>8)
-        self.w_frame[6] = 0xFF & val
-
-        self.w_frame[7] = compute_crc8_atm(self.w_frame[:-1])
-
-
-        rtn = self.ser.write(self.w_frame)
-        if rtn != len(self.w_frame):
-            self._tmc_logger.log("Err in write", Loglevel.ERROR)
-            return False
+            rtn = self.ser.write(self._compose_w_frame(addr, val))
+            if rtn != len(self.w_frame):
+                self._tmc_logger.log("Err in write", Loglevel.ERROR)
+                return False
 
-        time.sleep(self.communication_pause)
+            # wait until the datagram is sent, before the buffers are reset by the next access
+            self.ser.flush()
+            time.sleep(self.communication_pause)
 
-        return True
+            return True
 
 
     def write_reg_check(self, addr:hex, val:int, tries:int=10):
@@ -220,6 +268,9 @@ class TmcComUart(TmcCom):
         if self.ser is None:
             self._tmc_logger.log("Cannot write reg check, serial is not initialized", Loglevel.ERROR)
             return False
+        if self._batch is not None:
+            self._batch[addr] = val
+            return True
         self._tmc_registers["ifcnt"].read()
         ifcnt1 = self._tmc_registers["ifcnt"].ifcnt
 
@@ -242,6 +293,108 @@ class TmcComUart(TmcCom):
                 return False
 
 
+    def _compose_w_frame(self, addr:hex, val:int):
+        """fills the write frame for the given register and value
+
+        Args:
+            addr (int): HEX, which register to write
+            val (int): value for that register
+
+        Returns:
+            list: write frame
+        """
+        self.w_frame[1] = self.mtr_id
+        self.w_frame[2] = addr | 0x80  # set write bit
+        struct.pack_into(">I", self.w_frame, 3, val & 0xFFFFFFFF)
+        self.w_frame[7] = compute_crc8_atm(self._w_frame_crc)
+        return self.w_frame
+
+
+    @contextlib.contextmanager
+    def batch(self):
+        """context manager to collect register writes and send them together
+
+        all writes inside the with block are sent back to back in one serial write
+        and are verified with a single IFCNT read (IFCNT increments by the amount of writes).
+        Multiple writes to the same register are merged and reads of a register
+        with a pending write return the pending value.
+        If the with block raises an exception or the batch cannot be written,
+        the pending writes are discarded and the cache of their registers is invalidated.
+
+        Usage:
+            with tmc.tmc_com.batch():
+                tmc.set_current(1000)
+                tmc.set_microstepping_resolution(16)
+        """
+        if self._batch is not None:
+            # nested batch: the writes are sent by the outer batch
+            yield self
+            return
+        writes = self._batch = {}
+        written = False
+        try:
+            yield self
+            self._batch = None
+            written = self._write_batch(writes)
+        finally:
+            self._batch = None
+            if not written:
+                self._invalidate_registers(writes)
+
+
+    def _invalidate_registers(self, writes:dict):
+        """invalidates the cache of the registers of writes, which did not reach the driver
+
+        Args:
+            writes (dict): {addr: val} of the discarded writes
+        """
+        if self._tmc_registers is None:
+            return
+        for register in self._tmc_registers.values():
+            if register.addr in writes:
+                register.invalidate()
+
+
+    def _write_batch(self, writes:dict, tries:int = 10):
+        """writes the given registers back to back and checks the IFCNT once
+
+        Args:
+            writes (dict): {addr: val} of the registers to write
+            tries (int): how many tries, before error is raised (Default value = 10)
+        """
+        if not writes or self.ser is None:
+            return True
+        self._tmc_registers["ifcnt"].read()
+        ifcnt1 = self._tmc_registers["ifcnt"].ifcnt
+
+        while True:
+            with self._lock:
+                # the write frame is shared, so the frames are composed under the lock
+                frames = bytearray()
+                for addr, val in writes.items():
+                    frames += self._compose_w_frame(addr, val)
+                self.ser.reset_output_buffer()
+                self.ser.reset_input_buffer()
+                rtn = self.ser.write(frames)
+                if rtn != len(frames):
+                    self._tmc_logger.log("Err in write", Loglevel.ERROR)
+                self.ser.flush()
+                time.sleep(self.communication_pause)
+
+            tries -= 1
+            self._tmc_registers["ifcnt"].read()
+            ifcnt2 = self._tmc_registers["ifcnt"].ifcnt
+            if (ifcnt2 - ifcnt1) % 256 == len(writes):
+                return True
+            self._tmc_logger.log("writing batch not successful!", Loglevel.ERROR)
+            self._tmc_logger.log(f"ifcnt: {ifcnt1}, {ifcnt2}, writes: {len(writes)}", Loglevel.DEBUG)
+            ifcnt1 = ifcnt2
+            if tries<=0:
+                self._tmc_logger.log("after 10 tries no valid write access", Loglevel.ERROR)
+                self.handle_error()
+                return False
+
+
     def flush_serial_buffer(self):
         """this function clear the communication buffers of the Raspberry Pi"""
         if self.ser is None:
@@ -277,7 +430,7 @@ class TmcComUart(TmcCom):
 
         self.r_frame[1] = self.mtr_id
         self.r_frame[2] = addr
-        self.r_frame[3] = compute_crc8_atm(self.r_frame[:-1])
+        self.r_frame[3] = compute_crc8_atm(self._r_frame_crc)
 
         rtn = self.ser.write(self.r_frame)
         if rtn != len(self.r_frame):
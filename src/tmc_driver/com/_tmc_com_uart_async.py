@@ -0,0 +1,189 @@
+#pylint: disable=protected-access
+"""
+TmcComUartAsync stepper driver asyncio uart module
+
+register access over the serial port of a TmcComUart, which does not block the event loop.
+The replies are awaited with a reader on the file descriptor of the serial port
+(or by polling for serial replacements without one and event loops without readers).
+"""
+
+import struct
+import asyncio
+import weakref
+from ._tmc_com import compute_crc8_atm
+from ._tmc_com_uart import TmcComUart
+from .._tmc_logger import Loglevel
+from .._tmc_exceptions import TmcComException
+
+
+_port_locks = weakref.WeakKeyDictionary()  # {serial port: asyncio.Lock}; shared by all drivers on one port
+
+
+class TmcComUartAsync():
+    """TmcComUartAsync
+
+    uses the serial port, the node address and the registers of the given TmcComUart.
+    All TmcComUartAsync on one serial port share one asyncio.Lock.
+    Every transfer also holds the lock of the TmcComUart, so that the blocking com
+    (e.g. a poll thread) can use the serial port at the same time.
+    """
+
+    _tmc_com:TmcComUart = None
+    _r_frame:bytearray = None
+    _w_frame:bytearray = None
+    _poll_interval:float = 0.001        # for serial ports without file descriptor
+
+
+    @property
+    def tmc_com(self):
+        """_tmc_com property"""
+        return self._tmc_com
+
+
+    def __init__(self, tmc_com:TmcComUart):
+        """constructor
+
+        Args:
+            tmc_com (TmcComUart): initialized blocking com of the driver
+        """
+        self._tmc_com = tmc_com
+        self._r_frame = bytearray([0x55, 0, 0, 0])
+        self._w_frame = bytearray([0x55, 0, 0, 0, 0, 0, 0, 0])
+
+
+    def _lock(self) -> asyncio.Lock:
+        """returns the lock of the serial port"""
+        ser = self._tmc_com.ser
+        if ser not in _port_locks:
+            _port_locks[ser] = asyncio.Lock()
+        return _port_locks[ser]
+
+
+    async def _wait_readable(self, timeout:float):
+        """waits until the serial port has received data or the timeout is over
+
+        Args:
+            timeout (float): max time in seconds
+        """
+        loop = asyncio.get_running_loop()
+        readable = loop.create_future()
+        try:
+            fd = self._tmc_com.ser.fileno()
+            loop.add_reader(fd, lambda: readable.done() or readable.set_result(None))
+        except (AttributeError, OSError, ValueError, NotImplementedError):
+            # no file descriptor or no reader support (e.g. the ProactorEventLoop on Windows)
+            await asyncio.sleep(min(timeout, self._poll_interval))
+            return
+        try:
+            await asyncio.wait_for(readable, timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            loop.remove_reader(fd)
+
+
+    async def _acquire_com_lock(self):
+        """acquires the lock of the TmcComUart without blocking the event loop"""
+        while not self._tmc_com._lock.acquire(blocking=False):
+            await asyncio.sleep(self._poll_interval)
+
+
+    async def _transfer(self, frame:bytearray, size:int) -> bytearray:
+        """sends one datagram and receives the echo and the reply
+
+        Args:
+            frame (bytearray): datagram
+            size (int): expected amount of received bytes
+
+        Returns:
+            bytearray: received bytes; shorter than size after a timeout
+        """
+        tmc_com = self._tmc_com
+        ser = tmc_com.ser
+        loop = asyncio.get_running_loop()
+        await self._acquire_com_lock()
+        try:
+            ser.reset_input_buffer()
+            if ser.write(frame) != len(frame):
+                tmc_com.tmc_logger.log("Err in write", Loglevel.ERROR)
+            deadline = loop.time() + 20000 / ser.baudrate
+            rx = bytearray()
+            while len(rx) < size:
+                waiting = ser.in_waiting
+                if waiting:
+                    rx += ser.read(min(waiting, size - len(rx)))
+                    continue
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                await self._wait_readable(remaining)
+            await asyncio.sleep(tmc_com.communication_pause)
+        finally:
+            tmc_com._lock.release()
+        return rx
+
+
+    async def read_int(self, addr:hex, tries:int = 10) -> tuple:
+        """reads a register
+
+        Args:
+            addr (int): HEX, which register to read
+            tries (int): how many tries, before error is raised (Default value = 10)
+
+        Returns:
+            int: register value
+            Dict: flags
+        """
+        async with self._lock():
+            frame = self._r_frame
+            frame[1] = self._tmc_com.mtr_id
+            frame[2] = addr
+            frame[3] = compute_crc8_atm(frame[:3])
+            for _ in range(tries):
+                rtn = await self._transfer(frame, 12)
+                if len(rtn) < 12 or not any(rtn):
+                    self._tmc_com.tmc_logger.log(f"UART Communication Error: {len(rtn)} total bytes",
+                                                 Loglevel.ERROR)
+                elif rtn[11] != compute_crc8_atm(rtn[4:11]):
+                    self._tmc_com.tmc_logger.log("UART Communication Error: CRC MISMATCH", Loglevel.ERROR)
+                else:
+                    return struct.unpack_from(">i", rtn, 7)[0], None
+        raise TmcComException(f"after {tries} tries no valid answer for register {hex(addr)}")
+
+
+    async def write_reg(self, addr:hex, val:int):
+        """writes a register
+
+        Args:
+            addr (int): HEX, which register to write
+            val (int): value for that register
+        """
+        async with self._lock():
+            frame = self._w_frame
+            frame[1] = self._tmc_com.mtr_id
+            frame[2] = addr | 0x80
+            struct.pack_into(">I", frame, 3, val & 0xFFFFFFFF)
+            frame[7] = compute_crc8_atm(frame[:7])
+            # the echo shows, that the datagram is on the wire
+            await self._transfer(frame, 8)
+
+
+    async def write_reg_check(self, addr:hex, val:int, tries:int = 10):
+        """writes a register and checks with the IFCNT register, that the write was successful
+
+        Args:
+            addr (int): HEX, which register to write
+            val (int): value for that register
+            tries (int): how many tries, before error is raised (Default value = 10)
+        """
+        ifcnt_addr = self._tmc_com.tmc_registers["ifcnt"].addr
+        ifcnt1 = (await self.read_int(ifcnt_addr))[0] & 0xFF
+        for _ in range(tries):
+            await self.write_reg(addr, val)
+            ifcnt2 = (await self.read_int(ifcnt_addr))[0] & 0xFF
+            if (ifcnt2 - ifcnt1) % 256 == 1:
+                return
+            self._tmc_com.tmc_logger.log("writing not successful!", Loglevel.ERROR)
+            self._tmc_com.tmc_logger.log(f"ifcnt: {ifcnt1}, {ifcnt2}", Loglevel.DEBUG)
+            ifcnt1 = ifcnt2
+        raise TmcComException(f"after {tries} tries no valid write access to register {hex(addr)}")
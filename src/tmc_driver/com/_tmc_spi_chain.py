@@ -0,0 +1,296 @@
+#pylint: disable=import-error
+#pylint: disable=protected-access
+#pylint: disable=too-many-arguments
+#pylint: disable=too-many-positional-arguments
+#pylint: disable=too-many-instance-attributes
+"""
+TmcSpiChain stepper driver spi daisy chain module
+
+several TMC2240 in a daisy chain on one chip select (SDO of one driver to SDI of the next).
+One transfer of 5*N bytes reads or writes one register on all N drivers
+"""
+
+import threading
+from typing import List
+import spidev
+from ._tmc_com_spi import TmcComSpi
+from .._tmc_logger import TmcLogger
+from .._tmc_exceptions import TmcComException
+
+
+class TmcSpiChain():
+    """TmcSpiChain
+
+    this class owns the SPI device of the chain and hands out one TmcComSpi per chain position.
+    Position 0 is the driver, which is connected to MOSI,
+    position N-1 is the driver, which is connected to MISO.
+    """
+
+    _spi:spidev.SpiDev = None
+    _spi_bus:int = 0
+    _spi_dev:int = 0
+    _spi_speed:int = 8000000
+    _length:int = 0
+    _lock:threading.RLock = None        # held for the whole pipelined access
+    _coms:List["TmcComSpiChainNode"] = None
+    _is_open:bool = False
+
+
+    @property
+    def spi(self):
+        """_spi property"""
+        return self._spi
+
+    @property
+    def length(self):
+        """_length property"""
+        return self._length
+
+    @property
+    def coms(self):
+        """_coms property"""
+        return self._coms
+
+
+    def __init__(self,
+                 spi_bus:int,
+                 spi_dev:int,
+                 length:int,
+                 spi_speed:int = 8000000,
+                 tmc_logger:TmcLogger = None
+                 ):
+        """constructor
+
+        Args:
+            spi_bus (int): SPI bus
+            spi_dev (int): SPI device (chip select)
+            length (int): amount of drivers in the chain
+            spi_speed (int): SPI speed in Hz (Default value = 8000000)
+            tmc_logger (class): TMCLogger class (Default value = None)
+        """
+        if length < 1:
+            raise TmcComException(f"invalid chain length {length}")
+        if tmc_logger is None:
+            tmc_logger = TmcLogger(logprefix="TmcSpiChain")
+        self._spi = spidev.SpiDev()
+        self._spi_bus = spi_bus
+        self._spi_dev = spi_dev
+        self._spi_speed = spi_speed
+        self._length = length
+        self._lock = threading.RLock()
+        self._coms = [TmcComSpiChainNode(self, position, tmc_logger) for position in range(length)]
+
+
+    def __del__(self):
+        """destructor"""
+        if self._is_open:
+            self._spi.close()
+
+
+    def init(self):
+        """opens the SPI device; called by the drivers of all positions, opens it only once"""
+        if self._is_open:
+            return
+        TmcComSpi.init(self._coms[0])
+        self._is_open = True
+
+
+    def get_com(self, position:int) -> "TmcComSpiChainNode":
+        """returns the com of the driver at the given chain position
+
+        Args:
+            position (int): position in the chain [0 - length-1]
+
+        Returns:
+            TmcComSpiChainNode: com of this position
+        """
+        if position not in range(self._length):
+            raise TmcComException(f"invalid chain position {position}; the chain has {self._length} drivers")
+        return self._coms[position]
+
+
+    def transfer(self, frames:List[list]) -> List[list]:
+        """sends one datagram to every driver of the chain with a single transfer
+
+        Args:
+            frames (list): 5 byte datagram for every position
+
+        Returns:
+            list: 5 byte reply of every position
+        """
+        length = self._length
+        tx = [0] * (5 * length)
+        for position, frame in enumerate(frames):
+            offset = (length - 1 - position) * 5
+            tx[offset:offset + 5] = frame
+        with self._lock:
+            rx = self._spi.xfer2(tx)
+        return [rx[(length - 1 - position) * 5:(length - position) * 5] for position in range(length)]
+
+
+    def read_many_all(self, addrs:List[int]) -> List[List[tuple]]:
+        """reads several registers of all drivers with len(addrs)+1 transfers
+
+        Args:
+            addrs (list): HEX, which registers to read
+
+        Returns:
+            list: for every position a list of (register value, flags)
+        """
+        result = [[] for _ in range(self._length)]
+        with self._lock:
+            for i, addr in enumerate(list(addrs) + [0x00]):
+                replies = self.transfer([[addr, 0, 0, 0, 0]] * self._length)
+                if i == 0:
+                    continue
+                for position, reply in enumerate(replies):
+                    result[position].append(self._coms[position]._decode_reply(reply))
+        return result
+
+
+    def read_int_all(self, addr:int) -> List[tuple]:
+        """reads one register of all drivers with 2 transfers
+
+        Args:
+            addr (int): HEX, which register to read
+
+        Returns:
+            list: (register value, flags) for every position
+        """
+        return [values[0] for values in self.read_many_all([addr])]
+
+
+    def write_reg_all(self, addr:int, vals:List[int]):
+        """writes one register of all drivers with one transfer
+
+        Args:
+            addr (int): HEX, which register to write
+            vals (list): value for every position
+        """
+        self.transfer([[addr | 0x80, 0xFF & (val>>24), 0xFF & (val>>16), 0xFF & (val>>8), 0xFF & val]
+                       for val in vals])
+
+
+    def node_read_many(self, position:int, addrs:List[int]) -> List[tuple]:
+        """reads several registers of one driver with len(addrs)+1 transfers.
+        The other drivers receive read accesses to GCONF, which have no effect.
+
+        Args:
+            position (int): position in the chain
+            addrs (list): HEX, which registers to read
+
+        Returns:
+            list: (register value, flags) for every register
+        """
+        result = []
+        frames = [[0x00, 0, 0, 0, 0] for _ in range(self._length)]
+        with self._lock:
+            for i, addr in enumerate(list(addrs) + [0x00]):
+                frames[position][0] = addr
+                reply = self.transfer(frames)[position]
+                if i > 0:
+                    result.append(self._coms[position]._decode_reply(reply))
+        return result
+
+
+    def node_write_reg(self, position:int, addr:int, val:int):
+        """writes one register of one driver.
+        The other drivers receive read accesses to GCONF, which have no effect.
+
+        Args:
+            position (int): position in the chain
+            addr (int): HEX, which register to write
+            val (int): value for that register
+        """
+        frames = [[0x00, 0, 0, 0, 0] for _ in range(self._length)]
+        frames[position] = [addr | 0x80, 0xFF & (val>>24), 0xFF & (val>>16), 0xFF & (val>>8), 0xFF & val]
+        self.transfer(frames)
+
+
+
+class TmcComSpiChainNode(TmcComSpi):
+    """TmcComSpiChainNode
+
+    com of one driver in a TmcSpiChain
+    """
+
+    _chain:TmcSpiChain = None
+    _position:int = 0
+
+
+    @property
+    def chain(self):
+        """_chain property"""
+        return self._chain
+
+    @property
+    def position(self):
+        """_position property"""
+        return self._position
+
+
+    def __init__(self, chain:TmcSpiChain, position:int, tmc_logger = None):
+        """constructor
+
+        Args:
+            chain (TmcSpiChain): chain of this driver
+            position (int): position in the chain
+            tmc_logger (class): TMCLogger class (Default value = None)
+        """
+        super().__init__(chain._spi_bus, chain._spi_dev, chain._spi_speed, 0, tmc_logger)
+        self.spi = chain.spi
+        self._chain = chain
+        self._position = position
+
+
+    def init(self):
+        """init"""
+        self._chain.init()
+
+
+    def read_reg(self, addr:hex):
+        """reads the registry on the TMC with a given address.
+        returns the binary value of that register
+
+        Args:
+            addr (int): HEX, which register to read
+        Returns:
+            bytes: register value
+            Dict: flags
+        """
+        val, flags = self.read_int(addr)
+        return val.to_bytes(4, byteorder='big'), flags
+
+
+    def read_int(self, addr:hex, tries:int = 10):
+        """reads a register of this driver
+
+        Args:
+            addr (int): HEX, which register to read
+            tries (int): not used for SPI (Default value = 10)
+        Returns:
+            int: register value
+            Dict: flags
+        """
+        return self._chain.node_read_many(self._position, [addr])[0]
+
+
+    def read_many(self, addrs:List[int]) -> List[tuple]:
+        """reads several registers of this driver with N+1 transfers
+
+        Args:
+            addrs (list): HEX, which registers to read
+        Returns:
+            list: (register value, flags) for every register
+        """
+        return self._chain.node_read_many(self._position, list(addrs))
+
+
+    def write_reg(self, addr:hex, val:int):
+        """writes a register of this driver
+
+        Args:
+            addr (int): HEX, which register to write
+            val (int): value for that register
+        """
+        self._chain.node_write_reg(self._position, addr, val)
@@ -0,0 +1,173 @@
+#pylint: disable=protected-access
+"""
+TmcUartBus stepper driver uart bus module
+
+shares one serial port between up to four TMC2209 with different node addresses
+"""
+
+import time
+import threading
+import serial
+from ._tmc_com_uart import TmcComUart
+from ..reg._tmc_reg import read_registers
+from .._tmc_logger import TmcLogger, Loglevel
+from .._tmc_exceptions import TmcComException, TmcDriverException
+
+
+class TmcUartBus():
+    """TmcUartBus
+
+    this class owns the serial port and hands out one TmcComUart handle per node address.
+    All handles share one lock, so that the datagrams of different drivers do not interleave.
+    The driver_address of the driver has to match the address of the handle.
+    """
+
+    STATUS_REGISTERS = ("drvstatus", "sgresult", "tstep")
+
+    _ser:serial.Serial = None
+    _lock:threading.RLock = None
+    _tmc_logger:TmcLogger = None
+    _coms:dict = None                   # {mtr_id: TmcComUart}
+    _sweep_thread:threading.Thread = None
+    _sweep_stop:threading.Event = None
+    _last_sweep:dict = None
+
+
+    @property
+    def ser(self):
+        """_ser property"""
+        return self._ser
+
+    @property
+    def lock(self):
+        """_lock property"""
+        return self._lock
+
+    @property
+    def coms(self):
+        """_coms property"""
+        return self._coms
+
+    @property
+    def last_sweep(self):
+        """result of the last status sweep"""
+        return self._last_sweep
+
+
+    def __init__(self,
+                 serialport:str,
+                 baudrate:int = 115200,
+                 tmc_logger:TmcLogger = None
+                 ):
+        """constructor
+
+        Args:
+            serialport (string): serialport path
+            baudrate (int): baudrate
+            tmc_logger (class): TMCLogger class (Default value = None)
+        """
+        if tmc_logger is None:
+            tmc_logger = TmcLogger(logprefix="TmcUartBus")
+        self._tmc_logger = tmc_logger
+        self._ser = serial.Serial()
+        self._ser.port = serialport
+        self._ser.baudrate = baudrate
+        self._lock = threading.RLock()
+        self._coms = {}
+        self._last_sweep = {}
+        self._sweep_stop = threading.Event()
+
+
+    def __del__(self):
+        """destructor"""
+        self.stop_sweep()
+        if self._ser is not None:
+            self._ser.close()
+
+
+    def get_com(self, mtr_id:int) -> TmcComUart:
+        """returns the TmcComUart handle for the given node address
+
+        Args:
+            mtr_id (int): driver address [0-3]
+
+        Returns:
+            TmcComUart: com handle, which uses the shared serial port
+        """
+        if mtr_id not in range(4):
+            raise TmcComException(f"invalid driver address {mtr_id}; must be 0-3")
+        if mtr_id not in self._coms:
+            tmc_com = TmcComUart(None, self._ser.baudrate, mtr_id, self._tmc_logger)
+            tmc_com.ser = self._ser
+            tmc_com._lock = self._lock
+            tmc_com._bus = self
+            self._coms[mtr_id] = tmc_com
+        return self._coms[mtr_id]
+
+
+    def sweep(self, registers:tuple = STATUS_REGISTERS) -> dict:
+        """reads the given registers of all drivers on the bus back to back.
+        The bus is locked for the whole sweep.
+        Registers a driver does not have are skipped.
+
+        Args:
+            registers (tuple): names of the registers (Default value = STATUS_REGISTERS)
+
+        Returns:
+            dict: {mtr_id: {register name: register value}}
+        """
+        result = {}
+        with self._lock:
+            for mtr_id, tmc_com in self._coms.items():
+                if tmc_com.tmc_registers is None:
+                    continue
+                regs = [tmc_com.tmc_registers[name] for name in registers
+                        if name in tmc_com.tmc_registers]
+                read_registers(regs, force=True)
+                result[mtr_id] = {reg.name.lower(): reg.data_int for reg in regs}
+        self._last_sweep = result
+        return result
+
+
+    def start_sweep(self, interval:float, callback = None, registers:tuple = STATUS_REGISTERS):
+        """starts sweeping the status registers of all drivers periodically in a thread
+
+        Args:
+            interval (float): time between the start of two sweeps in seconds
+            callback (func): called with the result of every sweep (Default value = None)
+            registers (tuple): names of the registers (Default value = STATUS_REGISTERS)
+        """
+        self.stop_sweep()
+        self._sweep_stop.clear()
+        self._sweep_thread = threading.Thread(target=self._sweep_loop,
+                                              args=(interval, callback, registers), daemon=True)
+        self._sweep_thread.start()
+
+
+    def stop_sweep(self):
+        """stops the periodic status sweep"""
+        self._sweep_stop.set()
+        if self._sweep_thread is not None:
+            self._sweep_thread.join()
+            self._sweep_thread = None
+
+
+    def _sweep_loop(self, interval:float, callback, registers:tuple):
+        """sweep thread
+
+        Args:
+            interval (float): time between the start of two sweeps in seconds
+            callback (func): called with the result of every sweep
+            registers (tuple): names of the registers
+        """
+        next_sweep = time.monotonic()
+        while not self._sweep_stop.is_set():
+            try:
+                result = self.sweep(registers)
+            except (TmcComException, TmcDriverException) as e:
+                self._tmc_logger.log(f"status sweep failed: {e}", Loglevel.ERROR)
+            else:
+                if callback is not None:
+                    callback(result)
+            next_sweep += interval
+            self._sweep_stop.wait(max(next_sweep - time.monotonic(), 0))
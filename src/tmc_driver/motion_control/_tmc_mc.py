@@ -1,10 +1,13 @@
 #pylint: disable=too-many-instance-attributes
+#pylint: disable=too-many-public-methods
 """
 Motion Control base module
 """
 
 from enum import Enum
 from .._tmc_logger import TmcLogger, Loglevel
+from ._tmc_mc_ramp import TmcRampProfile, TmcRampTrapezoid
+from ._tmc_mc_stats import TmcMoveStats
 
 
 class Direction(Enum):
@@ -61,6 +64,12 @@ class TmcMotionControl():
     _movement_abs_rel:MovementAbsRel = MovementAbsRel.ABSOLUTE
     _movement_phase:MovementPhase = MovementPhase.STANDSTILL
 
+    _ramp_profile:TmcRampProfile = TmcRampTrapezoid()   # default ramp profile of a movement
+
+    _move_stats_enabled:bool = False    # whether the timing of every movement is recorded
+    _move_stats_callback = None         # called with the TmcMoveStats of every movement
+    _last_move_stats:TmcMoveStats = None
+
 
     @property
     def current_pos(self):
@@ -114,6 +123,16 @@ class TmcMotionControl():
         """_movement_phase property"""
         return self._movement_phase
 
+    @property
+    def ramp_profile(self):
+        """_ramp_profile property"""
+        return self._ramp_profile
+
+    @ramp_profile.setter
+    def ramp_profile(self, ramp_profile:TmcRampProfile):
+        """_ramp_profile setter"""
+        self._ramp_profile = ramp_profile
+
     @property
     def speed(self):
         """_speed property"""
@@ -169,6 +188,37 @@ class TmcMotionControl():
         """_acceleration_fullstep setter"""
         self.acceleration = acceleration_fullstep * self.mres
 
+    @property
+    def move_stats_enabled(self):
+        """_move_stats_enabled property"""
+        return self._move_stats_enabled
+
+    @move_stats_enabled.setter
+    def move_stats_enabled(self, enabled:bool):
+        """_move_stats_enabled setter"""
+        self._move_stats_enabled = enabled
+
+    @property
+    def move_stats_callback(self):
+        """_move_stats_callback property"""
+        return self._move_stats_callback
+
+    @move_stats_callback.setter
+    def move_stats_callback(self, callback):
+        """_move_stats_callback setter
+        setting a callback enables the move stats
+        """
+        self._move_stats_callback = callback
+        if callback is not None:
+            self._move_stats_enabled = True
+
+    @property
+    def last_move_stats(self):
+        """timing statistics of the last movement (TmcMoveStats);
+        None, if the move stats are disabled
+        """
+        return self._last_move_stats
+
 
 
     def init(self, tmc_logger:TmcLogger):
@@ -203,7 +253,19 @@ class TmcMotionControl():
         self._stop = stop_mode
 
 
-    def run_to_position_steps(self, steps, movement_abs_rel:MovementAbsRel = None):
+    def _publish_move_stats(self, stats:TmcMoveStats):
+        """stores the statistics of a finished movement and passes them to the callback
+
+        Args:
+            stats (TmcMoveStats): statistics of the movement
+        """
+        self._last_move_stats = stats
+        if self._move_stats_callback is not None:
+            self._move_stats_callback(stats)
+
+
+    def run_to_position_steps(self, steps, movement_abs_rel:MovementAbsRel = None,
+                              ramp_profile:TmcRampProfile = None):
         """runs the motor to the given position.
         with acceleration and deceleration
         blocks the code until finished or stopped from a different thread!
@@ -214,6 +276,8 @@ class TmcMotionControl():
             steps (int): amount of steps; can be negative
             movement_abs_rel (enum): whether the movement should be absolut or relative
                 (Default value = None)
+            ramp_profile (TmcRampProfile): ramp profile for this movement
+                (Default value = None, uses ramp_profile)
 
         Returns:
             stop (enum): how the movement was finished
@@ -0,0 +1,221 @@
+#pylint: disable=too-many-locals
+#pylint: disable=protected-access
+#pylint: disable=too-many-branches
+#pylint: disable=too-many-statements
+"""
+Motion Group module
+
+coordinated movement of several STEP/DIR motion controls
+"""
+
+import time
+import threading
+from typing import List
+from ._tmc_mc import MovementAbsRel, MovementPhase, Direction, StopMode
+from ._tmc_mc_step_dir import TmcMotionControlStepDir
+from ._tmc_mc_scheduler import TmcStepScheduler
+from . import _tmc_mc_ramp as tmc_ramp
+from .._tmc_gpio_board import tmc_gpio, Gpio
+from .._tmc_exceptions import TmcMotionControlException
+
+
+class TmcMotionGroup():
+    """Motion Group class
+
+    moves several STEP/DIR axes on a straight line in one timing loop.
+    The axis with the longest distance (dominant axis) follows one velocity profile,
+    the other axes are interpolated with a Bresenham DDA.
+    """
+
+    _axes:List[TmcMotionControlStepDir] = None
+    _stop:StopMode = StopMode.NO
+    _scheduler:TmcStepScheduler = None
+    _movement_thread:threading.Thread = None
+    _min_pulse_width:int = 1            # minimum allowed pulse with in microseconds
+
+
+    @property
+    def axes(self):
+        """_axes property"""
+        return self._axes
+
+    @property
+    def current_pos(self):
+        """current positions of all axes"""
+        return [axis.current_pos for axis in self._axes]
+
+
+    def __init__(self, axes:List[TmcMotionControlStepDir]):
+        """constructor
+
+        Args:
+            axes (list): TmcMotionControlStepDir instances, which should move together
+        """
+        for axis in axes:
+            if not isinstance(axis, TmcMotionControlStepDir):
+                raise TmcMotionControlException("TmcMotionGroup only works with STEP/DIR Control")
+        self._axes = list(axes)
+        self._scheduler = TmcStepScheduler()
+
+
+    def stop(self, stop_mode = StopMode.HARDSTOP):
+        """stop the current movement
+
+        Args:
+            stop_mode (enum): whether the movement should be stopped immediately or softly
+                (Default value = StopMode.HARDSTOP)
+        """
+        self._stop = stop_mode
+
+
+    def run_to_position_steps(self, steps:List[int], movement_abs_rel:MovementAbsRel = None,
+                              ramp_profile:tmc_ramp.TmcRampProfile = None) -> StopMode:
+        """runs all axes to the given positions on a straight line.
+        with acceleration and deceleration
+        blocks the code until finished or stopped from a different thread!
+
+        Speed and acceleration are limited, so that no axis exceeds its own
+        max_speed and acceleration.
+
+        Args:
+            steps (list): amount of steps per axis; can be negative
+            movement_abs_rel (enum): whether the movement should be absolut or relative
+                (Default value = None, uses the setting of the first axis)
+            ramp_profile (TmcRampProfile): ramp profile for this movement
+                (Default value = None, uses the ramp profile of the first axis)
+
+        Returns:
+            stop (enum): how the movement was finished
+        """
+        if len(steps) != len(self._axes):
+            raise TmcMotionControlException(f"expected {len(self._axes)} positions, got {len(steps)}")
+        if movement_abs_rel is None:
+            movement_abs_rel = self._axes[0].movement_abs_rel
+        if ramp_profile is None:
+            ramp_profile = self._axes[0].ramp_profile
+
+        self._stop = StopMode.NO
+
+        distances = []
+        for axis, step in zip(self._axes, steps):
+            if movement_abs_rel == MovementAbsRel.RELATIVE:
+                axis._target_pos = axis.current_pos + step
+            else:
+                axis._target_pos = step
+            distances.append(axis._target_pos - axis.current_pos)
+
+        distance = max(abs(d) for d in distances)
+        if distance == 0:
+            return self._stop
+
+        # limit the profile of the dominant axis by the limits of all axes
+        max_speed = min(axis.max_speed * distance / abs(d)
+                        for axis, d in zip(self._axes, distances) if d != 0)
+        acceleration = min(axis.acceleration * distance / abs(d)
+                           for axis, d in zip(self._axes, distances) if d != 0)
+        plan = ramp_profile.compute(distance, max_speed, acceleration)
+
+        # [axis, pin_step, abs distance, position step, error accumulator, speed ratio]
+        moving = []
+        for axis, d in zip(self._axes, distances):
+            if d == 0:
+                continue
+            tmc_gpio.gpio_output(axis.pin_step, Gpio.LOW)
+            axis.set_direction(Direction.CW if d > 0 else Direction.CCW)
+            axis._movement_phase = MovementPhase.ACCELERATING
+            moving.append([axis, axis.pin_step, abs(d), 1 if d > 0 else -1, distance // 2, d / distance])
+
+        try:
+            self._run_plan(plan, moving, distance, acceleration)
+        finally:
+            for axis, _, _, _, _, _ in moving:
+                axis._speed = 0.0
+                axis._step_interval = 0
+                axis._movement_phase = MovementPhase.STANDSTILL
+        return self._stop
+
+
+    def _run_plan(self, plan:tmc_ramp.TmcRampPlan, moving:list, distance:int, acceleration:float):
+        """makes the steps of a precomputed movement for all moving axes
+
+        Args:
+            plan (TmcRampPlan): precomputed step intervals of the dominant axis
+            moving (list): state of the moving axes
+            distance (int): distance of the dominant axis
+            acceleration (float): acceleration of the dominant axis
+        """
+        scheduler = self._scheduler
+        scheduler.start()
+        pulse_width = self._min_pulse_width * 1000
+        intervals = plan.intervals
+        phase = MovementPhase.ACCELERATING
+        i = 0
+        while i < len(intervals):
+            interval = intervals[i]
+            if intervals is plan.intervals:
+                if i == plan.cruise_start:
+                    phase = MovementPhase.MAXSPEED
+                if i == plan.decel_start:
+                    phase = MovementPhase.DECELERATING
+
+            if i > 0 or intervals is not plan.intervals:
+                scheduler.advance(interval)
+                while not scheduler.wait() and self._stop != StopMode.HARDSTOP:
+                    pass
+
+            if self._stop == StopMode.HARDSTOP:
+                return
+
+            speed = 1000000.0 / interval
+            stepping = []
+            for state in moving:
+                state[4] += state[2]
+                if state[4] >= distance:
+                    state[4] -= distance
+                    stepping.append(state)
+                axis = state[0]
+                axis._speed = speed * state[5]
+                axis._step_interval = interval
+                axis._movement_phase = phase
+
+            for state in stepping:
+                tmc_gpio.gpio_output(state[1], Gpio.HIGH)
+            pulse_end = time.perf_counter_ns() + pulse_width
+            while time.perf_counter_ns() < pulse_end:
+                pass
+            for state in stepping:
+                tmc_gpio.gpio_output(state[1], Gpio.LOW)
+                state[0]._current_pos += state[3]
+            i += 1
+
+            if self._stop == StopMode.SOFTSTOP and intervals is plan.intervals:
+                intervals = tmc_ramp.compute_stop_ramp(interval, acceleration, len(intervals) - i)
+                phase = MovementPhase.DECELERATING
+                i = 0
+
+
+    def run_to_position_steps_threaded(self, steps:List[int], movement_abs_rel:MovementAbsRel = None,
+                                       ramp_profile:tmc_ramp.TmcRampProfile = None):
+        """runs all axes to the given positions on a straight line.
+        does not block the code
+
+        Args:
+            steps (list): amount of steps per axis; can be negative
+            movement_abs_rel (enum): whether the movement should be absolut or relative
+                (Default value = None)
+            ramp_profile (TmcRampProfile): ramp profile for this movement
+                (Default value = None)
+        """
+        self._movement_thread = threading.Thread(target=self.run_to_position_steps,
+                                                    args=(steps, movement_abs_rel, ramp_profile))
+        self._movement_thread.start()
+
+
+    def wait_for_movement_finished_threaded(self) -> StopMode:
+        """wait for the movement to finish, if started threaded
+
+        Returns:
+            enum: how the movement was finished
+        """
+        self._movement_thread.join()
+        return self._stop
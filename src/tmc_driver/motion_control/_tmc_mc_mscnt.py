@@ -0,0 +1,81 @@
+"""
+Microstep counter position estimator module
+
+unwraps the microstep counter MSCNT of the driver into a continuous position
+"""
+
+
+class TmcMscntEstimator():
+    """TmcMscntEstimator
+
+    MSCNT counts 1024 per electrical period of 4 fullsteps, so it gives the exact
+    position within the period, but wraps many times per second at higher speeds.
+    The caller predicts the position at each read (e.g. by integrating the velocity);
+    the period is chosen, which brings the MSCNT value closest to the prediction.
+    This is correct, as long as the prediction error stays below 2 fullsteps.
+    MSCNT is expected to count up in positive direction.
+    """
+
+    PERIOD = 1024                       # MSCNT values per electrical period
+
+    _mres:int = 2
+    _mscnt:int = 0                      # last MSCNT value
+    _position:int = 0                   # position in µsteps at the last MSCNT value
+    _error:float = 0.0                  # position - prediction at the last update
+
+
+    @property
+    def mres(self):
+        """_mres property"""
+        return self._mres
+
+    @property
+    def position(self):
+        """position in µsteps at the last MSCNT value"""
+        return self._position
+
+    @property
+    def error(self):
+        """difference between the position and the prediction of the last update in µsteps"""
+        return self._error
+
+
+    def __init__(self, mres:int):
+        """constructor
+
+        Args:
+            mres (int): µstep resolution
+        """
+        self._mres = mres
+
+
+    def reset(self, mscnt:int, position:int):
+        """sets the position, which belongs to the given MSCNT value
+
+        Args:
+            mscnt (int): MSCNT value
+            position (int): position in µsteps
+        """
+        self._mscnt = mscnt
+        self._position = position
+        self._error = 0.0
+
+
+    def update(self, mscnt:int, predicted:float) -> int:
+        """unwraps a new MSCNT value
+
+        Args:
+            mscnt (int): MSCNT value
+            predicted (float): predicted position in µsteps
+
+        Returns:
+            int: position in µsteps
+        """
+        step_width = 256 // self._mres              # MSCNT change per µstep
+        predicted_delta = (predicted - self._position) * step_width
+        delta = (mscnt - self._mscnt) % self.PERIOD
+        delta += round((predicted_delta - delta) / self.PERIOD) * self.PERIOD
+        self._position += round(delta / step_width)
+        self._mscnt = mscnt
+        self._error = self._position - predicted
+        return self._position
@@ -0,0 +1,202 @@
+#pylint: disable=protected-access
+"""
+Move Queue module
+
+queues movements of a STEP/DIR motion control and blends them
+with a lookahead planner, so that consecutive movements in the
+same direction do not stop in between
+"""
+
+import math
+import time
+from collections import deque
+from concurrent.futures import Future
+from ._tmc_mc import MovementAbsRel, MovementPhase, Direction, StopMode
+from ._tmc_mc_step_dir import TmcMotionControlStepDir
+from ._tmc_mc_ramp import TmcRampProfile
+from ._tmc_mc_stats import TmcMoveStats
+from .._tmc_exceptions import TmcMotionControlException
+
+
+class TmcMoveQueue():
+    """Move Queue class
+
+    the junction speed between two movements is limited by the max speed of both movements,
+    by a change of direction or a ramp profile without blending support (junction speed 0)
+    and by the distance that is available to decelerate within the lookahead window.
+    The last movement in the window always ends at standstill.
+    """
+
+    _tmc_mc:TmcMotionControlStepDir = None
+    _segments:deque = None              # queued movements: (target position, max speed, ramp profile)
+    _lookahead:int = 8                  # amount of movements, which are considered for planning
+    _future:Future = None               # result of the threaded run
+
+
+    @property
+    def lookahead(self):
+        """_lookahead property"""
+        return self._lookahead
+
+    @lookahead.setter
+    def lookahead(self, lookahead:int):
+        """_lookahead setter"""
+        self._lookahead = max(1, lookahead)
+
+
+    def __init__(self, tmc_mc:TmcMotionControlStepDir, lookahead:int = 8):
+        """constructor
+
+        Args:
+            tmc_mc (TmcMotionControlStepDir): motion control, which executes the movements
+            lookahead (int): amount of movements, which are considered for planning (Default value = 8)
+        """
+        if not isinstance(tmc_mc, TmcMotionControlStepDir):
+            raise TmcMotionControlException("TmcMoveQueue only works with STEP/DIR Control")
+        self._tmc_mc = tmc_mc
+        self._segments = deque()
+        self.lookahead = lookahead
+
+
+    def __len__(self):
+        """amount of queued movements"""
+        return len(self._segments)
+
+
+    def add(self, steps:int, movement_abs_rel:MovementAbsRel = None, max_speed:float = None,
+            ramp_profile:TmcRampProfile = None):
+        """adds a movement to the queue
+
+        Args:
+            steps (int): amount of steps; can be negative
+            movement_abs_rel (enum): whether the movement should be absolut or relative
+                (Default value = None)
+            max_speed (float): max speed of this movement in steps per second
+                (Default value = None, uses the max speed of the motion control)
+            ramp_profile (TmcRampProfile): ramp profile for this movement
+                (Default value = None, uses the ramp profile of the motion control)
+        """
+        if movement_abs_rel is None:
+            movement_abs_rel = self._tmc_mc.movement_abs_rel
+        if max_speed is None:
+            max_speed = self._tmc_mc.max_speed
+        if ramp_profile is None:
+            ramp_profile = self._tmc_mc.ramp_profile
+
+        last_target = self._segments[-1][0] if self._segments else self._tmc_mc.current_pos
+        if movement_abs_rel == MovementAbsRel.RELATIVE:
+            target = last_target + steps
+        else:
+            target = steps
+
+        if target != last_target:
+            self._segments.append((target, abs(max_speed), ramp_profile))
+
+
+    def clear(self):
+        """removes all queued movements"""
+        self._segments.clear()
+
+
+    def stop(self, stop_mode = StopMode.HARDSTOP):
+        """stops the current movement and clears the queue
+
+        Args:
+            stop_mode (enum): whether the movement should be stopped immediately or softly
+                (Default value = StopMode.HARDSTOP)
+        """
+        self._segments.clear()
+        self._tmc_mc.stop(stop_mode)
+
+
+    def _compute_exit_speed(self, entry_speed:float) -> float:
+        """computes the speed at the end of the next queued movement
+
+        Args:
+            entry_speed (float): speed at the start of the next movement
+
+        Returns:
+            float: exit speed in steps per second
+        """
+        acceleration = self._tmc_mc.acceleration
+        window = [self._segments[j] for j in range(min(self._lookahead, len(self._segments)))]
+
+        distances = []
+        pos = self._tmc_mc.current_pos
+        for target, _, _ in window:
+            distances.append(target - pos)
+            pos = target
+
+        # backward pass: the last movement in the window ends at standstill
+        speed = 0.0
+        for j in range(len(window) - 1, 0, -1):
+            if (distances[j - 1] * distances[j] > 0 and
+                window[j - 1][2].supports_blending and window[j][2].supports_blending):
+                junction_speed = min(window[j - 1][1], window[j][1])
+            else:
+                junction_speed = 0.0
+            speed = min(junction_speed, math.sqrt(speed * speed + 2.0 * acceleration * abs(distances[j])))
+
+        # forward pass: the exit speed must be reachable within the next movement
+        return min(speed, math.sqrt(entry_speed * entry_speed + 2.0 * acceleration * abs(distances[0])))
+
+
+    def run(self) -> StopMode:
+        """runs all queued movements
+        blocks the code until finished or stopped from a different thread!
+        a stop clears the queue
+
+        Returns:
+            stop (enum): how the movement was finished
+        """
+        tmc_mc = self._tmc_mc
+        tmc_mc._stop = StopMode.NO
+        speed = 0.0
+
+        while self._segments:
+            exit_speed = self._compute_exit_speed(speed)
+            target, max_speed, ramp_profile = self._segments.popleft()
+            distance = target - tmc_mc.current_pos
+
+            tmc_mc._target_pos = target
+            planning_start = time.perf_counter_ns()
+            plan = ramp_profile.compute(abs(distance), max_speed, tmc_mc.acceleration, speed, exit_speed)
+            stats = None
+            if tmc_mc.move_stats_enabled:
+                stats = TmcMoveStats(abs(distance), sum(plan.intervals[1:]),
+                                     (time.perf_counter_ns() - planning_start) / 1000)
+            tmc_mc._run_plan(plan, Direction.CW if distance > 0 else Direction.CCW, speed > 0, stats)
+            if stats is not None:
+                stats.stop_mode = tmc_mc._stop
+                tmc_mc._publish_move_stats(stats)
+
+            if tmc_mc._stop != StopMode.NO:
+                self._segments.clear()
+                break
+            speed = exit_speed
+
+        tmc_mc._step_interval = 0
+        tmc_mc._speed = 0.0
+        tmc_mc._movement_phase = MovementPhase.STANDSTILL
+        return tmc_mc._stop
+
+
+    def run_threaded(self) -> Future:
+        """runs all queued movements in the step worker of the motion control
+        does not block the code
+
+        Returns:
+            Future: how the movement was finished (StopMode)
+        """
+        self._future = self._tmc_mc.submit_movement(self.run)
+        return self._future
+
+
+    def wait_for_movement_finished_threaded(self) -> StopMode:
+        """wait for the queued movements to finish, if started threaded
+
+        Returns:
+            enum: how the movement was finished
+        """
+        self._future.result()
+        return self._tmc_mc._stop
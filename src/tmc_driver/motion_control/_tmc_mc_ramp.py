@@ -0,0 +1,306 @@
+#pylint: disable=too-many-locals
+#pylint: disable=too-few-public-methods
+"""
+Ramp planner module
+
+precomputes the complete step interval sequence of a movement,
+so that the step loop only needs to index into a buffer
+"""
+
+import math
+import functools
+from array import array
+from .._tmc_exceptions import TmcMotionControlException
+
+
+MIN_INTERVAL = 1                    # smallest interval; the speed is computed as 1 / interval
+MAX_INTERVAL = 0xFFFFFFFF           # largest interval that fits into array('I')
+
+
+class TmcRampPlan():
+    """precomputed step intervals of one movement
+
+    intervals[i] is the time in µs between step i-1 and step i.
+    The first step is made right away, intervals[0] only reflects the starting speed.
+    """
+
+    __slots__ = ("intervals", "cruise_start", "decel_start")
+
+    def __init__(self, intervals:array, cruise_start:int, decel_start:int):
+        """constructor
+
+        Args:
+            intervals (array): step intervals in µs
+            cruise_start (int): index of the first step at max speed
+            decel_start (int): index of the first decelerating step
+        """
+        self.intervals = intervals
+        self.cruise_start = cruise_start
+        self.decel_start = decel_start
+
+    def __len__(self):
+        """amount of steps of this plan"""
+        return len(self.intervals)
+
+
+@functools.lru_cache(maxsize=64)
+def compute_ramp(distance:int, max_speed:float, acceleration:float,
+                 entry_speed:float = 0.0, exit_speed:float = 0.0) -> TmcRampPlan:
+    """computes the step intervals for a movement of the given distance
+
+    this uses the same equations as TmcMotionControlStepDir.compute_new_speed
+    ("Generate stepper-motor speed profiles in real time" by David Austin),
+    but runs them once for the whole movement.
+    Plans are cached, so repeated movements cost nothing to plan.
+
+    Args:
+        distance (int): amount of steps; must be positive
+        max_speed (float): max speed in steps per second
+        acceleration (float): acceleration in steps per second per second
+        entry_speed (float): speed at the start of the movement in steps per second
+            (Default value = 0.0)
+        exit_speed (float): speed at the end of the movement in steps per second
+            (Default value = 0.0)
+
+    Returns:
+        TmcRampPlan: the planned movement
+    """
+    c0 = 0.676 * math.sqrt(2.0 / acceleration) * 1000000.0 # Equation 15
+    cmin = 1000000.0 / max_speed if max_speed else 0.0
+    steps_at_exit = (exit_speed * exit_speed) / (2.0 * acceleration) # Equation 16
+
+    intervals = array("I")
+    cruise_start = distance
+    decel_start = distance
+    n = 0
+    cn = 0.0
+    speed = 0.0
+    if entry_speed > 0:
+        speed = entry_speed
+        cn = 1000000.0 / entry_speed
+        n = (entry_speed * entry_speed) / (2.0 * acceleration) # Equation 16
+
+    for distance_to in range(distance, 0, -1):
+        steps_to_stop = (speed * speed) / (2.0 * acceleration) - steps_at_exit # Equation 16
+        if n > 0:
+            if steps_to_stop >= distance_to:
+                n = -(steps_to_stop + steps_at_exit) # Start deceleration
+                decel_start = min(decel_start, len(intervals))
+        elif n < 0:
+            if steps_to_stop < distance_to:
+                n = -n # Start acceleration
+
+        if n == 0:
+            cn = c0
+        else:
+            cn = cn - ((2.0 * cn) / ((4.0 * n) + 1)) # Equation 13
+            cn = max(cn, cmin)
+            if cn == cmin:
+                cruise_start = min(cruise_start, len(intervals))
+        n += 1
+        speed = 1000000.0 / cn
+        intervals.append(max(min(round(cn), MAX_INTERVAL), MIN_INTERVAL))
+
+    return TmcRampPlan(intervals, cruise_start, decel_start)
+
+
+def compute_stop_ramp(interval:float, acceleration:float, max_steps:int) -> array:
+    """computes the step intervals for decelerating from the given step interval
+    to standstill. Used for softstops.
+
+    Args:
+        interval (float): current step interval in µs
+        acceleration (float): acceleration in steps per second per second
+        max_steps (int): max amount of steps (remaining distance)
+
+    Returns:
+        array: step intervals in µs
+    """
+    intervals = array("I")
+    cn = float(interval)
+    n = None
+    while len(intervals) < max_steps:
+        speed = 1000000.0 / cn
+        steps_to_stop = (speed * speed) / (2.0 * acceleration) # Equation 16
+        if steps_to_stop <= 1:
+            break
+        if n is None:
+            n = -steps_to_stop # Start deceleration
+        cn = cn - ((2.0 * cn) / ((4.0 * n) + 1)) # Equation 13
+        n += 1
+        intervals.append(max(min(round(cn), MAX_INTERVAL), MIN_INTERVAL))
+    return intervals
+
+
+def _scurve_accel_time(peak_speed:float, acceleration:float, jerk:float):
+    """returns the jerk time and the constant acceleration time
+    of a jerk limited acceleration from 0 to peak_speed
+
+    Args:
+        peak_speed (float): speed at the end of the acceleration
+        acceleration (float): max acceleration
+        jerk (float): jerk
+
+    Returns:
+        tuple: jerk time, constant acceleration time in seconds
+    """
+    if peak_speed >= acceleration * acceleration / jerk:
+        t_jerk = acceleration / jerk
+        return t_jerk, peak_speed / acceleration - t_jerk
+    return math.sqrt(peak_speed / jerk), 0.0
+
+
+@functools.lru_cache(maxsize=64)
+def compute_scurve_ramp(distance:int, max_speed:float, acceleration:float, jerk:float) -> TmcRampPlan:
+    """computes the step intervals for a jerk limited movement (7 segment S-curve)
+    of the given distance, starting and ending at standstill
+
+    Args:
+        distance (int): amount of steps; must be positive
+        max_speed (float): max speed in steps per second
+        acceleration (float): max acceleration in steps per second per second
+        jerk (float): jerk in steps per second per second per second
+
+    Returns:
+        TmcRampPlan: the planned movement; empty for a distance of 0
+    """
+    if max_speed <= 0 or acceleration <= 0 or jerk <= 0:
+        raise TmcMotionControlException(f"invalid S-curve ramp: max_speed {max_speed}, "
+                                        f"acceleration {acceleration}, jerk {jerk}")
+    if distance <= 0:
+        return TmcRampPlan(array("I"), 0, 0)
+
+    def accel_distance(speed):
+        t_jerk, t_const = _scurve_accel_time(speed, acceleration, jerk)
+        return speed * (2 * t_jerk + t_const) / 2
+
+    # peak speed, limited by the distance
+    peak_speed = max_speed
+    if 2 * accel_distance(peak_speed) > distance:
+        low, high = 0.0, max_speed
+        for _ in range(60):
+            peak_speed = (low + high) / 2
+            if 2 * accel_distance(peak_speed) > distance:
+                high = peak_speed
+            else:
+                low = peak_speed
+        peak_speed = low
+
+    t_jerk, t_const = _scurve_accel_time(peak_speed, acceleration, jerk)
+    accel_peak = jerk * t_jerk
+    t_accel = 2 * t_jerk + t_const
+    d_accel = peak_speed * t_accel / 2
+    # position and speed at the end of segment 1 and 2
+    s1 = jerk * t_jerk ** 3 / 6
+    v1 = jerk * t_jerk ** 2 / 2
+    s2 = s1 + v1 * t_const + accel_peak * t_const ** 2 / 2
+    v2 = v1 + accel_peak * t_const
+
+    def accel_time(pos):
+        """time to reach the given position during the acceleration"""
+        if pos <= 0:
+            return 0.0
+        if pos <= s1:
+            return (6 * pos / jerk) ** (1 / 3)
+        if pos <= s2:
+            return t_jerk + (-v1 + math.sqrt(v1 * v1 + 2 * accel_peak * (pos - s1))) / accel_peak
+        # segment 3 is cubic, solve with newton
+        tau = min((pos - s2) / v2, t_jerk)
+        for _ in range(20):
+            err = s2 + v2 * tau + accel_peak * tau ** 2 / 2 - jerk * tau ** 3 / 6 - pos
+            delta = err / (v2 + accel_peak * tau - jerk * tau ** 2 / 2)
+            tau = min(max(tau - delta, 0.0), t_jerk)
+            if abs(delta) < 1e-12:
+                break
+        return t_jerk + t_const + tau
+
+    t_total = 2 * t_accel + (distance - 2 * d_accel) / peak_speed
+    cruise_start = distance
+    decel_start = distance
+    intervals = array("I")
+    last_time = 0.0
+    for step in range(1, distance + 1):
+        if step <= d_accel:
+            step_time = accel_time(step)
+        elif step <= distance - d_accel:
+            step_time = t_accel + (step - d_accel) / peak_speed
+            if peak_speed >= max_speed:
+                cruise_start = min(cruise_start, step - 1)
+        else:
+            step_time = t_total - accel_time(distance - step)
+            decel_start = min(decel_start, step - 1)
+        intervals.append(max(min(round((step_time - last_time) * 1000000.0), MAX_INTERVAL), MIN_INTERVAL))
+        last_time = step_time
+
+    return TmcRampPlan(intervals, cruise_start, decel_start)
+
+
+class TmcRampProfile():
+    """ramp profile base class
+
+    a ramp profile computes the step intervals of one movement
+    """
+
+    supports_blending:bool = False      # whether movements can start and end at a speed > 0
+
+
+    def compute(self, distance:int, max_speed:float, acceleration:float,
+                entry_speed:float = 0.0, exit_speed:float = 0.0) -> TmcRampPlan:
+        """computes the step intervals for a movement of the given distance
+
+        Args:
+            distance (int): amount of steps; must be positive
+            max_speed (float): max speed in steps per second
+            acceleration (float): acceleration in steps per second per second
+            entry_speed (float): speed at the start of the movement (Default value = 0.0)
+            exit_speed (float): speed at the end of the movement (Default value = 0.0)
+
+        Returns:
+            TmcRampPlan: the planned movement
+        """
+        raise NotImplementedError
+
+
+class TmcRampTrapezoid(TmcRampProfile):
+    """constant acceleration ramp profile (David Austin)"""
+
+    supports_blending = True
+
+
+    def compute(self, distance:int, max_speed:float, acceleration:float,
+                entry_speed:float = 0.0, exit_speed:float = 0.0) -> TmcRampPlan:
+        """computes the step intervals for a movement of the given distance"""
+        return compute_ramp(distance, max_speed, acceleration, entry_speed, exit_speed)
+
+
+class TmcRampSCurve(TmcRampProfile):
+    """jerk limited 7 segment S-curve ramp profile
+
+    this allows higher accelerations without resonance induced step loss.
+    Movements always start and end at standstill.
+    """
+
+    _jerk:float = 0.0
+
+
+    @property
+    def jerk(self):
+        """_jerk property"""
+        return self._jerk
+
+
+    def __init__(self, jerk:float):
+        """constructor
+
+        Args:
+            jerk (float): jerk in steps per second per second per second; must not be 0
+        """
+        if jerk == 0:
+            raise TmcMotionControlException("the jerk of a S-curve ramp must not be 0")
+        self._jerk = abs(jerk)
+
+
+    def compute(self, distance:int, max_speed:float, acceleration:float,
+                entry_speed:float = 0.0, exit_speed:float = 0.0) -> TmcRampPlan:
+        """computes the step intervals for a movement of the given distance"""
+        return compute_scurve_ramp(distance, max_speed, acceleration, self._jerk)
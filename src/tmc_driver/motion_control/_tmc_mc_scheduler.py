@@ -0,0 +1,79 @@
+"""
+Step scheduler module
+
+waits for absolute step deadlines on the monotonic clock.
+It sleeps coarsely until shortly before a deadline and only
+busy-waits the last few tens of µs
+"""
+
+import time
+
+
+class TmcStepScheduler():
+    """absolute deadline step scheduler
+
+    the deadlines are accumulated from the step intervals,
+    so lateness of one step does not add up over the movement
+    """
+
+    spin_ns:int = 50000                 # busy-wait this long before a deadline
+    max_sleep_ns:int = 10000000         # max time of one coarse sleep, to react on stop requests
+
+    _deadline:int = 0                   # the current deadline in ns (perf_counter_ns)
+
+
+    @property
+    def deadline(self) -> int:
+        """_deadline property"""
+        return self._deadline
+
+
+    def start(self) -> int:
+        """starts the schedule at the current time
+
+        Returns:
+            int: the first deadline in ns
+        """
+        self._deadline = time.perf_counter_ns()
+        return self._deadline
+
+
+    def advance(self, interval:int) -> int:
+        """moves the deadline one step interval further
+
+        if the schedule is late by more than one interval,
+        it is restarted at the current time instead of making a burst of steps
+
+        Args:
+            interval (int): step interval in µs
+
+        Returns:
+            int: the new deadline in ns
+        """
+        interval_ns = int(interval * 1000)
+        deadline = self._deadline + interval_ns
+        now = time.perf_counter_ns()
+        if now - deadline > interval_ns:
+            deadline = now
+        self._deadline = deadline
+        return deadline
+
+
+    def wait(self) -> bool:
+        """waits for the current deadline
+
+        returns early after one coarse sleep of max_sleep_ns,
+        so that the caller can check for stop requests
+
+        Returns:
+            bool: True if the deadline is reached
+        """
+        remaining = self._deadline - time.perf_counter_ns()
+        if remaining > self.spin_ns:
+            time.sleep(min(remaining - self.spin_ns, self.max_sleep_ns) / 1000000000)
+            remaining = self._deadline - time.perf_counter_ns()
+            if remaining > self.spin_ns:
+                return False
+        while remaining > 0:
+            remaining = self._deadline - time.perf_counter_ns()
+        return True
@@ -0,0 +1,185 @@
+#pylint: disable=too-many-arguments
+#pylint: disable=too-many-positional-arguments
+"""
+Shared memory channel module
+
+command ring buffer and status block in a shared memory buffer
+between the application and the step process.
+Both sides only write their own sequence counters, so no lock is needed:
+the command payload is written before the write counter is increased and
+the status is guarded by a sequence counter, which is odd while it is written.
+"""
+
+from typing import Optional
+
+
+class TmcShmChannel():
+    """TmcShmChannel
+
+    single producer, single consumer channel on a buffer of SIZE bytes.
+    The application pushes commands and reads the status,
+    the step process pops commands and publishes the status.
+
+    Layout (8 byte words):
+        0: status sequence counter, 1: current_pos, 2: target_pos, 3: movement_phase,
+        4: stop mode, 5: speed (float), 6: sequence number of the last finished movement,
+        7: ready flag, 8: command write counter, 9: command read counter,
+        HEADER_WORDS...: SLOTS command slots of SLOT_WORDS words:
+        command, steps, movement_abs_rel (int), max_speed, acceleration, jerk (float)
+    """
+
+    SLOTS = 64
+    SLOT_WORDS = 6
+    HEADER_WORDS = 16
+    SIZE = (HEADER_WORDS + SLOTS * SLOT_WORDS) * 8
+
+    _STATUS_SEQ = 0
+    _CURRENT_POS = 1
+    _TARGET_POS = 2
+    _PHASE = 3
+    _STOP = 4
+    _SPEED = 5
+    _DONE = 6
+    _READY = 7
+    _WRITE = 8
+    _READ = 9
+
+    _q:memoryview = None                # buffer as int64
+    _d:memoryview = None                # buffer as float64
+
+
+    @property
+    def done(self):
+        """sequence number of the last finished movement"""
+        return self._q[self._DONE]
+
+    @done.setter
+    def done(self, seq:int):
+        """sets the sequence number of the last finished movement"""
+        self._q[self._DONE] = seq
+
+    @property
+    def ready(self):
+        """whether the step process is ready"""
+        return self._q[self._READY] == 1
+
+    @ready.setter
+    def ready(self, ready:bool):
+        """sets the ready flag"""
+        self._q[self._READY] = int(ready)
+
+    @property
+    def pending(self):
+        """amount of commands, which were not popped yet"""
+        return self._q[self._WRITE] - self._q[self._READ]
+
+
+    def __init__(self, buf):
+        """constructor
+
+        Args:
+            buf (memoryview): buffer of at least SIZE bytes, e.g. SharedMemory.buf
+        """
+        self._q = memoryview(buf)[:self.SIZE].cast("q")
+        self._d = memoryview(buf)[:self.SIZE].cast("d")
+
+
+    def release(self):
+        """releases the views on the buffer, so that the shared memory can be closed"""
+        self._q.release()
+        self._d.release()
+
+
+    def push(self, command:int, steps:int = 0, movement_abs_rel:int = 0, max_speed:float = 0.0,
+             acceleration:float = 0.0, jerk:float = 0.0) -> Optional[int]:
+        """appends a command; only called by the application
+
+        Args:
+            command (int): command
+            steps (int): steps or position (Default value = 0)
+            movement_abs_rel (int): MovementAbsRel value (Default value = 0)
+            max_speed (float): max speed in steps/s (Default value = 0.0)
+            acceleration (float): acceleration in steps/s² (Default value = 0.0)
+            jerk (float): jerk in steps/s³; 0 for the trapezoid ramp (Default value = 0.0)
+
+        Returns:
+            int: sequence number of the command; None, if the ring buffer is full
+        """
+        q = self._q
+        write = q[self._WRITE]
+        if write - q[self._READ] >= self.SLOTS:
+            return None
+        base = self.HEADER_WORDS + (write % self.SLOTS) * self.SLOT_WORDS
+        q[base] = command
+        q[base + 1] = steps
+        q[base + 2] = movement_abs_rel
+        self._d[base + 3] = max_speed
+        self._d[base + 4] = acceleration
+        self._d[base + 5] = jerk
+        q[self._WRITE] = write + 1
+        return write + 1
+
+
+    def pop(self) -> Optional[tuple]:
+        """removes the oldest command; only called by the step process
+
+        Returns:
+            tuple: (sequence number, command, steps, movement_abs_rel, max_speed, acceleration, jerk);
+                None, if there is no command
+        """
+        q = self._q
+        read = q[self._READ]
+        if read == q[self._WRITE]:
+            return None
+        base = self.HEADER_WORDS + (read % self.SLOTS) * self.SLOT_WORDS
+        d = self._d
+        command = (read + 1, q[base], q[base + 1], q[base + 2], d[base + 3], d[base + 4], d[base + 5])
+        q[self._READ] = read + 1
+        return command
+
+
+    def publish(self, current_pos:int, target_pos:int, speed:float, movement_phase:int, stop_mode:int):
+        """writes the status; only called by the step process
+
+        Args:
+            current_pos (int): current position in steps
+            target_pos (int): target position in steps
+            speed (float): current speed in steps/s
+            movement_phase (int): MovementPhase value
+            stop_mode (int): StopMode value
+        """
+        q = self._q
+        seq = q[self._STATUS_SEQ]
+        q[self._STATUS_SEQ] = seq + 1
+        q[self._CURRENT_POS] = current_pos
+        q[self._TARGET_POS] = target_pos
+        q[self._PHASE] = movement_phase
+        q[self._STOP] = stop_mode
+        self._d[self._SPEED] = speed
+        q[self._STATUS_SEQ] = seq + 2
+
+
+    def status(self) -> tuple:
+        """reads a consistent status; only called by the application
+
+        Returns:
+            tuple: (current_pos, target_pos, speed, movement_phase, stop_mode)
+        """
+        q = self._q
+        while True:
+            seq = q[self._STATUS_SEQ]
+            if seq & 1:
+                continue
+            status = (q[self._CURRENT_POS], q[self._TARGET_POS], self._d[self._SPEED],
+                      q[self._PHASE], q[self._STOP])
+            if q[self._STATUS_SEQ] == seq:
+                return status
+
+
+    def read_current_pos(self) -> int:
+        """reads the current position; a single word needs no sequence check
+
+        Returns:
+            int: current position in steps
+        """
+        return self._q[self._CURRENT_POS]
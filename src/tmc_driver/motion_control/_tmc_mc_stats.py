@@ -0,0 +1,84 @@
+#pylint: disable=too-many-instance-attributes
+"""
+Move Stats module
+
+timing statistics of one movement, collected by the step loop
+"""
+
+from bisect import bisect_right
+
+
+class TmcMoveStats():
+    """timing statistics of one movement
+
+    the step interval error is the difference between the actual and the planned
+    time between two steps. The lateness of a step is measured against its deadline.
+    """
+
+    ERROR_BINS = (-1000, -100, -10, 10, 100, 1000)  # edges of the step interval error histogram in µs
+
+    __slots__ = ("steps_commanded", "steps_made", "planned_duration_us", "actual_duration_us",
+                 "worst_lateness_us", "error_histogram", "planning_us", "gpio_us", "stop_mode",
+                 "_first_step_ns", "_last_step_ns")
+
+    def __init__(self, steps_commanded:int, planned_duration_us:float, planning_us:float):
+        """constructor
+
+        Args:
+            steps_commanded (int): amount of steps of the movement
+            planned_duration_us (float): planned time from the first to the last step in µs
+            planning_us (float): time to compute the step intervals in µs
+        """
+        self.steps_commanded = steps_commanded
+        self.steps_made = 0
+        self.planned_duration_us = planned_duration_us
+        self.actual_duration_us = 0.0
+        self.worst_lateness_us = 0.0
+        self.error_histogram = [0] * (len(self.ERROR_BINS) + 1)
+        self.planning_us = planning_us
+        self.gpio_us = 0.0
+        self.stop_mode = None
+        self._first_step_ns = 0
+        self._last_step_ns = 0
+
+    def add_step(self, step_ns:int, gpio_ns:int, interval:float, deadline_ns:int):
+        """adds one step
+
+        Args:
+            step_ns (int): time of the step in ns (perf_counter_ns)
+            gpio_ns (int): time spent for the GPIO writes of the step in ns
+            interval (float): planned interval to the previous step in µs
+            deadline_ns (int): deadline of the step in ns (perf_counter_ns)
+        """
+        if self.steps_made == 0:
+            self._first_step_ns = step_ns
+        else:
+            error = (step_ns - self._last_step_ns) / 1000 - interval
+            self.error_histogram[bisect_right(self.ERROR_BINS, error)] += 1
+        self.worst_lateness_us = max(self.worst_lateness_us, (step_ns - deadline_ns) / 1000)
+        self.gpio_us += gpio_ns / 1000
+        self._last_step_ns = step_ns
+        self.steps_made += 1
+        self.actual_duration_us = (step_ns - self._first_step_ns) / 1000
+
+    def as_dict(self) -> dict:
+        """returns the statistics as dict; the histogram is keyed by its bin ranges in µs"""
+        edges = ("-inf",) + self.ERROR_BINS + ("inf",)
+        return {
+            "steps_commanded":      self.steps_commanded,
+            "steps_made":           self.steps_made,
+            "planned_duration_us":  self.planned_duration_us,
+            "actual_duration_us":   self.actual_duration_us,
+            "worst_lateness_us":    self.worst_lateness_us,
+            "error_histogram":      {f"{edges[i]}..{edges[i + 1]}": count
+                                     for i, count in enumerate(self.error_histogram)},
+            "planning_us":          self.planning_us,
+            "gpio_us":              self.gpio_us,
+            "stop_mode":            self.stop_mode.name if self.stop_mode is not None else None,
+        }
+
+    def __repr__(self):
+        """short summary"""
+        return (f"TmcMoveStats(steps {self.steps_made}/{self.steps_commanded}, "
+                f"duration {self.actual_duration_us:.0f}/{self.planned_duration_us:.0f} µs, "
+                f"worst lateness {self.worst_lateness_us:.0f} µs)")
@@ -2,17 +2,23 @@
 #pylint: disable=too-many-arguments
 #pylint: disable=too-many-branches
 #pylint: disable=too-many-positional-arguments
+#pylint: disable=too-many-public-methods
 """
 STEP/DIR Motion Control module
 """
 
 import time
 import math
-import threading
+from concurrent.futures import Future
 from ._tmc_mc import TmcMotionControl, MovementAbsRel, MovementPhase, Direction, StopMode
+from ._tmc_mc_ramp import TmcRampProfile
 from .._tmc_logger import TmcLogger, Loglevel
 from .._tmc_gpio_board import tmc_gpio, Gpio, GpioMode
 from .. import _tmc_math as tmc_math
+from . import _tmc_mc_ramp as tmc_ramp
+from ._tmc_mc_scheduler import TmcStepScheduler
+from ._tmc_mc_stats import TmcMoveStats
+from ._tmc_mc_worker import TmcStepWorker, GcMode
 
 
 class TmcMotionControlStepDir(TmcMotionControl):
@@ -21,12 +27,13 @@ class TmcMotionControlStepDir(TmcMotionControl):
     _pin_step:int = None
     _pin_dir:int = None
 
-    _movement_thread:threading.Thread = None
+    _worker:TmcStepWorker = None        # persistent thread for the threaded movements
+    _scheduler:TmcStepScheduler = None
 
     _sqrt_twoa:float = 1.0              # Precomputed sqrt(2*_acceleration)
     _step_interval:int = 0              # the current interval between two steps
     _min_pulse_width:int = 1            # minimum allowed pulse with in microseconds
-    _last_step_time:int = 0             # The last step time in microseconds
+    _last_step_time:int = 0             # The last step deadline in microseconds (perf_counter)
     _n:int = 0                          # step counter
     _c0:int = 0                         # Initial step size in microseconds
     _cn:int = 0                         # Last step size in microseconds
@@ -116,11 +123,17 @@ class TmcMotionControlStepDir(TmcMotionControl):
         """_pin_dir property"""
         return self._pin_dir
 
+    @property
+    def step_worker(self):
+        """_worker property"""
+        return self._worker
+
 
     def __init__(self, pin_step:int, pin_dir:int):
         """constructor"""
         self._pin_step = pin_step
         self._pin_dir = pin_dir
+        self._scheduler = TmcStepScheduler()
 
 
     def init(self, tmc_logger:TmcLogger):
@@ -135,6 +148,7 @@ class TmcMotionControlStepDir(TmcMotionControl):
 
     def __del__(self):
         """destructor"""
+        self.stop_step_worker()
         if self._pin_step is not None:
             tmc_gpio.gpio_cleanup(self._pin_step)
         if self._pin_dir is not None:
@@ -144,15 +158,19 @@ class TmcMotionControlStepDir(TmcMotionControl):
     def make_a_step(self):
         """method that makes on step
 
-        for the TMC2209 there needs to be a signal duration of minimum 100 ns
+        for the TMC2209 there needs to be a signal duration of minimum 100 ns.
+        The pulse width is busy-waited, because time.sleep takes far longer than that.
+        The low time is given by the step interval.
         """
         tmc_gpio.gpio_output(self._pin_step, Gpio.HIGH)
-        time.sleep(1/1000/1000)
+        pulse_end = time.perf_counter_ns() + self._min_pulse_width * 1000
+        while time.perf_counter_ns() < pulse_end:
+            pass
         tmc_gpio.gpio_output(self._pin_step, Gpio.LOW)
-        time.sleep(1/1000/1000)
 
         # self._tmc_logger.log("one step", Loglevel.MOVEMENT)
-        self._tmc_logger.log(f"one step | cur: {self.current_pos} | tar: {self._target_pos}", Loglevel.MOVEMENT)
+        if self._tmc_logger.movement_enabled:
+            self._tmc_logger.log(f"one step | cur: {self.current_pos} | tar: {self._target_pos}", Loglevel.MOVEMENT)
 
 
     def set_direction(self, direction:Direction):
@@ -165,7 +183,65 @@ class TmcMotionControlStepDir(TmcMotionControl):
         tmc_gpio.gpio_output(self._pin_dir, direction.value)
 
 
-    def run_to_position_steps(self, steps, movement_abs_rel:MovementAbsRel = None) -> StopMode:
+    def stop(self, stop_mode = StopMode.HARDSTOP):
+        """stop the current movement
+        the threaded movements, which have not started yet, are cancelled
+
+        Args:
+            stop_mode (enum): whether the movement should be stopped immediately or softly
+                (Default value = StopMode.HARDSTOP)
+        """
+        super().stop(stop_mode)
+        if self._worker is not None:
+            self._worker.cancel_pending()
+
+
+    def start_step_worker(self, cpus:set = None, priority:int = None,
+                          gc_mode:GcMode = GcMode.FREEZE) -> TmcStepWorker:
+        """starts the persistent thread, which runs the threaded movements.
+        Without calling this, a worker without CPU pinning and SCHED_FIFO
+        is started with the first threaded movement.
+
+        Args:
+            cpus (set): CPUs the thread is pinned to, ideally isolated ones
+                (Default value = None, no pinning)
+            priority (int): SCHED_FIFO priority 1-99; needs CAP_SYS_NICE
+                (Default value = None, normal scheduling)
+            gc_mode (GcMode): garbage collector handling during a movement (Default value = GcMode.FREEZE)
+
+        Returns:
+            TmcStepWorker: the worker
+        """
+        self.stop_step_worker()
+        self._worker = TmcStepWorker(cpus, priority, gc_mode, self._tmc_logger)
+        self._worker.start()
+        return self._worker
+
+
+    def stop_step_worker(self):
+        """ends the persistent thread after the current movement"""
+        if self._worker is not None:
+            self._worker.stop()
+            self._worker = None
+
+
+    def submit_movement(self, func, *args) -> Future:
+        """runs a movement function of this motion control in the step worker
+
+        Args:
+            func (func): function, which runs the movement
+            *args: arguments of the function
+
+        Returns:
+            Future: result of the function
+        """
+        if self._worker is None:
+            self.start_step_worker()
+        return self._worker.submit(func, *args)
+
+
+    def run_to_position_steps(self, steps, movement_abs_rel:MovementAbsRel = None,
+                              ramp_profile:TmcRampProfile = None) -> StopMode:
         """runs the motor to the given position.
         with acceleration and deceleration
         blocks the code until finished or stopped from a different thread!
@@ -176,12 +252,16 @@ class TmcMotionControlStepDir(TmcMotionControl):
             steps (int): amount of steps; can be negative
             movement_abs_rel (enum): whether the movement should be absolut or relative
                 (Default value = None)
+            ramp_profile (TmcRampProfile): ramp profile for this movement
+                (Default value = None, uses ramp_profile)
 
         Returns:
             stop (enum): how the movement was finished
         """
         if movement_abs_rel is None:
             movement_abs_rel = self._movement_abs_rel
+        if ramp_profile is None:
+            ramp_profile = self._ramp_profile
 
         if movement_abs_rel == MovementAbsRel.RELATIVE:
             self._target_pos = self._current_pos + steps
@@ -195,15 +275,87 @@ class TmcMotionControlStepDir(TmcMotionControl):
         self._step_interval = 0
         self._speed = 0.0
         self._n = 0
-        self.compute_new_speed()
-        while self.run(): #returns false, when target position is reached
-            if self._stop == StopMode.HARDSTOP:
-                break
 
+        distance = self._target_pos - self._current_pos
+        if distance != 0 and self._move_stats_enabled:
+            planning_start = time.perf_counter_ns()
+            plan = ramp_profile.compute(abs(distance), self._max_speed, self._acceleration)
+            stats = TmcMoveStats(abs(distance), sum(plan.intervals[1:]),
+                                 (time.perf_counter_ns() - planning_start) / 1000)
+            self._run_plan(plan, Direction.CW if distance > 0 else Direction.CCW, stats=stats)
+            stats.stop_mode = self._stop
+            self._publish_move_stats(stats)
+        elif distance != 0:
+            plan = ramp_profile.compute(abs(distance), self._max_speed, self._acceleration)
+            self._run_plan(plan, Direction.CW if distance > 0 else Direction.CCW)
+
+        self._step_interval = 0
+        self._speed = 0.0
         self._movement_phase = MovementPhase.STANDSTILL
         return self._stop
 
 
+    def _run_plan(self, plan:tmc_ramp.TmcRampPlan, direction:Direction, continue_schedule:bool = False,
+                  stats:TmcMoveStats = None):
+        """makes the steps of a precomputed movement
+
+        a softstop replaces the remaining steps with a deceleration ramp.
+        Changes of max_speed or acceleration only take effect on the next movement.
+
+        Args:
+            plan (TmcRampPlan): precomputed step intervals
+            direction (Direction): movement direction
+            continue_schedule (bool): whether the first step should be timed
+                relative to the last step of the previous plan (Default value = False)
+            stats (TmcMoveStats): statistics, to which every step is added
+                (Default value = None, no statistics)
+        """
+        tmc_gpio.gpio_output(self._pin_step, Gpio.LOW)
+        self.set_direction(direction)
+        pos_step = 1 if direction == Direction.CW else -1
+        self._movement_phase = MovementPhase.ACCELERATING
+
+        scheduler = self._scheduler
+        if not continue_schedule:
+            scheduler.start()
+        intervals = plan.intervals
+        cruise_start = plan.cruise_start
+        decel_start = plan.decel_start
+        i = 0
+        while i < len(intervals):
+            interval = intervals[i]
+            if i == cruise_start:
+                self._movement_phase = MovementPhase.MAXSPEED
+            if i == decel_start:
+                self._movement_phase = MovementPhase.DECELERATING
+            self._step_interval = interval
+            self._speed = pos_step * 1000000.0 / interval
+
+            if i > 0 or continue_schedule or intervals is not plan.intervals:
+                scheduler.advance(interval)
+                while not scheduler.wait() and self._stop != StopMode.HARDSTOP:
+                    pass
+
+            if self._stop == StopMode.HARDSTOP:
+                return
+
+            self._current_pos += pos_step
+            if stats is None:
+                self.make_a_step()
+            else:
+                step_time = time.perf_counter_ns()
+                self.make_a_step()
+                stats.add_step(step_time, time.perf_counter_ns() - step_time, interval, scheduler.deadline)
+            self._last_step_time = scheduler.deadline // 1000
+            i += 1
+
+            if self._stop == StopMode.SOFTSTOP and intervals is plan.intervals:
+                intervals = tmc_ramp.compute_stop_ramp(interval, self._acceleration, len(intervals) - i)
+                cruise_start = -1
+                decel_start = 0
+                i = 0
+
+
     def run_to_position_revolutions(self, revolutions, movement_abs_rel:MovementAbsRel = None) -> StopMode:
         """runs the motor to the given position.
         with acceleration and deceleration
@@ -220,24 +372,24 @@ class TmcMotionControlStepDir(TmcMotionControl):
                                             movement_abs_rel)
 
 
-    def run_to_position_steps_threaded(self, steps, movement_abs_rel:MovementAbsRel = None):
+    def run_to_position_steps_threaded(self, steps, movement_abs_rel:MovementAbsRel = None,
+                                       ramp_profile:TmcRampProfile = None) -> Future:
         """runs the motor to the given position.
         with acceleration and deceleration
         does not block the code
-        returns true when the movement if finished normally and false,
-        when the movement was stopped
+        the movement is queued in the step worker and starts after the previous threaded movements
 
         Args:
             steps (int): amount of steps; can be negative
             movement_abs_rel (enum): whether the movement should be absolut or relative
                 (Default value = None)
+            ramp_profile (TmcRampProfile): ramp profile for this movement
+                (Default value = None, uses ramp_profile)
 
         Returns:
-            stop (enum): how the movement was finished
+            Future: how the movement was finished (StopMode)
         """
-        self._movement_thread = threading.Thread(target=self.run_to_position_steps,
-                                                    args=(steps, movement_abs_rel))
-        self._movement_thread.start()
+        return self.submit_movement(self.run_to_position_steps, steps, movement_abs_rel, ramp_profile)
 
 
     def run_to_position_revolutions_threaded(self, revolutions, movement_abs_rel:MovementAbsRel = None):
@@ -251,7 +403,7 @@ class TmcMotionControlStepDir(TmcMotionControl):
                 (Default value = None)
 
         Returns:
-            stop (enum): how the movement was finished
+            Future: how the movement was finished (StopMode)
         """
         return self.run_to_position_steps_threaded(round(revolutions * self._steps_per_rev),
                                                     movement_abs_rel)
@@ -266,7 +418,8 @@ class TmcMotionControlStepDir(TmcMotionControl):
         Returns:
             enum: how the movement was finished
         """
-        self._movement_thread.join()
+        if self._worker is not None:
+            self._worker.wait()
         return self._stop
 
 
@@ -366,11 +519,12 @@ class TmcMotionControlStepDir(TmcMotionControl):
         if not self._step_interval:
             return False
 
-        curtime = time.time_ns()/1000
+        curtime = time.perf_counter_ns()/1000
 
         if curtime - self._last_step_time >= self._step_interval:
 
-            self._tmc_logger.log(f"dir: {self._direction}", Loglevel.MOVEMENT)
+            if self._tmc_logger.movement_enabled:
+                self._tmc_logger.log(f"dir: {self._direction}", Loglevel.MOVEMENT)
 
             if self._direction == Direction.CW: # Clockwise
                 self._current_pos += 1
@@ -378,6 +532,10 @@ class TmcMotionControlStepDir(TmcMotionControl):
                 self._current_pos -= 1
             self.make_a_step()
 
-            self._last_step_time = curtime # Caution: does not account for costs in step()
+            # keep the absolute deadline, unless the step is late by more than one interval
+            if curtime - self._last_step_time < 2 * self._step_interval:
+                self._last_step_time += self._step_interval
+            else:
+                self._last_step_time = curtime
             return True
         return False
@@ -0,0 +1,390 @@
+#pylint: disable=too-many-instance-attributes
+#pylint: disable=too-many-arguments
+#pylint: disable=too-many-positional-arguments
+#pylint: disable=too-many-locals
+"""
+STEP/DIR Motion Control in a separate process module
+
+the step loop runs in its own process, so that other Python work of the
+application cannot stall it through the GIL. Commands and status are
+exchanged through a TmcShmChannel in shared memory.
+"""
+
+import time
+import threading
+import multiprocessing
+from enum import Enum
+from multiprocessing import shared_memory
+from ._tmc_mc import TmcMotionControl, MovementAbsRel, MovementPhase, StopMode
+from ._tmc_mc_step_dir import TmcMotionControlStepDir
+from ._tmc_mc_ramp import TmcRampProfile, TmcRampTrapezoid, TmcRampSCurve
+from ._tmc_mc_worker import GcMode
+from ._tmc_mc_shm_channel import TmcShmChannel
+from .._tmc_logger import TmcLogger, Loglevel
+from .._tmc_exceptions import TmcMotionControlException
+
+
+class StepCommand(Enum):
+    """commands of the step process"""
+    MOVE = 1
+    STOP = 2
+    SET_POS = 3
+    EXIT = 4
+
+
+
+class _TmcMotionControlStepDirShared(TmcMotionControlStepDir):
+    """STEP/DIR motion control of the step process, which publishes its status with every step"""
+
+    _channel:TmcShmChannel = None
+
+
+    def __init__(self, pin_step:int, pin_dir:int, channel:TmcShmChannel):
+        """constructor"""
+        super().__init__(pin_step, pin_dir)
+        self._channel = channel
+
+
+    def make_a_step(self):
+        """makes one step and publishes the new position"""
+        super().make_a_step()
+        self.publish()
+
+
+    def publish(self):
+        """writes the status into the channel"""
+        self._channel.publish(self._current_pos, self._target_pos, self._speed,
+                              self._movement_phase.value, self._stop.value)
+
+
+    def move(self, steps:int, movement_abs_rel:int, max_speed:float, acceleration:float,
+             jerk:float) -> StopMode:
+        """runs one movement with the parameters of a MOVE command"""
+        self.max_speed = max_speed
+        self.acceleration = acceleration
+        ramp_profile = TmcRampSCurve(jerk) if jerk else TmcRampTrapezoid()
+        stop_mode = self.run_to_position_steps(steps, MovementAbsRel(movement_abs_rel), ramp_profile)
+        self.publish()
+        return stop_mode
+
+
+    def set_position(self, current_pos:int):
+        """sets the current position with a SET_POS command"""
+        self._current_pos = current_pos
+        self._target_pos = current_pos
+        self.publish()
+
+
+
+def _step_process_main(shm:shared_memory.SharedMemory, pin_step:int, pin_dir:int, loglevel:Loglevel,
+                       cpus:set, priority:int, gc_mode:GcMode, poll_interval:float):
+    """entry point of the step process
+
+    the commands are read in the main thread, the movements run in the step worker,
+    so that a STOP command takes effect during a movement
+    """
+    channel = TmcShmChannel(shm.buf)
+    tmc_mc = _TmcMotionControlStepDirShared(pin_step, pin_dir, channel)
+    tmc_mc.init(TmcLogger(loglevel, "TmcStepProcess"))
+    tmc_mc.start_step_worker(cpus, priority, gc_mode)
+
+    done_lock = threading.Lock()
+    def finished(seq:int):
+        def callback(future):
+            if not future.cancelled():
+                with done_lock:
+                    channel.done = max(channel.done, seq)
+        return callback
+
+    tmc_mc.publish()
+    channel.ready = True
+    while True:
+        command = channel.pop()
+        if command is None:
+            time.sleep(poll_interval)
+            continue
+        seq, cmd, steps, movement_abs_rel, max_speed, acceleration, jerk = command
+        if cmd == StepCommand.EXIT.value:
+            break
+        if cmd == StepCommand.STOP.value:
+            tmc_mc.stop(StopMode(steps))
+            # the cancelled movements count as finished, when the stopped movement has ended
+            future = tmc_mc.submit_movement(tmc_mc.publish)
+            future.add_done_callback(finished(seq))
+            continue
+        if cmd == StepCommand.MOVE.value:
+            future = tmc_mc.submit_movement(tmc_mc.move, steps, movement_abs_rel, max_speed, acceleration, jerk)
+        else:
+            future = tmc_mc.submit_movement(tmc_mc.set_position, steps)
+        future.add_done_callback(finished(seq))
+
+    tmc_mc.stop()
+    tmc_mc.stop_step_worker()
+    channel.ready = False
+    # the mapping is not closed here; with fork, the views of the application are inherited
+    # and would make close fail. It is released with the process.
+    channel.release()
+
+
+
+class TmcMotionControlStepDirProcess(TmcMotionControl):
+    """STEP/DIR Motion Control class, which makes the steps in a separate process
+
+    the application only pushes commands into the shared memory and reads the status from it,
+    so current_pos, speed and movement_phase are available without a round trip to the process.
+    The movement parameters (max_speed, acceleration, ramp_profile) are sent with every movement.
+    Homing and the legacy run/run_speed loop are not available in this mode.
+    """
+
+    STARTUP_TIMEOUT = 10.0              # max time in seconds to start the step process
+
+    _pin_step:int = None
+    _pin_dir:int = None
+
+    _shm:shared_memory.SharedMemory = None
+    _channel:TmcShmChannel = None
+    _push_lock:threading.Lock = None    # the channel has a single producer; serialises the threads
+    _process:multiprocessing.Process = None
+    _last_seq:int = 0                   # sequence number of the last submitted movement
+    _poll_interval:float = 0.0005       # time in seconds between two checks of the channel
+
+
+    @property
+    def current_pos(self):
+        """current position in steps, as published by the step process"""
+        return self._channel.read_current_pos()
+
+    @current_pos.setter
+    def current_pos(self, current_pos:int):
+        """sets the current position after the queued movements"""
+        self._wait_for(self._push(StepCommand.SET_POS, current_pos))
+
+    @property
+    def target_pos(self):
+        """target position in steps of the current movement"""
+        return self._channel.status()[1]
+
+    @property
+    def speed(self):
+        """current speed in steps per second"""
+        return self._channel.status()[2]
+
+    @property
+    def speed_fullstep(self):
+        """current speed in fullsteps per second"""
+        return self.speed / self.mres
+
+    @property
+    def movement_phase(self):
+        """current movement phase"""
+        return MovementPhase(self._channel.status()[3])
+
+    @property
+    def pin_step(self):
+        """_pin_step property"""
+        return self._pin_step
+
+    @property
+    def pin_dir(self):
+        """_pin_dir property"""
+        return self._pin_dir
+
+    @property
+    def process(self):
+        """_process property"""
+        return self._process
+
+
+    def __init__(self, pin_step:int, pin_dir:int, cpus:set = None, priority:int = None,
+                 gc_mode:GcMode = GcMode.FREEZE, loglevel:Loglevel = Loglevel.INFO):
+        """constructor; starts the step process
+
+        Args:
+            pin_step (int): STEP pin
+            pin_dir (int): DIR pin
+            cpus (set): CPUs the step thread of the process is pinned to (Default value = None)
+            priority (int): SCHED_FIFO priority of the step thread (Default value = None)
+            gc_mode (GcMode): garbage collector handling during a movement (Default value = GcMode.FREEZE)
+            loglevel (Loglevel): loglevel of the step process (Default value = Loglevel.INFO)
+        """
+        self._pin_step = pin_step
+        self._pin_dir = pin_dir
+        self._shm = shared_memory.SharedMemory(create=True, size=TmcShmChannel.SIZE)
+        self._channel = TmcShmChannel(self._shm.buf)
+        self._push_lock = threading.Lock()
+        self._process = multiprocessing.Process(target=_step_process_main, name="TmcStepProcess",
+                                                args=(self._shm, pin_step, pin_dir, loglevel, cpus,
+                                                      priority, gc_mode, self._poll_interval),
+                                                daemon=True)
+        self._process.start()
+        deadline = time.monotonic() + self.STARTUP_TIMEOUT
+        while not self._channel.ready:
+            if not self._process.is_alive() or time.monotonic() > deadline:
+                self.close()
+                raise TmcMotionControlException("the step process did not start")
+            time.sleep(0.001)
+
+
+    def __del__(self):
+        """destructor"""
+        self.close()
+
+
+    def init(self, tmc_logger:TmcLogger):
+        """init: called by the Tmc class"""
+        super().init(tmc_logger)
+        self._tmc_logger.log(f"STEP Pin: {self._pin_step} | DIR Pin: {self._pin_dir} | "
+                             f"step process: {self._process.pid}", Loglevel.DEBUG)
+
+
+    def close(self):
+        """stops the movement, ends the step process and frees the shared memory"""
+        if self._shm is None:
+            return
+        if self._process is not None and self._process.is_alive():
+            with self._push_lock:
+                self._channel.push(StepCommand.STOP.value, StopMode.HARDSTOP.value)
+                self._channel.push(StepCommand.EXIT.value)
+            self._process.join(self.STARTUP_TIMEOUT)
+            if self._process.is_alive():
+                self._process.terminate()
+                self._process.join()
+        self._channel.release()
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
+
+
+    def make_a_step(self):
+        """single steps are not available, the steps are made by the step process"""
+        raise TmcMotionControlException("single steps are not available with the step process")
+
+
+    def _push(self, command:StepCommand, steps:int = 0, movement_abs_rel:int = 0, max_speed:float = 0.0,
+              acceleration:float = 0.0, jerk:float = 0.0) -> int:
+        """pushes a command and waits, while the ring buffer is full.
+        Can be called from several threads, e.g. stop() during a movement
+
+        Returns:
+            int: sequence number of the command
+        """
+        if self._shm is None:
+            raise TmcMotionControlException("the step process is closed")
+        with self._push_lock:
+            while True:
+                seq = self._channel.push(command.value, steps, movement_abs_rel, max_speed, acceleration, jerk)
+                if seq is not None:
+                    return seq
+                self._check_process()
+                time.sleep(self._poll_interval)
+
+
+    def _check_process(self):
+        """raises an exception, if the step process is not running"""
+        if not self._process.is_alive():
+            raise TmcMotionControlException(f"the step process ended with exit code {self._process.exitcode}")
+
+
+    def _wait_for(self, seq:int):
+        """waits until the movement with the given sequence number is finished"""
+        while self._channel.done < seq:
+            self._check_process()
+            time.sleep(self._poll_interval)
+
+
+    def stop(self, stop_mode = StopMode.HARDSTOP):
+        """stop the current movement and cancels the queued movements
+
+        Args:
+            stop_mode (enum): whether the movement should be stopped immediately or softly
+                (Default value = StopMode.HARDSTOP)
+        """
+        self._stop = stop_mode
+        self._push(StepCommand.STOP, stop_mode.value)
+
+
+    def run_to_position_steps_threaded(self, steps, movement_abs_rel:MovementAbsRel = None,
+                                       ramp_profile:TmcRampProfile = None) -> int:
+        """queues a movement in the step process
+        does not block the code
+
+        Args:
+            steps (int): amount of steps; can be negative
+            movement_abs_rel (enum): whether the movement should be absolut or relative
+                (Default value = None)
+            ramp_profile (TmcRampProfile): ramp profile for this movement
+                (Default value = None, uses ramp_profile)
+
+        Returns:
+            int: sequence number of the movement
+        """
+        if movement_abs_rel is None:
+            movement_abs_rel = self._movement_abs_rel
+        if ramp_profile is None:
+            ramp_profile = self._ramp_profile
+        if isinstance(ramp_profile, TmcRampSCurve):
+            jerk = ramp_profile.jerk
+        elif isinstance(ramp_profile, TmcRampTrapezoid):
+            jerk = 0.0
+        else:
+            raise TmcMotionControlException(f"{type(ramp_profile).__name__} is not supported in the step process")
+        self._last_seq = self._push(StepCommand.MOVE, int(steps), movement_abs_rel.value,
+                                    self._max_speed, self._acceleration, jerk)
+        return self._last_seq
+
+
+    def run_to_position_steps(self, steps, movement_abs_rel:MovementAbsRel = None,
+                              ramp_profile:TmcRampProfile = None) -> StopMode:
+        """runs the motor to the given position.
+        with acceleration and deceleration
+        blocks the code until finished or stopped from a different thread!
+
+        Args:
+            steps (int): amount of steps; can be negative
+            movement_abs_rel (enum): whether the movement should be absolut or relative
+                (Default value = None)
+            ramp_profile (TmcRampProfile): ramp profile for this movement
+                (Default value = None, uses ramp_profile)
+
+        Returns:
+            stop (enum): how the movement was finished
+        """
+        self.run_to_position_steps_threaded(steps, movement_abs_rel, ramp_profile)
+        return self.wait_for_movement_finished_threaded()
+
+
+    def run_to_position_revolutions(self, revolutions, movement_abs_rel:MovementAbsRel = None) -> StopMode:
+        """runs the motor to the given position.
+        with acceleration and deceleration
+        blocks the code until finished!
+
+        Args:
+            revolutions (int): amount of revs; can be negative
+            movement_abs_rel (enum): whether the movement should be absolut or relative
+
+        Returns:
+            stop (enum): how the movement was finished
+        """
+        return self.run_to_position_steps(round(revolutions * self._steps_per_rev), movement_abs_rel)
+
+
+    def is_movement_finished(self, seq:int = None) -> bool:
+        """returns whether a queued movement is finished
+
+        Args:
+            seq (int): sequence number of the movement (Default value = None, the last movement)
+
+        Returns:
+            bool: whether the movement is finished
+        """
+        return self._channel.done >= (self._last_seq if seq is None else seq)
+
+
+    def wait_for_movement_finished_threaded(self) -> StopMode:
+        """wait for the queued movements to finish
+
+        Returns:
+            enum: how the last movement was finished
+        """
+        self._wait_for(self._last_seq)
+        return StopMode(self._channel.status()[4])
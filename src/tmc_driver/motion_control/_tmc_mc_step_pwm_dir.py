@@ -2,12 +2,19 @@
 #pylint: disable=too-many-arguments
 #pylint: disable=too-many-branches
 #pylint: disable=too-many-positional-arguments
+#pylint: disable=too-many-locals
+#pylint: disable=too-many-statements
 """
 STEP_PWM/DIR Motion Control module
 """
 
-from ._tmc_mc import MovementAbsRel, Direction, StopMode
+import time
+from ._tmc_mc import MovementAbsRel, MovementPhase, Direction, StopMode
 from ._tmc_mc_step_dir import TmcMotionControlStepDir
+from ._tmc_mc_ramp import TmcRampProfile
+from ._tmc_mc_stepped_ramp import compute_stepped_ramp
+from ._tmc_mc_mscnt import TmcMscntEstimator
+from ..com._tmc_com import TmcCom
 from .._tmc_logger import TmcLogger, Loglevel
 from .._tmc_gpio_board import tmc_gpio, GpiozeroWrapper
 
@@ -15,6 +22,21 @@ from .._tmc_gpio_board import tmc_gpio, GpiozeroWrapper
 class TmcMotionControlStepPwmDir(TmcMotionControlStepDir):
     """STEP_PWM/DIR Motion Control class"""
 
+    _tmc_com:TmcCom = None              # for the MSCNT correction of the PWM positioning
+    _pwm_positioning:bool = False       # whether run_to_position_pwm is running
+    _pwm_stop_time:float = None         # perf_counter time of a hardstop during the PWM positioning
+
+
+    @property
+    def tmc_com(self):
+        """_tmc_com property"""
+        return self._tmc_com
+
+    @tmc_com.setter
+    def tmc_com(self, tmc_com):
+        """_tmc_com setter"""
+        self._tmc_com = tmc_com
+
     @property
     def speed(self):
         """_speed property"""
@@ -42,16 +64,24 @@ class TmcMotionControlStepPwmDir(TmcMotionControlStepDir):
                 (Default value = StopMode.HARDSTOP)
         """
         super().stop(stop_mode)
+        if self._pwm_positioning and stop_mode == StopMode.SOFTSTOP:
+            # run_to_position_pwm ramps down
+            return
+        if self._pwm_positioning:
+            self._pwm_stop_time = time.perf_counter()
         tmc_gpio.gpio_pwm_set_duty_cycle(self._pin_step, 0)
 
 
-    def run_to_position_steps(self, steps, movement_abs_rel:MovementAbsRel = None) -> StopMode:
+    def run_to_position_steps(self, steps, movement_abs_rel:MovementAbsRel = None,
+                              ramp_profile:TmcRampProfile = None) -> StopMode:
         """runs the motor to a specific position
 
         Args:
             steps (int): position in µsteps
             movement_abs_rel (enum, optional): whether the movement is absolute or relative
                 (Default value = None)
+            ramp_profile (TmcRampProfile, optional): ramp profile for this movement
+                (Default value = None)
 
         Returns:
             StopMode: the stop mode
@@ -59,7 +89,7 @@ class TmcMotionControlStepPwmDir(TmcMotionControlStepDir):
         if isinstance(tmc_gpio, GpiozeroWrapper):
             tmc_gpio.gpio_pwm_enable(self._pin_step, False)
 
-        return super().run_to_position_steps(steps, movement_abs_rel)
+        return super().run_to_position_steps(steps, movement_abs_rel, ramp_profile)
 
 
     def run_speed_pwm(self, speed:int = None):
@@ -94,3 +124,142 @@ class TmcMotionControlStepPwmDir(TmcMotionControlStepDir):
         if speed is None:
             speed = self.max_speed_fullstep
         self.run_speed_pwm(speed * self.mres)
+
+
+    def run_to_position_pwm(self, steps, movement_abs_rel:MovementAbsRel = None,
+                            update_interval:float = 0.01) -> StopMode:
+        """runs the motor to the given position with the hardware PWM.
+        The PWM frequency is changed every update_interval in a stepped ramp,
+        so that no Python code runs per step.
+        The position is tracked by integrating frequency x time.
+        With a tmc_com, the estimate is corrected with the microstep counter MSCNT,
+        which resolves the position within 4 fullsteps (MSCNT counts up in CW direction).
+        Remaining steps to the target are made with STEP/DIR.
+        blocks the code until finished or stopped from a different thread!
+
+        Args:
+            steps (int): amount of steps; can be negative
+            movement_abs_rel (enum): whether the movement should be absolut or relative
+                (Default value = None)
+            update_interval (float): time in seconds between two frequency changes
+                (Default value = 0.01)
+
+        Returns:
+            stop (enum): how the movement was finished
+        """
+        if movement_abs_rel is None:
+            movement_abs_rel = self._movement_abs_rel
+        target_pos = self._current_pos + steps if movement_abs_rel == MovementAbsRel.RELATIVE else steps
+        distance = target_pos - self._current_pos
+
+        segments = compute_stepped_ramp(abs(distance), self._max_speed, self._acceleration, update_interval)
+        if not segments:
+            # too short for the PWM
+            return self.run_to_position_steps(target_pos, MovementAbsRel.ABSOLUTE)
+
+        self._target_pos = target_pos
+        self._tmc_logger.log(f"cur: {self._current_pos} | tar: {self._target_pos} | PWM", Loglevel.MOVEMENT)
+        mscnt_start = self._read_mscnt()
+        direction = Direction.CW if distance > 0 else Direction.CCW
+        sign = 1 if distance > 0 else -1
+        start_pos = self._current_pos
+
+        self._stop = StopMode.NO
+        self._pwm_stop_time = None
+        self._pwm_positioning = True
+        self.set_direction(direction)
+        if isinstance(tmc_gpio, GpiozeroWrapper):
+            tmc_gpio.gpio_pwm_enable(self._pin_step, True)
+
+        moved = 0.0                     # integrated µsteps
+        frequency = 0.0
+        switch_time = time.perf_counter()
+        deadline = switch_time
+        softstop = False
+        i = 0
+        try:
+            while i < len(segments):
+                new_frequency, duration, phase = segments[i]
+                now = time.perf_counter()
+                moved += frequency * (now - switch_time)
+                switch_time = now
+                frequency = new_frequency
+                self._current_pos = start_pos + sign * int(moved)
+                self._movement_phase = phase
+                self._speed = frequency
+                tmc_gpio.gpio_pwm_set_frequency(self._pin_step, frequency)
+                if i == 0:
+                    tmc_gpio.gpio_pwm_set_duty_cycle(self._pin_step, 50)
+
+                deadline += duration
+                # a segment is cut short by a hardstop or a new softstop;
+                # the segments of the softstop ramp are waited out
+                while self._stop == StopMode.NO or (softstop and self._stop == StopMode.SOFTSTOP):
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    time.sleep(min(remaining, update_interval))
+
+                if self._stop == StopMode.HARDSTOP:
+                    break
+                if self._stop == StopMode.SOFTSTOP and not softstop:
+                    # ramp down from the current frequency
+                    softstop = True
+                    change = self._acceleration * update_interval
+                    segments = segments[:i + 1]
+                    f = frequency - change
+                    while f > 0:
+                        segments.append((f, update_interval, MovementPhase.DECELERATING))
+                        f -= change
+                    deadline = time.perf_counter()
+                i += 1
+        finally:
+            tmc_gpio.gpio_pwm_set_duty_cycle(self._pin_step, 0)
+            end_time = time.perf_counter()
+            if self._pwm_stop_time is not None:
+                end_time = min(end_time, self._pwm_stop_time)
+            moved += frequency * max(end_time - switch_time, 0.0)
+            self._current_pos = start_pos + sign * round(moved)
+            self._pwm_positioning = False
+            self._speed = 0.0
+            self._movement_phase = MovementPhase.STANDSTILL
+
+        if mscnt_start is not None:
+            self._correct_position_mscnt(mscnt_start, start_pos)
+        stop = self._stop
+        if stop != StopMode.NO:
+            self._target_pos = self._current_pos
+        elif self._current_pos != target_pos:
+            self._tmc_logger.log(f"PWM positioning: {target_pos - self._current_pos} steps left", Loglevel.DEBUG)
+            stop = self.run_to_position_steps(target_pos, MovementAbsRel.ABSOLUTE)
+        return stop
+
+
+    def _read_mscnt(self) -> int:
+        """reads the microstep counter
+
+        Returns:
+            int: MSCNT; None without tmc_com
+        """
+        if self._tmc_com is None or self._tmc_com.tmc_registers is None:
+            return None
+        mscnt = self._tmc_com.tmc_registers["mscnt"]
+        mscnt.read()
+        return mscnt.mscnt
+
+
+    def _correct_position_mscnt(self, mscnt_start:int, start_pos:int):
+        """corrects the integrated position with the microstep counter.
+        MSCNT counts 1024 per 4 fullsteps, so errors below 2 fullsteps are corrected.
+
+        Args:
+            mscnt_start (int): MSCNT before the movement
+            start_pos (int): position before the movement
+        """
+        estimator = TmcMscntEstimator(self._mres)
+        estimator.reset(mscnt_start, start_pos)
+        estimator.update(self._read_mscnt(), self._current_pos)
+        if estimator.position != self._current_pos:
+            self._tmc_logger.log(f"PWM positioning: MSCNT correction of {estimator.position - self._current_pos} steps",
+                                 Loglevel.DEBUG)
+            self._current_pos = estimator.position
@@ -45,6 +45,7 @@ class TmcMotionControlStepReg(TmcMotionControlStepDir):
 
     def __del__(self):
         """destructor"""
+        self.stop_step_worker()
         if self._pin_step is not None:
             tmc_gpio.gpio_cleanup(self._pin_step)
 
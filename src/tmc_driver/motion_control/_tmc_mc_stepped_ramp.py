@@ -0,0 +1,47 @@
+"""
+Stepped ramp module
+
+plans movements as a sequence of constant speed segments for motion controls,
+which set a speed instead of making single steps (PWM frequency, VACTUAL)
+"""
+
+from ._tmc_mc import MovementPhase
+from .._tmc_exceptions import TmcMotionControlException
+
+
+def compute_stepped_ramp(steps:int, max_speed:float, acceleration:float, interval:float) -> list:
+    """computes a stepped trapezoid ramp.
+    The speed is constant for each segment; the steps of all segments add up to the given steps.
+    The speed of a ramp segment is the speed of the continuous ramp in the middle of the segment,
+    so it differs from it by at most acceleration * interval / 2.
+
+    Args:
+        steps (int): distance in µsteps; positive
+        max_speed (float): max speed in µsteps/s
+        acceleration (float): acceleration in µsteps/s²
+        interval (float): duration of one ramp segment in seconds
+
+    Returns:
+        list: (speed, duration, MovementPhase) of each segment;
+            empty, if the distance is too short for one acceleration segment
+    """
+    if max_speed <= 0 or acceleration <= 0 or interval <= 0:
+        raise TmcMotionControlException(f"invalid stepped ramp: max_speed {max_speed}, "
+                                        f"acceleration {acceleration}, interval {interval}")
+    ramp = []
+    ramp_steps = 0.0
+    frequency = acceleration * interval / 2
+    while frequency < max_speed and 2 * (ramp_steps + frequency * interval) <= steps:
+        ramp.append(frequency)
+        ramp_steps += frequency * interval
+        frequency += acceleration * interval
+    if not ramp:
+        return []
+
+    segments = [(f, interval, MovementPhase.ACCELERATING) for f in ramp]
+    cruise_frequency = max_speed if frequency >= max_speed else ramp[-1]
+    cruise_steps = steps - 2 * ramp_steps
+    if cruise_steps > 0:
+        segments.append((cruise_frequency, cruise_steps / cruise_frequency, MovementPhase.MAXSPEED))
+    segments += [(f, interval, MovementPhase.DECELERATING) for f in reversed(ramp)]
+    return segments
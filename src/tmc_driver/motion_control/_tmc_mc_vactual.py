@@ -3,24 +3,99 @@
 #pylint: disable=too-many-public-methods
 #pylint: disable=too-many-branches
 #pylint: disable=too-many-positional-arguments
+#pylint: disable=too-many-locals
 """
 VActual Motion Control module
 """
 
 import time
-from ._tmc_mc import TmcMotionControl, MovementAbsRel, StopMode
+import threading
+from ._tmc_mc import TmcMotionControl, MovementAbsRel, MovementPhase, StopMode
+from ._tmc_mc_ramp import TmcRampProfile
+from ._tmc_mc_stepped_ramp import compute_stepped_ramp
+from ._tmc_mc_mscnt import TmcMscntEstimator
+from ..reg._tmc_reg import read_registers
 from ..com._tmc_com import TmcCom
 from .._tmc_logger import Loglevel
+from .._tmc_exceptions import TmcMotionControlException
 from .. import _tmc_math as tmc_math
 
 
+def compute_vactual_schedule(steps:int, max_speed:float, acceleration:float, velocity_error:float,
+                             min_interval:float = 0.005, fclk:int = 12000000) -> list:
+    """computes a piecewise constant VACTUAL schedule for a trapezoid ramp.
+    Each value is held for 2 * velocity_error / acceleration (at least min_interval),
+    so that it differs from the continuous ramp by at most velocity_error.
+    This gives the fewest writes within the velocity error budget.
+
+    Args:
+        steps (int): distance in µsteps; can be negative
+        max_speed (float): max speed in µsteps/s
+        acceleration (float): acceleration in µsteps/s²
+        velocity_error (float): allowed deviation from the continuous ramp in µsteps/s
+        min_interval (float): min time in seconds between two writes (Default value = 0.005)
+        fclk (int): clock speed of the tmc (Default value = 12000000)
+
+    Returns:
+        list: (vactual, duration, MovementPhase) of each segment;
+            the durations are adapted to the rounded VACTUAL values
+    """
+    if max_speed <= 0 or acceleration <= 0:
+        raise TmcMotionControlException(f"invalid VACTUAL schedule: max_speed {max_speed}, "
+                                        f"acceleration {acceleration}")
+    if steps == 0:
+        return []
+    sign = -1 if steps < 0 else 1
+    interval = max(2 * velocity_error / acceleration, min_interval)
+    segments = compute_stepped_ramp(abs(steps), max_speed, acceleration, interval)
+    if not segments:
+        # too short for a ramp
+        speed = min(acceleration * interval / 2, max_speed)
+        segments = [(speed, abs(steps) / speed, MovementPhase.MAXSPEED)]
+
+    schedule = []
+    for speed, duration, phase in segments:
+        vactual = max(tmc_math.steps_to_vactual(speed, fclk), 1)
+        duration *= speed / tmc_math.vactual_to_steps(vactual, fclk)
+        if schedule and schedule[-1][0] == sign * vactual:
+            # the same value after rounding needs no write
+            schedule[-1] = (sign * vactual, schedule[-1][1] + duration, schedule[-1][2])
+        else:
+            schedule.append((sign * vactual, duration, phase))
+    return schedule
+
+
 class TmcMotionControlVActual(TmcMotionControl):
-    """VActual Motion Control class"""
+    """VActual Motion Control class
+
+    run_to_position_steps runs a precomputed VACTUAL schedule.
+    The position is tracked by integrating the written velocity over time.
+    With a feedback_interval, MSCNT and TSTEP are read during the movement
+    to correct the position and the final approach is trimmed to the target.
+    """
+
+    VACTUAL_MIN_INTERVAL = 0.005        # min time in seconds between two VACTUAL writes of a schedule
+    FEEDBACK_TRIM_SPEED = 100           # max speed in µsteps/s for trimming the final position
+    FEEDBACK_TRIM_TRIES = 3             # max amount of trim movements
+    FEEDBACK_SETTLE_TIMEOUT = 0.2       # max time in seconds to wait for TSTEP to show standstill
 
     _tmc_com:TmcCom = None
 
     _starttime:int = 0
 
+    _fclk:int = 12000000                # clock speed of the tmc
+    _velocity_error:float = None        # allowed deviation from the continuous ramp in µsteps/s
+    _velocity:float = 0.0               # velocity of the last VACTUAL write in µsteps/s
+    _velocity_time:float = 0.0          # perf_counter time of the last position integration
+    _pos_remainder:float = 0.0          # fraction of a µstep of the integrated position
+    _schedule_running:bool = False      # whether run_to_position_steps is running
+    _stop_event:threading.Event = None  # wakes up the schedule on a stop
+
+    _feedback_interval:float = None     # time in seconds between two MSCNT/TSTEP reads; None: open loop
+    _estimator:TmcMscntEstimator = None
+    _measured_speed:float = 0.0         # speed from TSTEP in µsteps/s
+    _feedback_time:float = 0.0          # perf_counter time of the last MSCNT/TSTEP read
+
 
     @property
     def tmc_com(self):
@@ -32,6 +107,47 @@ class TmcMotionControlVActual(TmcMotionControl):
         """set the tmc_logger"""
         self._tmc_com = tmc_com
 
+    @property
+    def velocity_error(self):
+        """allowed deviation of the VACTUAL schedule from the continuous ramp in µsteps/s;
+        None: 5 % of max_speed"""
+        return self._velocity_error
+
+    @velocity_error.setter
+    def velocity_error(self, velocity_error:float):
+        """_velocity_error setter"""
+        self._velocity_error = velocity_error
+
+    @property
+    def velocity(self):
+        """velocity of the last VACTUAL write in µsteps/s"""
+        return self._velocity
+
+    @property
+    def feedback_interval(self):
+        """time in seconds between two MSCNT/TSTEP reads during a movement;
+        None: open loop"""
+        return self._feedback_interval
+
+    @feedback_interval.setter
+    def feedback_interval(self, feedback_interval:float):
+        """_feedback_interval setter"""
+        self._feedback_interval = feedback_interval
+
+    @property
+    def measured_speed(self):
+        """speed from the last TSTEP read in µsteps/s"""
+        return self._measured_speed
+
+    @property
+    def mscnt_estimator(self):
+        """_estimator property"""
+        return self._estimator
+
+
+    def __init__(self):
+        """constructor"""
+        self._stop_event = threading.Event()
 
 
     def make_a_step(self):
@@ -48,26 +164,249 @@ class TmcMotionControlVActual(TmcMotionControl):
                 (Default value = StopMode.HARDSTOP)
         """
         super().stop(stop_mode)
+        if self._schedule_running:
+            # the schedule writes VACTUAL itself
+            self._stop_event.set()
+            return
         self.set_vactual(0)
 
 
-    def run_to_position_steps(self, steps, movement_abs_rel:MovementAbsRel = None):
+    def run_to_position_steps(self, steps, movement_abs_rel:MovementAbsRel = None,
+                              ramp_profile:TmcRampProfile = None) -> StopMode:
         """runs the motor to the given position.
         with acceleration and deceleration
         blocks the code until finished or stopped from a different thread!
-        returns true when the movement if finished normally and false,
-        when the movement was stopped
+
+        The ramp is precomputed as a VACTUAL schedule (compute_vactual_schedule).
+        VACTUAL is only written, without read and IFCNT check.
+        The durations of the cruise and of the last segment are computed from the
+        integrated position, so that the final write lands on the target.
+        With a feedback_interval, the position is corrected with MSCNT during the movement
+        and afterwards trimmed with slow movements, until it is on the target.
 
         Args:
             steps (int): amount of steps; can be negative
             movement_abs_rel (enum): whether the movement should be absolut or relative
                 (Default value = None)
+            ramp_profile (TmcRampProfile): not used for VActual (Default value = None)
 
         Returns:
             stop (enum): how the movement was finished
         """
-        rps = tmc_math.steps_to_rps(self.max_speed_fullstep, self.steps_per_rev)
-        self.set_vactual_rps(rps, revolutions=steps/self.steps_per_rev)
+        if movement_abs_rel is None:
+            movement_abs_rel = self._movement_abs_rel
+        if movement_abs_rel == MovementAbsRel.RELATIVE:
+            self._target_pos = self._current_pos + steps
+        else:
+            self._target_pos = steps
+        self._tmc_logger.log(f"cur: {self._current_pos} | tar: {self._target_pos}", Loglevel.MOVEMENT)
+
+        self._stop = StopMode.NO
+        self._stop_event.clear()
+        schedule = self.compute_schedule(self._target_pos - self._current_pos)
+        if not schedule:
+            return self._stop
+
+        feedback = self._feedback_interval is not None
+        if feedback:
+            self._start_feedback()
+        self._schedule_running = True
+        try:
+            self._run_schedule(schedule)
+            if feedback:
+                self._write_vactual(0)
+                self._settle()
+                if self._stop == StopMode.NO:
+                    self._trim_to_target()
+        finally:
+            self._schedule_running = False
+            self._write_vactual(0)
+            self._speed = 0
+            self._movement_phase = MovementPhase.STANDSTILL
+        if self._stop != StopMode.NO:
+            self._target_pos = self._current_pos
+        return self._stop
+
+
+    def compute_schedule(self, steps:int) -> list:
+        """computes the VACTUAL schedule for a movement with the current settings
+
+        Args:
+            steps (int): distance in µsteps; can be negative
+
+        Returns:
+            list: (vactual, duration, MovementPhase) of each segment
+        """
+        velocity_error = self._velocity_error
+        if velocity_error is None:
+            velocity_error = self._max_speed * 0.05
+        return compute_vactual_schedule(steps, self._max_speed, self._acceleration, velocity_error,
+                                        self.VACTUAL_MIN_INTERVAL, self._fclk)
+
+
+    def _segment_end(self, schedule:list, index:int, deadline:float, fit_target:bool = True) -> float:
+        """returns when the given segment of a schedule ends.
+        The ramp segments end after their duration; the deadlines are chained,
+        so that delayed writes do not add up.
+        The cruise and the last segment end, when the integrated position
+        reaches the target minus the steps of the following segments.
+
+        Args:
+            schedule (list): VACTUAL schedule
+            index (int): index of the segment
+            deadline (float): perf_counter time, when the previous segment ended
+            fit_target (bool): whether the cruise and the last segment are fitted to the target
+                (Default value = True)
+
+        Returns:
+            float: perf_counter time
+        """
+        vactual, duration, phase = schedule[index]
+        if not fit_target or (phase != MovementPhase.MAXSPEED and index != len(schedule) - 1):
+            return deadline + duration
+        following = sum(tmc_math.vactual_to_steps(v, self._fclk) * d for v, d, _ in schedule[index + 1:])
+        remaining = self._target_pos - (self._current_pos + self._pos_remainder) - following
+        return self._velocity_time + max(remaining / tmc_math.vactual_to_steps(vactual, self._fclk), 0.0)
+
+
+    def _run_schedule(self, schedule:list):
+        """writes the values of a VACTUAL schedule; the last value is not reset to 0
+
+        Args:
+            schedule (list): VACTUAL schedule
+        """
+        softstop = False
+        deadline = time.perf_counter()
+        i = 0
+        while i < len(schedule):
+            vactual, _, phase = schedule[i]
+            self._write_vactual(vactual)
+            self._movement_phase = phase
+            self._speed = abs(self._velocity)
+            end = self._segment_end(schedule, i, deadline, not softstop)
+            while True:
+                timeout = end - time.perf_counter()
+                if self._feedback_interval is not None:
+                    timeout = min(timeout, self._feedback_time + self._feedback_interval - time.perf_counter())
+                stopped = self._stop_event.wait(max(timeout, 0.0))
+                if stopped or time.perf_counter() >= end:
+                    break
+                self._read_feedback()
+                end = self._segment_end(schedule, i, deadline, not softstop)
+            deadline = end
+            if stopped:
+                if self._stop == StopMode.HARDSTOP:
+                    return
+                if self._stop == StopMode.SOFTSTOP and not softstop:
+                    # ramp down from the current velocity
+                    softstop = True
+                    self._stop_event.clear()
+                    schedule = schedule[:i + 1] + self._stop_schedule(vactual)
+                    deadline = time.perf_counter()
+            i += 1
+
+
+    def _stop_schedule(self, vactual:int) -> list:
+        """computes the VACTUAL schedule for decelerating to standstill
+
+        Args:
+            vactual (int): current VACTUAL
+
+        Returns:
+            list: (vactual, duration, MovementPhase) of each segment
+        """
+        interval = self.VACTUAL_MIN_INTERVAL
+        change = max(tmc_math.steps_to_vactual(self._acceleration * interval, self._fclk), 1)
+        schedule = []
+        remaining = abs(vactual) - change
+        while remaining > 0:
+            schedule.append((remaining if vactual > 0 else -remaining, interval, MovementPhase.DECELERATING))
+            remaining -= change
+        return schedule
+
+
+    def _start_feedback(self):
+        """reads MSCNT and assigns it to the current position"""
+        mscnt = self._tmc_com.tmc_registers["mscnt"]
+        mscnt.read()
+        self._estimator = TmcMscntEstimator(self._mres)
+        self._estimator.reset(mscnt.mscnt, self._current_pos)
+        self._pos_remainder = 0.0
+        self._feedback_time = time.perf_counter()
+
+
+    def _read_feedback(self):
+        """reads MSCNT and TSTEP and corrects the integrated position with MSCNT"""
+        registers = self._tmc_com.tmc_registers
+        # the driver samples MSCNT, when it receives the request
+        self._integrate_position()
+        read_registers([registers["mscnt"], registers["tstep"]])
+        predicted = self._current_pos + self._pos_remainder
+        self._current_pos = self._estimator.update(registers["mscnt"].mscnt, predicted)
+        self._pos_remainder = 0.0
+        self._measured_speed = tmc_math.tstep_to_steps(registers["tstep"].tstep, self._mres)
+        self._feedback_time = time.perf_counter()
+        if self._tmc_logger.movement_enabled:
+            self._tmc_logger.log(f"feedback | pos: {self._current_pos} | error: {self._estimator.error:.1f} | "
+                                 f"speed: {self._measured_speed:.0f} of {abs(self._velocity):.0f}",
+                                 Loglevel.MOVEMENT)
+
+
+    def _settle(self):
+        """reads MSCNT and TSTEP, until TSTEP shows, that the motor stands still"""
+        end = time.perf_counter() + self.FEEDBACK_SETTLE_TIMEOUT
+        self._read_feedback()
+        while self._measured_speed != 0 and time.perf_counter() < end:
+            time.sleep(self.VACTUAL_MIN_INTERVAL)
+            self._read_feedback()
+
+
+    def _trim_to_target(self):
+        """moves slowly to the target, until MSCNT shows, that the target is reached"""
+        for _ in range(self.FEEDBACK_TRIM_TRIES):
+            error = self._target_pos - self._current_pos
+            if error == 0 or self._stop != StopMode.NO:
+                return
+            vactual = max(tmc_math.steps_to_vactual(min(self.FEEDBACK_TRIM_SPEED, self._max_speed), self._fclk), 1)
+            self._write_vactual(vactual if error > 0 else -vactual)
+            self._movement_phase = MovementPhase.DECELERATING
+            self._stop_event.wait(abs(error / self._velocity))
+            self._write_vactual(0)
+            self._settle()
+        if self._target_pos != self._current_pos:
+            self._tmc_logger.log(f"target missed by {self._target_pos - self._current_pos} steps", Loglevel.WARNING)
+
+
+    def _integrate_position(self):
+        """adds the steps made with the last written velocity since the last integration to current_pos"""
+        now = time.perf_counter()
+        if self._velocity != 0:
+            pos = self._current_pos + self._pos_remainder + self._velocity * (now - self._velocity_time)
+            self._current_pos = round(pos)
+            self._pos_remainder = pos - self._current_pos
+        self._velocity_time = now
+
+
+    def _write_vactual(self, vactual:int):
+        """writes VACTUAL without reading it back and tracks the position
+
+        Args:
+            vactual (int): value for VACTUAL
+        """
+        register = self._tmc_com.tmc_registers["vactual"]
+        register.vactual = vactual
+        register.write()
+        self._set_velocity(vactual)
+
+
+    def _set_velocity(self, vactual:int):
+        """integrates the position up to now and stores the velocity of a written VACTUAL
+
+        Args:
+            vactual (int): written value of VACTUAL
+        """
+        self._integrate_position()
+        self._velocity = tmc_math.vactual_to_steps(vactual, self._fclk)
 
 
     def set_vactual(self, vactual:int):
@@ -80,6 +419,7 @@ class TmcMotionControlVActual(TmcMotionControl):
             vactual (int): value for VACTUAL
         """
         self.tmc_com.tmc_registers["vactual"].modify("vactual", vactual)
+        self._set_velocity(vactual)
 
 
     def set_vactual_dur(self, vactual, duration=0, acceleration=0,
@@ -132,11 +472,11 @@ class TmcMotionControlVActual(TmcMotionControl):
                     time_to_stop = current_time-1
             if acceleration != 0 and current_time > time_to_stop:
                 current_vactual -= acceleration*sleeptime
-                self.set_vactual(int(round(current_vactual)))
+                self._write_vactual(int(round(current_vactual)))
                 time.sleep(sleeptime)
             elif acceleration != 0 and abs(current_vactual)<abs(vactual):
                 current_vactual += acceleration*sleeptime
-                self.set_vactual(int(round(current_vactual)))
+                self._write_vactual(int(round(current_vactual)))
                 time.sleep(sleeptime)
             if show_stallguard_result:
                 # self._tmc_logger.log(f"StallGuard result: {self.get_stallguard_result()}",
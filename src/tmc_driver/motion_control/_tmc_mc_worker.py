@@ -0,0 +1,239 @@
+#pylint: disable=too-many-instance-attributes
+"""
+Step Worker module
+
+persistent thread, which executes the movements of one motion control.
+It is created once and receives the movements over a queue, so that no
+thread is started per movement. Optionally the thread is pinned to a CPU,
+runs with SCHED_FIFO and the garbage collector is held off during a movement.
+"""
+
+import gc
+import os
+import queue
+import threading
+from enum import Enum
+from concurrent.futures import Future
+from .._tmc_logger import TmcLogger, Loglevel
+
+
+class GcMode(Enum):
+    """garbage collector handling during a movement"""
+    NONE = 0        # the garbage collector is not touched
+    FREEZE = 1      # all existing objects are frozen (gc.freeze), so that collections stay short
+    DISABLE = 2     # the garbage collector is disabled
+
+
+_gc_lock = threading.Lock()
+_gc_holds:int = 0                       # amount of movements, which currently hold off the gc
+_gc_was_enabled:bool = True
+
+
+def _gc_hold(gc_mode:GcMode):
+    """holds off the garbage collector for one movement.
+    The gc is process wide, so it is only restored after the last movement finished
+
+    Args:
+        gc_mode (GcMode): garbage collector handling
+    """
+    global _gc_holds, _gc_was_enabled    #pylint: disable=global-statement
+    if gc_mode == GcMode.NONE:
+        return
+    with _gc_lock:
+        if _gc_holds == 0:
+            _gc_was_enabled = gc.isenabled()
+            if gc_mode == GcMode.FREEZE:
+                gc.freeze()
+            else:
+                gc.disable()
+        _gc_holds += 1
+
+
+def _gc_release(gc_mode:GcMode):
+    """releases the garbage collector after a movement
+
+    Args:
+        gc_mode (GcMode): garbage collector handling
+    """
+    global _gc_holds                     #pylint: disable=global-statement
+    if gc_mode == GcMode.NONE:
+        return
+    with _gc_lock:
+        _gc_holds -= 1
+        if _gc_holds == 0:
+            gc.unfreeze()
+            if _gc_was_enabled:
+                gc.enable()
+
+
+
+class TmcStepWorker():
+    """TmcStepWorker
+
+    executes the submitted movements one after another in one persistent thread.
+    CPU affinity and SCHED_FIFO apply to the worker thread only (Linux).
+    If they are not permitted, a warning is logged and the worker runs normally.
+
+    Usage:
+        worker = TmcStepWorker(cpus={3}, priority=50)
+        worker.start()
+        future = worker.submit(tmc_mc.run_to_position_steps, 400)
+        stop_mode = future.result()
+    """
+
+    _tmc_logger:TmcLogger = None
+    _thread:threading.Thread = None
+    _moves:queue.Queue = None           # (Future, function, args) or None to end the thread
+    _cpus:set = None                    # CPUs the thread is pinned to
+    _priority:int = None                # SCHED_FIFO priority
+    _gc_mode:GcMode = GcMode.FREEZE
+    _realtime:bool = False              # whether affinity and priority were applied
+
+
+    @property
+    def cpus(self):
+        """_cpus property"""
+        return self._cpus
+
+    @property
+    def priority(self):
+        """_priority property"""
+        return self._priority
+
+    @property
+    def gc_mode(self):
+        """_gc_mode property"""
+        return self._gc_mode
+
+    @property
+    def realtime(self):
+        """whether the requested CPU affinity and SCHED_FIFO priority were applied"""
+        return self._realtime
+
+    @property
+    def running(self):
+        """whether the worker thread is running"""
+        return self._thread is not None and self._thread.is_alive()
+
+
+    def __init__(self, cpus:set = None, priority:int = None, gc_mode:GcMode = GcMode.FREEZE,
+                 tmc_logger:TmcLogger = None):
+        """constructor
+
+        Args:
+            cpus (set): CPUs the thread is pinned to, ideally isolated ones
+                (Default value = None, no pinning)
+            priority (int): SCHED_FIFO priority 1-99 (Default value = None, normal scheduling)
+            gc_mode (GcMode): garbage collector handling during a movement (Default value = GcMode.FREEZE)
+            tmc_logger (class): TMCLogger class (Default value = None)
+        """
+        if tmc_logger is None:
+            tmc_logger = TmcLogger(logprefix="TmcStepWorker")
+        self._tmc_logger = tmc_logger
+        self._cpus = set(cpus) if cpus is not None else None
+        self._priority = priority
+        self._gc_mode = gc_mode
+        self._moves = queue.Queue()
+
+
+    def __del__(self):
+        """destructor"""
+        self.stop()
+
+
+    def start(self):
+        """starts the worker thread"""
+        if self.running:
+            return
+        self._thread = threading.Thread(target=self._run, name="TmcStepWorker", daemon=True)
+        self._thread.start()
+
+
+    def stop(self):
+        """cancels the pending movements and ends the worker thread after the current movement"""
+        if not self.running:
+            return
+        self.cancel_pending()
+        self._moves.put(None)
+        if threading.current_thread() is not self._thread:
+            self._thread.join()
+        self._thread = None
+
+
+    def submit(self, func, *args) -> Future:
+        """queues a movement
+
+        Args:
+            func (func): function, which runs the movement, e.g. run_to_position_steps
+            *args: arguments of the function
+
+        Returns:
+            Future: result of the function
+        """
+        self.start()
+        future = Future()
+        self._moves.put((future, func, args))
+        return future
+
+
+    def cancel_pending(self):
+        """cancels the movements, which have not started yet"""
+        while True:
+            try:
+                item = self._moves.get_nowait()
+            except queue.Empty:
+                return
+            if item is None:
+                self._moves.put(None)
+                self._moves.task_done()
+                return
+            item[0].cancel()
+            self._moves.task_done()
+
+
+    def wait(self):
+        """blocks until all submitted movements are finished"""
+        if self.running:
+            self._moves.join()
+
+
+    def _apply_realtime(self):
+        """pins the calling thread to the CPUs and sets the SCHED_FIFO priority"""
+        self._realtime = True
+        if self._cpus is not None:
+            try:
+                os.sched_setaffinity(0, self._cpus)
+                self._tmc_logger.log(f"step worker pinned to CPU {sorted(self._cpus)}", Loglevel.DEBUG)
+            except (AttributeError, OSError) as e:
+                self._realtime = False
+                self._tmc_logger.log(f"could not pin the step worker to CPU {sorted(self._cpus)}: {e}",
+                                     Loglevel.WARNING)
+        if self._priority is not None:
+            try:
+                os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(self._priority))
+                self._tmc_logger.log(f"step worker runs with SCHED_FIFO priority {self._priority}",
+                                     Loglevel.DEBUG)
+            except (AttributeError, OSError) as e:
+                self._realtime = False
+                self._tmc_logger.log(f"SCHED_FIFO is not permitted for the step worker: {e}",
+                                     Loglevel.WARNING)
+
+
+    def _run(self):
+        """worker thread"""
+        self._apply_realtime()
+        while True:
+            item = self._moves.get()
+            if item is None:
+                self._moves.task_done()
+                return
+            future, func, args = item
+            if future.set_running_or_notify_cancel():
+                _gc_hold(self._gc_mode)
+                try:
+                    future.set_result(func(*args))
+                except Exception as e:      #pylint: disable=broad-exception-caught
+                    future.set_exception(e)
+                finally:
+                    _gc_release(self._gc_mode)
+            self._moves.task_done()
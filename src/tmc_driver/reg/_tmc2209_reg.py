@@ -13,6 +13,8 @@ from ._tmc220x_reg import *
 class TCoolThrs(TmcReg):
     """TCOOLTHRS register class"""
 
+    cacheable = True
+
     def __init__(self, tmc_com: TmcCom):
         """constructor"""
 
@@ -25,6 +27,8 @@ class TCoolThrs(TmcReg):
 class SGThrs(TmcReg):
     """SGTHRS register class"""
 
+    cacheable = True
+
     def __init__(self, tmc_com: TmcCom):
         """constructor"""
 
@@ -49,6 +53,8 @@ class SGResult(TmcReg):
 class CoolConf(TmcReg):
     """COOLCONF register class"""
 
+    cacheable = True
+
     def __init__(self, tmc_com: TmcCom):
         """constructor"""
 
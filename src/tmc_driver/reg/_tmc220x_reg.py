@@ -15,6 +15,8 @@ from .._tmc_exceptions import TmcDriverException
 class GConf(TmcReg):
     """GCONF register class"""
 
+    cacheable = True
+
     def __init__(self, tmc_com: TmcCom):
         """constructor"""
 
@@ -46,6 +48,16 @@ class GStat(TmcReg):
         ]
         super().__init__(0x1, "GSTAT", tmc_com, reg_map)
 
+    def _update(self, data:int, flags):
+        """stores a value read from the driver
+        a detected reset invalidates the register cache of all registers,
+        because the driver has lost its configuration
+        """
+        super()._update(data, flags)
+        if (self.reset) and self._tmc_com.tmc_registers is not None:
+            for register in self._tmc_com.tmc_registers.values():
+                register.invalidate()
+
     def check(self):
         """check if the driver is ok"""
         self.read()
@@ -84,12 +96,30 @@ class Ioin(TmcReg):
             ["ms1",                 2,  0x1, bool, None, ""],
             ["enn",                 0,  0x1, bool, None, ""]
         ]
-        super().__init__(0x3, "IOIN", tmc_com, reg_map)
+        super().__init__(0x6, "IOIN", tmc_com, reg_map)
+
+
+class NodeConf(TmcReg):
+    """NODECONF register class
+    write only
+    """
+
+    cacheable = True
+
+    def __init__(self, tmc_com: TmcCom):
+        """constructor"""
+
+        reg_map = [
+            ["senddelay",           8,  0xF, int, None, ""]
+        ]
+        super().__init__(0x3, "NODECONF", tmc_com, reg_map)
 
 
 class IHoldIRun(TmcReg):
     """IHOLD_IRUN register class"""
 
+    cacheable = True
+
     def __init__(self, tmc_com: TmcCom):
         """constructor"""
 
@@ -104,6 +134,8 @@ class IHoldIRun(TmcReg):
 class TPowerDown(TmcReg):
     """TPowerDown register class"""
 
+    cacheable = True
+
     def __init__(self, tmc_com: TmcCom):
         """constructor"""
 
@@ -128,11 +160,13 @@ class TStep(TmcReg):
 class VActual(TmcReg):
     """VACTUAL register class"""
 
+    cacheable = True
+
     def __init__(self, tmc_com: TmcCom):
         """constructor"""
 
         reg_map = [
-            ["vactual",             0,  0x1FFFFF, int, None, ""]
+            ["vactual",             0,  0xFFFFFF, int, None, ""]
         ]
         super().__init__(0x22, "VACTUAL", tmc_com, reg_map)
 
@@ -144,7 +178,7 @@ class MsCnt(TmcReg):
         """constructor"""
 
         reg_map = [
-            ["mscnt",               0,  0xFF, int, None, ""]
+            ["mscnt",               0,  0x3FF, int, None, ""]
         ]
         super().__init__(0x6A, "MSCNT", tmc_com, reg_map)
 
@@ -152,6 +186,8 @@ class MsCnt(TmcReg):
 class ChopConf(TmcReg):
     """CHOPCONF register class"""
 
+    cacheable = True
+
     def __init__(self, tmc_com: TmcCom):
         """constructor"""
 
@@ -15,6 +15,8 @@ from .._tmc_exceptions import TmcDriverException
 class GConf(TmcReg):
     """GCONF register class"""
 
+    cacheable = True
+
     def __init__(self, tmc_com: TmcCom):
         """constructor"""
 
@@ -53,6 +55,16 @@ class GStat(TmcReg):
         ]
         super().__init__(0x1, "GSTAT", tmc_com, reg_map)
 
+    def _update(self, data:int, flags):
+        """stores a value read from the driver
+        a detected reset invalidates the register cache of all registers,
+        because the driver has lost its configuration
+        """
+        super()._update(data, flags)
+        if (self.reset or self.register_reset) and self._tmc_com.tmc_registers is not None:
+            for register in self._tmc_com.tmc_registers.values():
+                register.invalidate()
+
     def check(self):
         """check if the driver is ok"""
         self.read()
@@ -111,6 +123,8 @@ class Ioin(TmcReg):
 class DrvConf(TmcReg):
     """DRV_CONF register class"""
 
+    cacheable = True
+
     def __init__(self, tmc_com: TmcCom):
         """constructor"""
 
@@ -124,6 +138,8 @@ class DrvConf(TmcReg):
 class GlobalScaler(TmcReg):
     """GLOBAL_SCALER register class"""
 
+    cacheable = True
+
     def __init__(self, tmc_com: TmcCom):
         """constructor"""
 
@@ -136,6 +152,8 @@ class GlobalScaler(TmcReg):
 class IHoldIRun(TmcReg):
     """IHOLD_IRUN register class"""
 
+    cacheable = True
+
     def __init__(self, tmc_com: TmcCom):
         """constructor"""
 
@@ -151,6 +169,8 @@ class IHoldIRun(TmcReg):
 class TPowerDown(TmcReg):
     """TPOWERDOWN register class"""
 
+    cacheable = True
+
     def __init__(self, tmc_com: TmcCom):
         """constructor"""
 
@@ -175,6 +195,8 @@ class TStep(TmcReg):
 class THigh(TmcReg):
     """THIGH register class"""
 
+    cacheable = True
+
     def __init__(self, tmc_com: TmcCom):
         """constructor"""
 
@@ -233,6 +255,8 @@ class ADCTemp(TmcReg):
 class ChopConf(TmcReg):
     """CHOPCONF register class"""
 
+    cacheable = True
+
     def __init__(self, tmc_com: TmcCom):
         """constructor"""
 
@@ -273,6 +297,8 @@ class ChopConf(TmcReg):
 class CoolConf(TmcReg):
     """COOLCONF register class"""
 
+    cacheable = True
+
     def __init__(self, tmc_com: TmcCom):
         """constructor"""
 
@@ -317,6 +343,8 @@ class DrvStatus(TmcReg):
 class TCoolThrs(TmcReg):
     """TCOOLTHRS register class"""
 
+    cacheable = True
+
     def __init__(self, tmc_com: TmcCom):
         """constructor"""
 
@@ -329,6 +357,8 @@ class TCoolThrs(TmcReg):
 class SgThrs(TmcReg):
     """SGTHRS register class"""
 
+    cacheable = True
+
     def __init__(self, tmc_com: TmcCom):
         """constructor"""
 
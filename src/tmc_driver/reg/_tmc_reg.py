@@ -1,5 +1,6 @@
 #pylint: disable=too-many-instance-attributes
 #pylint: disable=unused-import
+#pylint: disable=protected-access
 """
 Register module
 """
@@ -10,14 +11,23 @@ from ..com._tmc_com import TmcCom
 
 
 class TmcReg():
-    """Register class"""
+    """Register class
+
+    with the opt-in shadow cache (cache_enabled) the last known value of
+    configuration registers (cacheable) is kept. Reads are answered from the
+    cache unless forced and writes are only sent, if the value changed.
+    """
+
+    cacheable: bool = False             # whether the value only changes by writes (config registers)
 
     _addr: hex
     _name: str
     _tmc_com: TmcCom
     _reg_map: typing.List
-    _data_int: int
-    _flags: typing.Dict
+    _data_int: int = 0
+    _flags: typing.Dict = None
+    _cache_enabled: bool = False
+    _cache_valid: bool = False
 
 
     @property
@@ -45,6 +55,27 @@ class TmcReg():
         """flags property"""
         return self._flags
 
+    @property
+    def cache_enabled(self) -> bool:
+        """cache_enabled property"""
+        return self._cache_enabled
+
+    @cache_enabled.setter
+    def cache_enabled(self, enabled:bool):
+        """cache_enabled setter"""
+        self._cache_enabled = enabled and self.cacheable
+        self._cache_valid = False
+
+    @property
+    def cached(self) -> bool:
+        """whether the value of this register is answered from the cache"""
+        return self._cache_enabled and self._cache_valid
+
+    @property
+    def dirty(self) -> bool:
+        """whether a field was changed since the last read or write"""
+        return not self.cached or self.serialise() != self._data_int
+
 
     def __init__(self, address:hex, name:str, tmc_com:TmcCom, reg_map:typing.List):
         """Constructor"""
@@ -95,27 +126,88 @@ class TmcReg():
             logger.log(log_string)
 
 
-    def read(self):
-        """read this register"""
+    def invalidate(self):
+        """invalidates the cached value; the next read accesses the driver"""
+        self._cache_valid = False
+
+
+    def read(self, force:bool = False):
+        """read this register
+
+        Args:
+            force (bool): read from the driver, even if the value is cached (Default value = False)
+        """
+        if self.cached and not force:
+            self.deserialise(self._data_int)
+            return self._data_int, self._flags
+
         data, flags = self._tmc_com.read_int(self._addr)
+        self._update(data, flags)
+        return data, flags
+
 
+    def _update(self, data:int, flags:typing.Dict):
+        """stores and deserialises a value read from the driver
+
+        Args:
+            data (int): register value
+            flags (dict): flags
+        """
         self._data_int = data
         self._flags = flags
-
+        self._cache_valid = self._cache_enabled
         self.deserialise(data)
-        return data, flags
 
 
     def write(self):
-        """write this register"""
+        """write this register
+        if the value is cached and unchanged, nothing is sent
+        """
+        if not self.dirty:
+            return
         data = self.serialise()
-        self._tmc_com.write_reg(self._addr, data)
+        self._send(self._tmc_com.write_reg, data)
 
 
     def write_check(self):
-        """write this register and checks that the write was successful"""
+        """write this register and checks that the write was successful
+        if the value is cached and unchanged, nothing is sent
+        """
+        if not self.dirty:
+            return
         data = self.serialise()
-        self._tmc_com.write_reg_check(self._addr, data)
+        self._send(self._tmc_com.write_reg_check, data)
+
+
+    def _send(self, write_func, data:int):
+        """writes a value with the given write function of the com and updates the cache.
+        If the com reports a failed write (False or an exception),
+        the value in the driver is unknown and the cache is invalidated
+
+        Args:
+            write_func (func): write_reg or write_reg_check of the com
+            data (int): register value
+        """
+        try:
+            success = write_func(self._addr, data)
+        except:
+            self.invalidate()
+            raise
+        if success is False:
+            self.invalidate()
+        else:
+            self._update_cache(data)
+
+
+    def _update_cache(self, data:int):
+        """stores a written value in the cache
+
+        Args:
+            data (int): written register value
+        """
+        if self._cache_enabled:
+            self._data_int = data
+            self._cache_valid = True
 
 
     def modify(self, name:str, value):
@@ -128,3 +220,24 @@ class TmcReg():
         self.read()
         setattr(self, name, value)
         self.write_check()
+
+
+def read_registers(registers:typing.List[TmcReg], force:bool = False):
+    """reads several registers of one driver together.
+    The com can pipeline the accesses (e.g. N+1 transfers for N registers over SPI).
+
+    Args:
+        registers (list): registers to read; all have to use the same com
+        force (bool): read cached registers from the driver too (Default value = False)
+    """
+    to_read = []
+    for register in registers:
+        if register.cached and not force:
+            register.read()
+        else:
+            to_read.append(register)
+    if not to_read:
+        return
+    results = to_read[0]._tmc_com.read_many([register.addr for register in to_read])
+    for register, (data, flags) in zip(to_read, results):
+        register._update(data, flags)
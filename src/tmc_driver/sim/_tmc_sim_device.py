@@ -0,0 +1,299 @@
+"""
+TmcSimDevice register level simulation module
+
+emulates the register file and the datagram handling of a TMC2209 (UART)
+and a TMC2240 (SPI), so that the com classes can be tested and benchmarked
+without hardware
+"""
+
+import time
+from ..com._tmc_com import compute_crc8_atm
+from .. import _tmc_math as tmc_math
+
+
+class TmcSimDevice():
+    """TmcSimDevice
+
+    register file of a simulated driver.
+    Registers, which have no reset value, read as 0 until they are written.
+    Writes to read only registers are ignored, write only registers read as 0
+    and GSTAT is cleared by writing 1 to its flags.
+    """
+
+    RESET_VALUES:dict = {}
+    READ_ONLY:frozenset = frozenset()
+    WRITE_ONLY:frozenset = frozenset()
+    GSTAT = 0x01
+    IFCNT = 0x02
+
+    _registers:dict = None              # {addr: value}
+    _reads:int = 0
+    _writes:int = 0
+
+
+    @property
+    def registers(self):
+        """_registers property
+        can be modified to emulate status changes (e.g. DRV_STATUS or SG_RESULT)
+        """
+        return self._registers
+
+    @property
+    def reads(self):
+        """amount of read accesses"""
+        return self._reads
+
+    @property
+    def writes(self):
+        """amount of write accesses"""
+        return self._writes
+
+
+    def __init__(self):
+        """constructor
+        the driver starts configured; GSTAT is cleared
+        """
+        self._registers = dict(self.RESET_VALUES)
+
+
+    def reset(self):
+        """emulates a power cycle: all registers are set to their reset values
+        and the reset flag in GSTAT is set
+        """
+        self._registers = dict(self.RESET_VALUES)
+        self._registers[self.GSTAT] = self._registers.get(self.GSTAT, 0) | 0x1
+
+
+    def read(self, addr:int) -> int:
+        """reads a register
+
+        Args:
+            addr (int): HEX, which register to read
+
+        Returns:
+            int: register value
+        """
+        self._reads += 1
+        return self._value(addr)
+
+
+    def _value(self, addr:int) -> int:
+        """returns the value, which the driver answers for a register without counting the access"""
+        if addr in self.WRITE_ONLY:
+            return 0
+        return self._registers.get(addr, 0)
+
+
+    def write(self, addr:int, val:int):
+        """writes a register
+
+        Args:
+            addr (int): HEX, which register to write
+            val (int): value for that register
+        """
+        self._writes += 1
+        val &= 0xFFFFFFFF
+        if addr == self.GSTAT:
+            self._registers[addr] = self._registers.get(addr, 0) & ~val
+        elif addr not in self.READ_ONLY:
+            self._registers[addr] = val
+
+
+
+class TmcSim2209(TmcSimDevice):
+    """TmcSim2209
+
+    simulated TMC2209 with UART interface.
+    Valid write datagrams to the node address increment IFCNT,
+    datagrams with a wrong sync nibble, node address or CRC are ignored.
+    The register addresses follow the datasheet (IOIN at 0x06, NODECONF at 0x03).
+    A written VACTUAL moves the simulated motor (after vactual_latency);
+    MSCNT and TSTEP are derived from its position and velocity.
+    """
+
+    RESET_VALUES = {
+        0x00: 0x00000101,               # GCONF: multistep_filt, i_scale_analog
+        0x06: 0x21000040,               # IOIN: version 0x21, pdn_uart
+        0x10: 0x00011F10,               # IHOLD_IRUN
+        0x11: 0x00000014,               # TPOWERDOWN
+        0x12: 0x000FFFFF,               # TSTEP at standstill
+        0x6C: 0x10000053,               # CHOPCONF
+        0x6F: 0x80000000,               # DRV_STATUS: stst
+        0x70: 0xC10D0024,               # PWMCONF
+    }
+    READ_ONLY = frozenset({0x02, 0x06, 0x12, 0x41, 0x6A, 0x6B, 0x6F, 0x71, 0x72})
+    WRITE_ONLY = frozenset({0x03, 0x10, 0x11, 0x13, 0x14, 0x22, 0x40, 0x42})
+    NODECONF = 0x03
+    TSTEP = 0x12
+    VACTUAL = 0x22
+    MSCNT = 0x6A
+    CHOPCONF = 0x6C
+
+    vactual_latency:float = 0.0         # time in seconds until a written VACTUAL takes effect
+
+    _address:int = 0
+    _position:float = 0.0               # position of the motor in µsteps
+    _velocity:float = 0.0               # velocity of the motor in µsteps/s
+    _velocity_time:float = 0.0          # perf_counter time of the last position update
+    _pending:list = None                # [(perf_counter time, velocity)] of VACTUAL writes not in effect yet
+
+
+    @property
+    def address(self):
+        """_address property"""
+        return self._address
+
+    @property
+    def senddelay_bits(self):
+        """bit times between a read request and the reply, set by NODECONF.SENDDELAY"""
+        return 8 * ((self._registers.get(self.NODECONF, 0) >> 8 & 0xF) | 1)
+
+    @property
+    def mres(self):
+        """microstep resolution set by CHOPCONF.MRES"""
+        return 256 >> min(self._registers.get(self.CHOPCONF, 0) >> 24 & 0xF, 8)
+
+    @property
+    def position(self):
+        """position of the motor moved by VACTUAL in µsteps"""
+        self._advance()
+        return self._position
+
+
+    def __init__(self, address:int = 0):
+        """constructor
+
+        Args:
+            address (int): node address [0-3] (Default value = 0)
+        """
+        super().__init__()
+        self._address = address
+        self._pending = []
+        self._velocity_time = time.perf_counter()
+
+
+    def reset(self):
+        """emulates a power cycle"""
+        super().reset()
+        self._registers[self.IFCNT] = 0
+        self._advance()
+        self._pending.clear()
+        self._velocity = 0.0
+
+
+    def _advance(self):
+        """moves the motor up to now"""
+        now = time.perf_counter()
+        while self._pending and self._pending[0][0] <= now:
+            change_time, velocity = self._pending.pop(0)
+            self._position += self._velocity * (change_time - self._velocity_time)
+            self._velocity_time = change_time
+            self._velocity = velocity
+            if velocity == 0:
+                # the motor stands on a µstep
+                self._position = float(round(self._position))
+        self._position += self._velocity * (now - self._velocity_time)
+        self._velocity_time = now
+
+
+    def _value(self, addr:int) -> int:
+        """returns the value, which the driver answers for a register without counting the access"""
+        if addr == self.MSCNT:
+            self._advance()
+            return round(self._position) * (256 // self.mres) % 1024
+        if addr == self.TSTEP:
+            self._advance()
+            if self._velocity == 0:
+                return 0xFFFFF
+            return min(tmc_math.steps_to_tstep(abs(self._velocity), self.mres), 0xFFFFF)
+        return super()._value(addr)
+
+
+    def write(self, addr:int, val:int):
+        """writes a register
+
+        Args:
+            addr (int): HEX, which register to write
+            val (int): value for that register
+        """
+        super().write(addr, val)
+        if addr == self.VACTUAL:
+            self._advance()
+            vactual = val & 0xFFFFFF
+            if vactual & 0x800000:
+                vactual -= 0x1000000
+            self._pending.append((time.perf_counter() + self.vactual_latency, tmc_math.vactual_to_steps(vactual)))
+
+
+    def handle_datagram(self, datagram:bytes) -> bytes:
+        """handles one UART datagram
+
+        Args:
+            datagram (bytes): read request (4 bytes) or write access (8 bytes)
+
+        Returns:
+            bytes: 8 byte reply of a read request; None, if there is no reply
+        """
+        if (datagram[0] & 0x0F != 0x05 or datagram[1] != self._address or
+            datagram[-1] != compute_crc8_atm(datagram[:-1])):
+            return None
+        addr = datagram[2] & 0x7F
+        if datagram[2] & 0x80:
+            if len(datagram) != 8:
+                return None
+            self.write(addr, int.from_bytes(datagram[3:7], byteorder='big'))
+            self._registers[self.IFCNT] = (self._registers.get(self.IFCNT, 0) + 1) & 0xFF
+            return None
+        reply = bytearray([0x05, 0xFF, addr])
+        reply += self.read(addr).to_bytes(4, byteorder='big')
+        reply.append(compute_crc8_atm(reply))
+        return bytes(reply)
+
+
+
+class TmcSim2240(TmcSimDevice):
+    """TmcSim2240
+
+    simulated TMC2240 with SPI interface.
+    Every reply contains the status byte and the register, which was addressed
+    by the previous datagram.
+    """
+
+    RESET_VALUES = {
+        0x04: 0x40000000,               # IOIN: version 0x40
+        0x10: 0x00071F08,               # IHOLD_IRUN
+        0x11: 0x0000000A,               # TPOWERDOWN
+        0x12: 0x000FFFFF,               # TSTEP at standstill
+        0x50: 0x000009A2,               # ADCV_SUPPLY_AIN: 24 V
+        0x51: 0x000008B6,               # ADC_TEMP: 25 °C
+        0x6C: 0x10410153,               # CHOPCONF
+        0x6F: 0x80000000,               # DRV_STATUS: stst
+        0x70: 0xC44C001E,               # PWMCONF
+    }
+    READ_ONLY = frozenset({0x02, 0x04, 0x12, 0x50, 0x51, 0x52, 0x6A, 0x6B, 0x6F, 0x71, 0x72, 0x75, 0x76})
+    DRV_STATUS = 0x6F
+
+    _latch:int = 0                      # register value for the next reply
+
+
+    def handle_datagram(self, datagram:list) -> list:
+        """handles one 40 bit SPI datagram
+
+        Args:
+            datagram (list): address byte and 4 data bytes
+
+        Returns:
+            list: status byte and the 4 data bytes of the previous read access
+        """
+        gstat = self._registers.get(self.GSTAT, 0)
+        drv_status = self._registers.get(self.DRV_STATUS, 0)
+        status = (gstat & 0x1) | (gstat >> 1 & 0x1) << 1 | (drv_status >> 24 & 0x1) << 2 | (drv_status >> 31 & 0x1) << 3
+        reply = [status] + list(self._latch.to_bytes(4, byteorder='big'))
+
+        addr = datagram[0] & 0x7F
+        if datagram[0] & 0x80:
+            self.write(addr, int.from_bytes(bytes(datagram[1:5]), byteorder='big'))
+            self._latch = self._value(addr)
+        else:
+            self._latch = self.read(addr)
+        return reply
@@ -0,0 +1,328 @@
+#pylint: disable=too-many-instance-attributes
+"""
+TmcSim interface simulation module
+
+fake serial port, fake SPI device and pseudo terminal, which connect the
+com classes to simulated drivers. TmcComUart and TmcComSpi run unmodified:
+
+    tmc_com = TmcComUart(None, 115200)
+    tmc_com.ser = TmcSimSerial([TmcSim2209(0)])
+
+    tmc_com = TmcComSpi(0, 0)
+    tmc_com.spi = TmcSimSpiDev([TmcSim2240()])
+
+    sim_pty = TmcSimPty([TmcSim2209(0)])
+    tmc_com = TmcComUart(sim_pty.port, 115200)
+"""
+
+import os
+import time
+import select
+import threading
+from collections import deque
+from typing import List
+from ._tmc_sim_device import TmcSim2209, TmcSim2240
+from .._tmc_exceptions import TmcComException
+
+
+class TmcSimSerial():
+    """TmcSimSerial
+
+    replacement for serial.Serial, which is connected to one or more simulated TMC2209.
+    Like the single wire UART of the driver, every sent byte is echoed,
+    followed by the reply of the addressed driver.
+    With realtime, write blocks for the time the datagrams and replies need on the wire.
+    """
+
+    FAULTS = ("drop", "crc")
+
+    _devices:List[TmcSim2209] = None
+    _tx:bytearray = None                # bytes of an incomplete datagram
+    _rx:bytearray = None                # echo and replies, which were not read yet
+    _faults:deque = None                # faults for the next datagrams
+    _realtime:bool = False
+    _datagrams:int = 0
+
+
+    @property
+    def devices(self):
+        """_devices property"""
+        return self._devices
+
+    @property
+    def datagrams(self):
+        """amount of received datagrams"""
+        return self._datagrams
+
+    @property
+    def in_waiting(self):
+        """amount of bytes in the receive buffer"""
+        return len(self._rx)
+
+
+    def __init__(self, devices:List[TmcSim2209], baudrate:int = 115200, realtime:bool = False):
+        """constructor
+
+        Args:
+            devices (list): simulated drivers on the bus
+            baudrate (int): baudrate (Default value = 115200)
+            realtime (bool): whether the wire time is emulated (Default value = False)
+        """
+        self._devices = list(devices)
+        self._realtime = realtime
+        self._tx = bytearray()
+        self._rx = bytearray()
+        self._faults = deque()
+        self.port = "sim"
+        self.baudrate = baudrate
+        self.timeout = None
+        self.is_open = False
+
+
+    def open(self):
+        """open"""
+        self.is_open = True
+
+
+    def close(self):
+        """close"""
+        self.is_open = False
+
+
+    def inject_fault(self, fault:str, count:int = 1, skip:int = 0):
+        """disturbs the next datagrams to test the retry behavior
+
+        Args:
+            fault (str): "drop": the datagram does not reach the drivers;
+                "crc": the CRC of the reply is corrupted
+            count (int): amount of disturbed datagrams (Default value = 1)
+            skip (int): amount of undisturbed datagrams before the fault (Default value = 0)
+        """
+        if fault not in self.FAULTS:
+            raise TmcComException(f"unknown fault {fault}; must be one of {self.FAULTS}")
+        self._faults.extend([None] * skip + [fault] * count)
+
+
+    def write(self, data) -> int:
+        """sends data to the drivers
+
+        Args:
+            data (bytes): one or more datagrams
+
+        Returns:
+            int: amount of written bytes
+        """
+        self._rx += data
+        self._tx += data
+        wire_bits = 10 * len(data)
+        while len(self._tx) >= 4:
+            if self._tx[0] & 0x0F != 0x05:
+                # resynchronize on the next sync nibble
+                del self._tx[0]
+                continue
+            length = 8 if self._tx[2] & 0x80 else 4
+            if len(self._tx) < length:
+                break
+            datagram = bytes(self._tx[:length])
+            del self._tx[:length]
+            wire_bits += self._handle_datagram(datagram)
+        if self._realtime:
+            time.sleep(wire_bits / self.baudrate)
+        return len(data)
+
+
+    def _handle_datagram(self, datagram:bytes) -> int:
+        """passes one datagram to the drivers and queues the reply
+
+        Args:
+            datagram (bytes): datagram
+
+        Returns:
+            int: bit times of the reply
+        """
+        self._datagrams += 1
+        fault = self._faults.popleft() if self._faults else None
+        if fault == "drop":
+            return 0
+        for device in self._devices:
+            reply = device.handle_datagram(datagram)
+            if reply is None:
+                continue
+            if fault == "crc":
+                reply = reply[:-1] + bytes([reply[-1] ^ 0xFF])
+            self._rx += reply
+            return device.senddelay_bits + 10 * len(reply)
+        return 0
+
+
+    def read(self, size:int = 1) -> bytes:
+        """returns up to size received bytes
+
+        Args:
+            size (int): amount of bytes (Default value = 1)
+
+        Returns:
+            bytes: received bytes
+        """
+        data = bytes(self._rx[:size])
+        del self._rx[:size]
+        return data
+
+
+    def readinto(self, buffer) -> int:
+        """reads received bytes into the given buffer
+
+        Args:
+            buffer (bytearray): receive buffer
+
+        Returns:
+            int: amount of received bytes
+        """
+        size = min(len(buffer), len(self._rx))
+        buffer[:size] = self._rx[:size]
+        del self._rx[:size]
+        return size
+
+
+    def flush(self):
+        """flush"""
+
+
+    def reset_input_buffer(self):
+        """reset_input_buffer"""
+        self._rx.clear()
+
+
+    def reset_output_buffer(self):
+        """reset_output_buffer"""
+        self._tx.clear()
+
+
+
+class TmcSimSpiDev():
+    """TmcSimSpiDev
+
+    replacement for spidev.SpiDev, which is connected to one simulated TMC2240
+    or to several in a daisy chain (position 0 at MOSI, the last position at MISO)
+    """
+
+    _devices:List[TmcSim2240] = None
+    _transfers:int = 0
+
+
+    @property
+    def devices(self):
+        """_devices property"""
+        return self._devices
+
+    @property
+    def transfers(self):
+        """amount of transfers"""
+        return self._transfers
+
+
+    def __init__(self, devices:List[TmcSim2240]):
+        """constructor
+
+        Args:
+            devices (list): simulated drivers in the order of the chain
+        """
+        self._devices = list(devices)
+        self.max_speed_hz = 0
+        self.mode = 0
+        self.lsbfirst = False
+
+
+    def open(self, bus:int, device:int):
+        """open"""
+
+
+    def close(self):
+        """close"""
+
+
+    def xfer2(self, data:list) -> list:
+        """one transfer with one 5 byte datagram per driver
+
+        Args:
+            data (list): sent bytes
+
+        Returns:
+            list: received bytes
+        """
+        length = len(self._devices)
+        if len(data) != 5 * length:
+            raise TmcComException(f"expected {5 * length} bytes for {length} drivers, got {len(data)}")
+        self._transfers += 1
+        rx = [0] * len(data)
+        for position, device in enumerate(self._devices):
+            offset = (length - 1 - position) * 5
+            rx[offset:offset + 5] = device.handle_datagram(data[offset:offset + 5])
+        return rx
+
+
+
+class TmcSimPty():
+    """TmcSimPty
+
+    exposes simulated TMC2209 on a pseudo terminal, so that a real
+    serial.Serial can be opened with the path in port
+    """
+
+    _sim:TmcSimSerial = None
+    _master:int = None
+    _slave:int = None
+    _thread:threading.Thread = None
+    _running:bool = False
+
+
+    @property
+    def port(self):
+        """path of the pseudo terminal"""
+        return os.ttyname(self._slave)
+
+    @property
+    def sim(self):
+        """_sim property"""
+        return self._sim
+
+
+    def __init__(self, devices:List[TmcSim2209], baudrate:int = 115200, realtime:bool = True):
+        """constructor
+
+        Args:
+            devices (list): simulated drivers on the bus
+            baudrate (int): baudrate (Default value = 115200)
+            realtime (bool): whether the wire time is emulated (Default value = True)
+        """
+        self._sim = TmcSimSerial(devices, baudrate, realtime)
+        self._master, self._slave = os.openpty()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+
+    def __del__(self):
+        """destructor"""
+        self.close()
+
+
+    def close(self):
+        """stops the simulation and closes the pseudo terminal"""
+        if not self._running:
+            return
+        self._running = False
+        self._thread.join()
+        os.close(self._master)
+        os.close(self._slave)
+
+
+    def _run(self):
+        """answers the datagrams"""
+        while self._running:
+            readable, _, _ = select.select([self._master], [], [], 0.05)
+            if not readable:
+                continue
+            self._sim.write(os.read(self._master, 64))
+            if self._sim.in_waiting:
+                os.write(self._master, self._sim.read(self._sim.in_waiting))
@@ -0,0 +1,243 @@
+"""
+TmcSimMotor step timing module
+
+captures the STEP/DIR outputs of the Mock.GPIO backend with timestamps
+and reconstructs the movement of the motor from them, to measure
+the timing quality of the step loop without hardware
+"""
+
+import math
+import time
+from array import array
+from .._tmc_gpio_board import tmc_gpio
+from .._tmc_exceptions import TmcException
+
+
+class TmcGpioRecorder():
+    """TmcGpioRecorder
+
+    records every GPIO output as (perf_counter_ns, pin, level).
+    Only the Mock.GPIO backend supports recording.
+
+    Usage:
+        with TmcGpioRecorder() as recorder:
+            tmc.run_to_position_steps(400)
+        motor.feed(recorder.edges)
+    """
+
+    _gpio = None
+    _edges:list = None
+
+
+    @property
+    def edges(self):
+        """recorded outputs (perf_counter_ns, pin, level)"""
+        return self._edges
+
+
+    def __init__(self, gpio = None):
+        """constructor
+
+        Args:
+            gpio (BaseGPIOWrapper): GPIO backend (Default value = None, uses tmc_gpio)
+        """
+        self._gpio = tmc_gpio if gpio is None else gpio
+        self._edges = []
+
+
+    def __enter__(self):
+        """starts recording"""
+        self.start()
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """stops recording"""
+        self.stop()
+
+
+    def start(self):
+        """attaches the recorder to the GPIO backend"""
+        if not hasattr(self._gpio, "recorder"):
+            raise TmcException(f"{type(self._gpio).__name__} does not support recording; only Mock.GPIO does")
+        self._gpio.recorder = self
+
+
+    def stop(self):
+        """detaches the recorder from the GPIO backend"""
+        if getattr(self._gpio, "recorder", None) is self:
+            self._gpio.recorder = None
+
+
+    def record(self, pin:int, value:int):
+        """stores one output
+
+        Args:
+            pin (int): pin number
+            value (int): level
+        """
+        self._edges.append((time.perf_counter_ns(), pin, int(value)))
+
+
+    def clear(self):
+        """removes all recorded outputs"""
+        self._edges.clear()
+
+
+
+class TmcSimMotor():
+    """TmcSimMotor
+
+    motor model, which makes one step on every rising edge of the STEP pin
+    in the direction given by the DIR pin (HIGH = CW = positive).
+    Velocity and acceleration are derived from the step times.
+    """
+
+    _pin_step:int = None
+    _pin_dir:int = None
+    _step_level:int = 0
+    _dir_level:int = 1
+    _position:int = 0
+    _step_times:array = None            # time of every step in ns
+    _positions:array = None             # position after every step
+
+
+    @property
+    def position(self):
+        """_position property"""
+        return self._position
+
+    @property
+    def step_times(self):
+        """time of every step in ns (perf_counter_ns)"""
+        return self._step_times
+
+    @property
+    def positions(self):
+        """position after every step"""
+        return self._positions
+
+    @property
+    def velocities(self):
+        """velocity between step i-1 and step i in steps/s; the first entry is 0"""
+        times = self._step_times
+        pos = self._positions
+        velocities = array("d", [0.0] * len(times))
+        for i in range(1, len(times)):
+            velocities[i] = (pos[i] - pos[i - 1]) * 1e9 / max(times[i] - times[i - 1], 1)
+        return velocities
+
+    @property
+    def accelerations(self):
+        """acceleration between two velocities in steps/s²; the first two entries are 0"""
+        times = self._step_times
+        velocities = self.velocities
+        accelerations = array("d", [0.0] * len(times))
+        for i in range(2, len(times)):
+            # the velocities are located in the middle of their step intervals
+            accelerations[i] = (velocities[i] - velocities[i - 1]) * 2e9 / max(times[i] - times[i - 2], 1)
+        return accelerations
+
+
+    def __init__(self, pin_step:int, pin_dir:int, position:int = 0):
+        """constructor
+
+        Args:
+            pin_step (int): STEP pin
+            pin_dir (int): DIR pin
+            position (int): start position (Default value = 0)
+        """
+        self._pin_step = pin_step
+        self._pin_dir = pin_dir
+        self._position = position
+        self._step_times = array("q")
+        self._positions = array("q")
+
+
+    def feed(self, edges:list):
+        """moves the motor according to the recorded outputs
+
+        Args:
+            edges (list): recorded outputs (perf_counter_ns, pin, level)
+        """
+        for timestamp, pin, level in edges:
+            if pin == self._pin_dir:
+                self._dir_level = level
+            elif pin == self._pin_step:
+                if level and not self._step_level:
+                    self._position += 1 if self._dir_level else -1
+                    self._step_times.append(timestamp)
+                    self._positions.append(self._position)
+                self._step_level = level
+
+
+    def deviations(self, planned_intervals) -> tuple:
+        """compares the recorded steps with the planned intervals
+
+        the lateness is measured against the schedule, which starts with the first step
+        and restarts after a step, which is late by more than one interval (like TmcStepScheduler).
+
+        Args:
+            planned_intervals (list|float): planned step intervals in µs like TmcRampPlan.intervals
+                or one interval for a constant speed
+
+        Returns:
+            list: deviation of every step interval from the planned interval in µs
+            list: lateness of every step compared to the schedule in µs
+        """
+        times = self._step_times
+        if isinstance(planned_intervals, (int, float)):
+            planned_intervals = [planned_intervals] * len(times)
+        count = min(len(times), len(planned_intervals)) - 1
+        errors = []
+        lateness = []
+        deadline = times[0] / 1000 if times else 0.0
+        for i in range(1, count + 1):
+            errors.append((times[i] - times[i - 1]) / 1000 - planned_intervals[i])
+            deadline += planned_intervals[i]
+            late = times[i] / 1000 - deadline
+            lateness.append(late)
+            if late > planned_intervals[i]:
+                deadline = times[i] / 1000
+        return errors, lateness
+
+
+    def timing_stats(self, planned_intervals = None, tolerance:float = 100.0) -> dict:
+        """computes the timing quality of the recorded steps
+
+        the jitter is the deviation of the step intervals from the planned intervals.
+        A step misses its deadline, if it is later than tolerance compared to the schedule
+        (see deviations).
+
+        Args:
+            planned_intervals (list|float): planned step intervals in µs like TmcRampPlan.intervals
+                or one interval for a constant speed (Default value = None, no jitter and deadlines)
+            tolerance (float): lateness in µs, from which a step counts as missed (Default value = 100.0)
+
+        Returns:
+            dict: steps, position, min_interval_us, max_step_rate, jitter_rms_us, jitter_max_us,
+                missed_deadlines, max_lateness_us
+        """
+        times = self._step_times
+        intervals = [(times[i] - times[i - 1]) / 1000 for i in range(1, len(times))]
+        min_interval = min(intervals) if intervals else None
+        stats = {
+            "steps":            len(times),
+            "position":         self._position,
+            "min_interval_us":  min_interval,
+            "max_step_rate":    1e6 / min_interval if min_interval else None,
+            "jitter_rms_us":    None,
+            "jitter_max_us":    None,
+            "missed_deadlines": None,
+            "max_lateness_us":  None,
+        }
+        if planned_intervals is None:
+            return stats
+
+        errors, lateness = self.deviations(planned_intervals)
+        if errors:
+            stats["jitter_rms_us"] = math.sqrt(sum(e * e for e in errors) / len(errors))
+            stats["jitter_max_us"] = max(abs(e) for e in errors)
+            stats["missed_deadlines"] = sum(1 for late in lateness if late > tolerance)
+            stats["max_lateness_us"] = max(lateness)
+        return stats
@@ -22,6 +22,7 @@ import typing
 from ._tmc_stepperdriver import *
 from .com._tmc_com import TmcCom
 from .com._tmc_com_uart import TmcComUart
+from .com._tmc_uart_bus import TmcUartBus
 from .com._tmc_com_spi import TmcComSpi
 from .motion_control._tmc_mc_step_reg import TmcMotionControlStepReg
 from .enable_control._tmc_ec_toff import TmcEnableControlToff
@@ -99,6 +100,7 @@ class Tmc220x(TmcStepperDriver):
                 GStat,
                 IfCnt,
                 Ioin,
+                NodeConf,
                 IHoldIRun,
                 TPowerDown,
                 TStep,
@@ -396,8 +398,6 @@ class Tmc220x(TmcStepperDriver):
         rsense = 0.11
         vfs = 0
 
-        self.set_iscale_analog(False)
-
         vfs = 0.325
         cs_irun = 32.0*1.41421*run_current/1000.0*(rsense+0.02)/vfs - 1
 
@@ -406,10 +406,10 @@ class Tmc220x(TmcStepperDriver):
             self.tmc_logger.log("CS too low; switching to VSense True", Loglevel.INFO)
             vfs = 0.180
             cs_irun = 32.0*1.41421*run_current/1000.0*(rsense+0.02)/vfs - 1
-            self.set_vsense(True)
+            vsense = True
         else: # If CS >= 16, turn off high_senser
             self.tmc_logger.log("CS in range; using VSense False", Loglevel.INFO)
-            self.set_vsense(False)
+            vsense = False
 
         cs_irun = min(cs_irun, 31)
         cs_irun = max(cs_irun, 0)
@@ -429,9 +429,12 @@ class Tmc220x(TmcStepperDriver):
         self.tmc_logger.log(f"actual current: {round(run_current_actual)} mA",
                             Loglevel.INFO)
 
-        self._set_irun_ihold(cs_ihold, cs_irun, hold_current_delay)
-
-        self._set_pdn_disable(pdn_disable)
+        # all register writes are sent together and checked with one IFCNT read
+        with self.tmc_com.batch():
+            self.set_iscale_analog(False)
+            self.set_vsense(vsense)
+            self._set_irun_ihold(cs_ihold, cs_irun, hold_current_delay)
+            self._set_pdn_disable(pdn_disable)
 
 
 
@@ -536,11 +539,12 @@ class Tmc220x(TmcStepperDriver):
         if self.tmc_mc is not None:
             self.tmc_mc.mres = mres
 
-        self.chopconf.read()
-        self.chopconf.mres_ms = mres
-        self.chopconf.write_check()
+        with self.tmc_com.batch():
+            self.chopconf.read()
+            self.chopconf.mres_ms = mres
+            self.chopconf.write_check()
 
-        self.set_mstep_resolution_reg_select(True)
+            self.set_mstep_resolution_reg_select(True)
 
 
 
@@ -556,6 +560,21 @@ class Tmc220x(TmcStepperDriver):
 
 
 
+    def set_senddelay(self, senddelay:int):
+        """sets the delay, after which the driver answers a read access (NODECONF SENDDELAY)
+        and adjusts the UART timing to it.
+        0,1: 8; 2,3: 3*8; 4,5: 5*8; ... 14,15: 15*8 bit times.
+        Has to be >= 2, if multiple drivers share one UART.
+
+        Args:
+            senddelay (int): SENDDELAY setting [0-15]
+        """
+        self.nodeconf.senddelay = senddelay
+        self.nodeconf.write_check()
+        self.tmc_com.senddelay = senddelay
+
+
+
     def get_interface_transmission_counter(self) -> int:
         """reads the interface transmission counter from the tmc register
         this value is increased on every succesfull write access
@@ -577,8 +596,8 @@ class Tmc220x(TmcStepperDriver):
         Returns:
             int: TStep time
         """
-        self.chopconf.read()
-        return self.chopconf.tstep
+        self.tstep.read()
+        return self.tstep.tstep
 
 
 
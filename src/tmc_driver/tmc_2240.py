@@ -22,6 +22,7 @@ from ._tmc_stepperdriver import *
 from .com._tmc_com import TmcCom
 from .com._tmc_com_uart import TmcComUart
 from .com._tmc_com_spi import TmcComSpi
+from .com._tmc_spi_chain import TmcSpiChain
 from ._tmc_gpio_board import GpioPUD
 from .motion_control._tmc_mc_step_reg import TmcMotionControlStepReg
 from .enable_control._tmc_ec_toff import TmcEnableControlToff
@@ -569,6 +570,19 @@ class Tmc2240(TmcStepperDriver, StallGuard):
 
 
 
+    def read_status(self) -> tuple:
+        """reads DRV_STATUS, SG_RESULT, TSTEP and ADC_TEMP together.
+        Over SPI this takes 5 transfers instead of 8.
+
+        Returns:
+            tuple: DRV_STATUS, SG_RESULT, TSTEP and ADC_TEMP Register instances
+        """
+        registers = (self.drvstatus, self.sgresult, self.tstep, self.adc_temp)
+        read_registers(registers)
+        return registers
+
+
+
     def set_stallguard_callback(self, pin_stallguard, threshold, callback,
                                 min_speed = 100):
         """set a function to call back, when the driver detects a stall
@@ -0,0 +1,184 @@
+"""
+test for _tmc_async.py
+"""
+
+import asyncio
+import threading
+import unittest
+from unittest import mock
+from src.tmc_driver.tmc_2209 import *
+from src.tmc_driver.sim._tmc_sim_device import TmcSim2209
+from src.tmc_driver.sim._tmc_sim_io import TmcSimSerial, TmcSimPty
+
+
+class TestTmcAsync(unittest.TestCase):
+    """TestTmcAsync"""
+
+    def create_tmc(self, tmc_mc) -> Tmc2209:
+        """returns a Tmc2209 with a simulated driver"""
+        self.sim = TmcSim2209(0)
+        tmc_com = TmcComUart(None, 115200, 0, TmcLogger(Loglevel.ERROR))
+        tmc_com.ser = TmcSimSerial([self.sim])
+        tmc = Tmc2209(None, tmc_mc, tmc_com, loglevel=Loglevel.ERROR)
+        tmc.mres = 2
+        tmc.acceleration_fullstep = 100000
+        tmc.max_speed_fullstep = 10000
+        return tmc
+
+    def test_register(self):
+        """test_register"""
+        tmc = self.create_tmc(TmcMotionControlStepDir(16, 20))
+        tmc_async = TmcAsync(tmc)
+
+        async def main():
+            drvstatus = await tmc_async.read_register("drvstatus")
+            self.assertTrue(drvstatus.stst)
+            chopconf = await tmc_async.modify_register("chopconf", "toff", 5)
+            self.assertEqual(chopconf.toff, 5)
+        asyncio.run(main())
+        self.assertEqual(self.sim.registers[0x6C] & 0x0F, 5)
+        tmc.set_deinitialize_true()
+
+    def test_register_pty(self):
+        """test_register_pty"""
+        sim_pty = TmcSimPty([TmcSim2209(0)], 460800, realtime=False)
+        tmc_com = TmcComUart(sim_pty.port, 460800, 0, TmcLogger(Loglevel.ERROR))
+        tmc = Tmc2209(None, None, tmc_com, loglevel=Loglevel.ERROR)
+        tmc_async = TmcAsync(tmc)
+
+        async def main():
+            # concurrent accesses are serialized on the serial port
+            results = await asyncio.gather(*[tmc_async.com_async.read_int(0x6C) for _ in range(5)])
+            self.assertEqual(results, [(0x10000053, None)] * 5)
+            await tmc_async.com_async.write_reg_check(0x6C, 0x10000054)
+            self.assertEqual((await tmc_async.com_async.read_int(0x6C))[0], 0x10000054)
+        try:
+            asyncio.run(main())
+        finally:
+            tmc.set_deinitialize_true()
+            tmc_com.ser.close()
+            sim_pty.close()
+
+    def test_register_no_reader(self):
+        """test_register_no_reader"""
+        sim_pty = TmcSimPty([TmcSim2209(0)], 460800, realtime=True)
+        tmc_com = TmcComUart(sim_pty.port, 460800, 0, TmcLogger(Loglevel.ERROR))
+        tmc = Tmc2209(None, None, tmc_com, loglevel=Loglevel.ERROR)
+        tmc_async = TmcAsync(tmc)
+
+        async def main():
+            # e.g. the ProactorEventLoop on Windows has no add_reader
+            loop = asyncio.get_running_loop()
+            with mock.patch.object(loop, "add_reader", side_effect=NotImplementedError) as add_reader:
+                self.assertEqual(await tmc_async.com_async.read_int(0x6C), (0x10000053, None))
+            self.assertTrue(add_reader.called)
+        try:
+            asyncio.run(main())
+        finally:
+            tmc.set_deinitialize_true()
+            tmc_com.ser.close()
+            sim_pty.close()
+
+    def test_com_lock(self):
+        """test_com_lock"""
+        tmc = self.create_tmc(None)
+        tmc_async = TmcAsync(tmc)
+        locked = threading.Event()
+        release = threading.Event()
+
+        def hold_lock():
+            with tmc.tmc_com._lock:
+                locked.set()
+                release.wait(5)
+        thread = threading.Thread(target=hold_lock)
+        thread.start()
+        locked.wait(5)
+
+        async def main():
+            reads = self.sim.reads
+            task = asyncio.ensure_future(tmc_async.com_async.read_int(0x6C))
+            await asyncio.sleep(0.05)
+            self.assertFalse(task.done())
+            self.assertEqual(self.sim.reads, reads, "the serial port is used by the blocking com")
+            release.set()
+            self.assertEqual(await task, (0x10000053, None))
+        try:
+            asyncio.run(main())
+        finally:
+            release.set()
+            thread.join()
+            tmc.set_deinitialize_true()
+
+    def test_move_to(self):
+        """test_move_to"""
+        tmc = self.create_tmc(TmcMotionControlStepDir(16, 20))
+        tmc_async = TmcAsync(tmc)
+
+        async def main():
+            self.assertEqual(await tmc_async.move_to(400, MovementAbsRel.RELATIVE), StopMode.NO)
+            self.assertEqual(tmc.tmc_mc.current_pos, 400)
+
+            task = asyncio.create_task(tmc_async.move_to(100000, MovementAbsRel.RELATIVE))
+            while tmc.tmc_mc.current_pos == 400:
+                await asyncio.sleep(0.01)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            self.assertEqual(tmc.tmc_mc.movement_phase, MovementPhase.STANDSTILL)
+            self.assertLess(tmc.tmc_mc.current_pos, 100400)
+        asyncio.run(main())
+        tmc.set_deinitialize_true()
+
+    def test_move_to_vactual(self):
+        """test_move_to_vactual"""
+        tmc = self.create_tmc(TmcMotionControlVActual())
+        tmc.acceleration_fullstep = 2000
+        tmc.max_speed_fullstep = 500
+        tmc_async = TmcAsync(tmc)
+
+        async def main():
+            self.assertEqual(await tmc_async.move_to(400, MovementAbsRel.RELATIVE), StopMode.NO)
+            self.assertAlmostEqual(tmc.tmc_mc.current_pos, 400, delta=5)
+
+            task = asyncio.create_task(tmc_async.move_to(100000, MovementAbsRel.RELATIVE,
+                                                         cancel_mode=StopMode.SOFTSTOP))
+            await asyncio.sleep(0.2)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            self.assertGreater(tmc.tmc_mc.current_pos, 400)
+            self.assertEqual(tmc.tmc_mc.movement_phase, MovementPhase.STANDSTILL)
+        asyncio.run(main())
+        self.assertEqual(self.sim.registers[0x22], 0)
+        tmc.set_deinitialize_true()
+
+    def test_run_vactual(self):
+        """test_run_vactual"""
+        tmc = self.create_tmc(TmcMotionControlVActual())
+        tmc_async = TmcAsync(tmc)
+        tmc_async.VACTUAL_UPDATE_INTERVAL = 0.01
+        vactual_values = []
+
+        async def main():
+            async def record():
+                while True:
+                    vactual_values.append(self.sim.registers.get(0x22, 0))
+                    await asyncio.sleep(0.005)
+            recorder = asyncio.create_task(record())
+            self.assertEqual(await tmc_async.run_vactual(1000, 0.2, 20000), StopMode.NO)
+
+            task = asyncio.create_task(tmc_async.run_vactual(1000, 10, 20000, StopMode.SOFTSTOP))
+            await asyncio.sleep(0.1)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            recorder.cancel()
+        asyncio.run(main())
+        self.assertEqual(max(vactual_values), 1000)
+        self.assertEqual(self.sim.registers[0x22], 0)
+        self.assertGreater(len(set(vactual_values)), 5, "VACTUAL should be ramped")
+        tmc.set_deinitialize_true()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+"""
+test for _tmc_com.py
+"""
+
+import unittest
+from src.tmc_driver.com._tmc_com import compute_crc8_atm
+
+
+def compute_crc8_atm_bitwise(datagram, initial_value=0):
+    """bit by bit reference implementation"""
+    crc = initial_value
+    for byte in datagram:
+        for _ in range(0, 8):
+            if (crc >> 7) ^ (byte & 0x01):
+                crc = ((crc << 1) ^ 0x07) & 0xFF
+            else:
+                crc = (crc << 1) & 0xFF
+            byte = byte >> 1
+    return crc
+
+
+class TestTmcCom(unittest.TestCase):
+    """TestTmcCom"""
+
+    def test_compute_crc8_atm_exhaustive(self):
+        """the crc is updated byte by byte, so checking every crc state
+        with every byte covers all datagrams"""
+        for crc in range(256):
+            for byte in range(256):
+                self.assertEqual(compute_crc8_atm([byte], crc), compute_crc8_atm_bitwise([byte], crc),
+                                 f"crc differs for state {crc} and byte {byte}")
+
+    def test_compute_crc8_atm_bytes_like(self):
+        """test_compute_crc8_atm_bytes_like"""
+        frame = [0x05, 0xFF, 0x6F, 0xC0, 0x1E, 0x00, 0x00]
+        crc = compute_crc8_atm_bitwise(frame)
+        self.assertEqual(crc, 0xCA)
+        self.assertEqual(compute_crc8_atm(frame), crc)
+        self.assertEqual(compute_crc8_atm(bytes(frame)), crc)
+        self.assertEqual(compute_crc8_atm(bytearray(frame)), crc)
+        self.assertEqual(compute_crc8_atm(memoryview(bytes(frame))), crc)
+
+
+if __name__ == '__main__':
+    unittest.main()
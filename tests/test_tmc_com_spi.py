@@ -22,6 +22,24 @@ class TestTmcComSpi(unittest.TestCase):
             reg_ans, _ = self.tmc_uart.read_int(0x00)
             self.assertEqual(reg_ans, 94283625398474, "read_int is wrong")
 
+    def test_read_many(self):
+        """test_read_many"""
+        registers = {0x6F: 0x12345678, 0x12: 0x100, 0x51: 0x7FF}
+        previous = [0x00]
+        def xfer2(frame):
+            # the TMC2240 answers with the data requested by the previous datagram
+            val = registers.get(previous[0], 0)
+            previous[0] = frame[0]
+            return [0x00, val >> 24 & 0xFF, val >> 16 & 0xFF, val >> 8 & 0xFF, val & 0xFF]
+        self.tmc_uart.spi = mock.Mock()
+        self.tmc_uart.spi.xfer2.side_effect = xfer2
+
+        result = self.tmc_uart.read_many([0x6F, 0x12, 0x51])
+        self.assertEqual([val for val, _ in result], [0x12345678, 0x100, 0x7FF])
+        self.assertEqual(self.tmc_uart.spi.xfer2.call_count, 4, "N registers should take N+1 transfers")
+
+        self.assertEqual(self.tmc_uart.read_int(0x12)[0], 0x100)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -2,10 +2,16 @@
 test for _tmc_com_uart.py
 """
 
+import sys
+import threading
 import unittest
 from unittest import  mock
 from src.tmc_driver._tmc_logger import *
 from src.tmc_driver.com._tmc_com_uart import *
+from src.tmc_driver.reg._tmc220x_reg import IfCnt
+from src.tmc_driver.tmc_2209 import Tmc2209
+from src.tmc_driver.sim._tmc_sim_device import TmcSim2209
+from src.tmc_driver.sim._tmc_sim_io import TmcSimSerial
 
 
 class TestTmcComUart(unittest.TestCase):
@@ -16,6 +22,12 @@ class TestTmcComUart(unittest.TestCase):
         self.tmc_logger = TmcLogger()
         self.tmc_uart = TmcComUart(None, 115200, 0, self.tmc_logger)
 
+    def test_ser_per_instance(self):
+        """test_ser_per_instance"""
+        tmc_uart2 = TmcComUart(None, 115200, 1, self.tmc_logger)
+        self.assertIsNot(self.tmc_uart.ser, tmc_uart2.ser)
+        self.assertIsNot(self.tmc_uart._lock, tmc_uart2._lock)
+
     def test_read_int(self):
         """test_read_int"""
         self.tmc_uart.ser = 1 # to avoid early return, due to ser being None
@@ -23,6 +35,114 @@ class TestTmcComUart(unittest.TestCase):
             reg_ans, _ = self.tmc_uart.read_int(0x00)
             self.assertEqual(reg_ans, -1071775744, "read_int is wrong")
 
+    def test_read_reg_buffer(self):
+        """test_read_reg_buffer"""
+        reply = b'U\x00o\x03\x05\xffo\xc0\x1e\x00\x00\xca'
+        def readinto(buffer):
+            buffer[:len(reply)] = reply
+            return len(reply)
+        self.tmc_uart.ser = mock.Mock()
+        self.tmc_uart.ser.write.side_effect = len
+        self.tmc_uart.ser.readinto.side_effect = readinto
+
+        r_frame = self.tmc_uart.r_frame
+        reg_ans, _ = self.tmc_uart.read_int(0x6F)
+        self.assertEqual(reg_ans, -1071775744, "read_int is wrong")
+        self.assertIs(self.tmc_uart.ser.write.call_args[0][0], r_frame, "the read frame should be reused")
+        self.assertEqual(bytes(r_frame), bytes([0x55, 0x00, 0x6F, compute_crc8_atm([0x55, 0x00, 0x6F])]))
+
+    def test_senddelay(self):
+        """test_senddelay"""
+        self.tmc_uart.ser = mock.Mock()
+        self.tmc_uart.ser.baudrate = 115200
+        self.tmc_uart.senddelay = 0
+        self.assertAlmostEqual(self.tmc_uart.communication_pause, 8 / 115200)
+        self.tmc_uart.senddelay = 2
+        self.assertAlmostEqual(self.tmc_uart.communication_pause, 3 * 8 / 115200)
+        self.tmc_uart.senddelay = 15
+        self.assertAlmostEqual(self.tmc_uart.communication_pause, 15 * 8 / 115200)
+
+    def test_batch(self):
+        """test_batch"""
+        self.tmc_uart.ser = mock.Mock()
+        self.tmc_uart.ser.write.side_effect = len
+        self.tmc_uart.tmc_registers = {"ifcnt": IfCnt(self.tmc_uart)}
+        with mock.patch.object(TmcComUart, 'read_reg', side_effect=[
+                (b'U\x00o\x03\x05\xff\x02\x00\x00\x00\x05\x25', None),
+                (b'U\x00o\x03\x05\xff\x02\x00\x00\x00\x08\x3c', None)]) as read_reg:
+            with self.tmc_uart.batch():
+                self.tmc_uart.write_reg_check(0x00, 0x1C0)
+                self.tmc_uart.write_reg_check(0x10, 0x1F10)
+                self.tmc_uart.write_reg_check(0x00, 0x1C1)
+                self.tmc_uart.write_reg_check(0x6C, 0x10000053)
+                self.assertEqual(self.tmc_uart.read_int(0x00), (0x1C1, None),
+                                 "a pending write should be read back")
+                self.tmc_uart.ser.write.assert_not_called()
+
+            self.tmc_uart.ser.write.assert_called_once()
+            frames = self.tmc_uart.ser.write.call_args[0][0]
+            self.assertEqual(len(frames), 3 * 8, "writes to the same register should be merged")
+            self.assertEqual(bytes(frames[0:8]), bytes([0x55, 0x00, 0x80, 0x00, 0x00, 0x01, 0xC1,
+                                                        compute_crc8_atm(frames[0:7])]))
+            self.assertEqual(read_reg.call_count, 2, "IFCNT should only be read before and after the batch")
+
+
+    def test_batch_abort(self):
+        """test_batch_abort"""
+        sim = TmcSim2209(0)
+        tmc_com = TmcComUart(None, 115200, 0, TmcLogger(Loglevel.ERROR))
+        tmc_com.ser = TmcSimSerial([sim])
+        tmc = Tmc2209(None, None, tmc_com, loglevel=Loglevel.ERROR)
+        tmc.set_register_cache(True)
+        ihold_irun = sim.registers[0x10]
+
+        with self.assertRaises(RuntimeError):
+            with tmc_com.batch():
+                tmc.set_current(300)
+                raise RuntimeError("abort")
+        self.assertEqual(sim.registers[0x10], ihold_irun, "the batch should be discarded")
+        self.assertFalse(tmc.ihold_irun.cached)
+        tmc.set_current(300)
+        self.assertNotEqual(sim.registers[0x10], ihold_irun)
+
+        # a batch, which cannot be written, invalidates the cache too
+        ihold_irun = sim.registers[0x10]
+        with mock.patch.object(TmcComUart, '_write_batch', return_value=False):
+            with tmc_com.batch():
+                tmc.set_current(600)
+        self.assertEqual(sim.registers[0x10], ihold_irun)
+        self.assertFalse(tmc.ihold_irun.cached)
+        tmc.set_deinitialize_true()
+
+
+    def test_read_int_threads(self):
+        """test_read_int_threads"""
+        sim = TmcSim2209(0)
+        sim.registers[0x41] = 0x155
+        tmc_com = TmcComUart(None, 115200, 0, TmcLogger(Loglevel.ERROR))
+        tmc_com.ser = TmcSimSerial([sim])
+        errors = []
+
+        def read(addr, expected):
+            for _ in range(2000):
+                val, _ = tmc_com.read_int(addr)
+                if val != expected:
+                    errors.append((addr, val))
+
+        threads = [threading.Thread(target=read, args=(0x6C, 0x10000053)),
+                   threading.Thread(target=read, args=(0x41, 0x155))]
+        # switch threads as often as possible, to hit the gap after the reply is received
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+        self.assertEqual(errors, [], "a reply should not be overwritten by another thread")
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,56 @@
+"""
+test for _tmc_mc_group.py
+"""
+
+import time
+import unittest
+from src.tmc_driver.tmc_2209 import *
+
+class TestTMCMotionGroup(unittest.TestCase):
+    """TestTMCMotionGroup"""
+
+    def setUp(self):
+        """setUp"""
+        self.tmc1 = Tmc2209(None, TmcMotionControlStepDir(16, 20))
+        self.tmc2 = Tmc2209(None, TmcMotionControlStepDir(13, 19))
+
+        for tmc in [self.tmc1, self.tmc2]:
+            # these values are normally set by reading the driver
+            tmc.mres = 2
+
+            tmc.acceleration_fullstep = 100000
+            tmc.max_speed_fullstep = 10000
+            tmc.movement_abs_rel = MovementAbsRel.ABSOLUTE
+
+        self.group = TmcMotionGroup([self.tmc1.tmc_mc, self.tmc2.tmc_mc])
+
+    def tearDown(self):
+        """tearDown"""
+        self.tmc1.set_deinitialize_true()
+        self.tmc2.set_deinitialize_true()
+
+    def test_run_to_position_steps(self):
+        """test_run_to_position_steps"""
+        self.group.run_to_position_steps([400, 100], MovementAbsRel.RELATIVE)
+        self.assertEqual(self.group.current_pos, [400, 100])
+
+        self.group.run_to_position_steps([-200, 300])
+        self.assertEqual(self.group.current_pos, [-200, 300])
+
+        self.group.run_to_position_steps([-200, 0])
+        self.assertEqual(self.group.current_pos, [-200, 0])
+        self.assertEqual(self.tmc2.tmc_mc.movement_phase, MovementPhase.STANDSTILL)
+
+    def test_softstop(self):
+        """test_softstop"""
+        self.group.run_to_position_steps_threaded([4000, 2000])
+        time.sleep(0.05)
+        self.group.stop(StopMode.SOFTSTOP)
+        self.group.wait_for_movement_finished_threaded()
+        pos1, pos2 = self.group.current_pos
+        self.assertTrue(0 < pos1 < 4000, f"actual position: {pos1}, expected position: 0 < pos < 4000")
+        self.assertTrue(abs(pos1 - 2 * pos2) <= 1, f"axes not on a line: {pos1}, {pos2}")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,29 @@
+"""
+test for _tmc_logger.py
+"""
+
+import logging
+import unittest
+from src.tmc_driver._tmc_logger import TmcLogger, Loglevel
+
+class TestTMCLogger(unittest.TestCase):
+    """TestTMCLogger"""
+
+    def test_movement_enabled(self):
+        """test_movement_enabled"""
+        tmc_logger = TmcLogger(Loglevel.INFO, "TMC_TEST", [logging.NullHandler()])
+        self.assertFalse(tmc_logger.movement_enabled)
+
+        tmc_logger.loglevel = Loglevel.MOVEMENT
+        self.assertTrue(tmc_logger.movement_enabled)
+        tmc_logger.loglevel = Loglevel.ALL
+        self.assertTrue(tmc_logger.movement_enabled)
+        tmc_logger.loglevel = Loglevel.DEBUG
+        self.assertFalse(tmc_logger.movement_enabled)
+        tmc_logger.loglevel = Loglevel.NONE
+        self.assertFalse(tmc_logger.movement_enabled)
+        self.assertFalse(tmc_logger.is_enabled(Loglevel.ERROR))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -16,6 +16,11 @@ class TestTMCMath(unittest.TestCase):
         """test_vactual_to_rps"""
         self.assertEqual(round(tmc_math.vactual_to_rps(559,400)), 1, "vactual_to_rps is wrong")
 
+    def test_steps_to_vactual(self):
+        """test_steps_to_vactual"""
+        self.assertEqual(tmc_math.steps_to_vactual(400), 559, "steps_to_vactual is wrong")
+        self.assertEqual(round(tmc_math.vactual_to_steps(559)), 400, "vactual_to_steps is wrong")
+
     def test_rps_to_steps(self):
         """test_rps_to_steps"""
         self.assertEqual(round(tmc_math.rps_to_steps(1,400)), 400, "rps_to_steps is wrong")
@@ -31,6 +36,8 @@ class TestTMCMath(unittest.TestCase):
     def test_steps_to_tstep(self):
         """test_steps_to_tstep"""
         self.assertEqual(round(tmc_math.steps_to_tstep(400,2)), 234, "steps_to_tstep is wrong")
+        self.assertEqual(round(tmc_math.tstep_to_steps(234,2)), 401, "tstep_to_steps is wrong")
+        self.assertEqual(tmc_math.tstep_to_steps(0xFFFFF,2), 0, "tstep_to_steps is wrong")
 
     def test_constrain(self):
         """test_constrain"""
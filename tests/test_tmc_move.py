@@ -97,5 +97,37 @@ class TestTMCMove(unittest.TestCase):
         print(f"motorposition: {pos}")
         self.assertTrue(400 < pos < 800, f"actual position: {pos}, expected position: 400 < pos < 800")
 
+    def test_move_stats(self):
+        """test_move_stats"""
+        tmc_mc = self.tmc.tmc_mc
+        self.tmc.run_to_position_steps(100, MovementAbsRel.RELATIVE)
+        self.assertIsNone(tmc_mc.last_move_stats)
+
+        received = []
+        tmc_mc.move_stats_callback = received.append
+        self.assertTrue(tmc_mc.move_stats_enabled)
+        self.tmc.run_to_position_steps(400, MovementAbsRel.RELATIVE)
+        stats = tmc_mc.last_move_stats
+        self.assertEqual(received, [stats])
+        self.assertEqual(stats.steps_commanded, 400)
+        self.assertEqual(stats.steps_made, 400)
+        self.assertEqual(sum(stats.error_histogram), 399)
+        self.assertEqual(stats.stop_mode, StopMode.NO)
+        self.assertGreater(stats.planned_duration_us, 0)
+        self.assertGreater(stats.actual_duration_us, 0)
+        self.assertEqual(stats.as_dict()["stop_mode"], "NO")
+
+        tmc_mc.run_to_position_steps_threaded(-2000, MovementAbsRel.RELATIVE)
+        time.sleep(0.05)
+        tmc_mc.stop()
+        tmc_mc.wait_for_movement_finished_threaded()
+        stats = tmc_mc.last_move_stats
+        self.assertEqual(stats.stop_mode, StopMode.HARDSTOP)
+        self.assertLess(stats.steps_made, 2000)
+        self.assertEqual(len(received), 2)
+
+        tmc_mc.move_stats_callback = None
+        tmc_mc.move_stats_enabled = False
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,76 @@
+"""
+test for _tmc_mc_queue.py
+"""
+
+import unittest
+from src.tmc_driver.tmc_2209 import *
+
+class TestTMCMoveQueue(unittest.TestCase):
+    """TestTMCMoveQueue"""
+
+    def setUp(self):
+        """setUp"""
+        self.tmc = Tmc2209(None, TmcMotionControlStepDir(16, 20))
+
+        # these values are normally set by reading the driver
+        self.tmc.mres = 2
+
+        self.tmc.acceleration_fullstep = 20000
+        self.tmc.max_speed_fullstep = 5000
+        self.tmc.movement_abs_rel = MovementAbsRel.RELATIVE
+
+        self.queue = TmcMoveQueue(self.tmc.tmc_mc)
+
+    def tearDown(self):
+        """tearDown"""
+        self.tmc.set_deinitialize_true()
+
+    def test_run(self):
+        """test_run"""
+        for steps in [100, 100, 100, -300, 50]:
+            self.queue.add(steps)
+        self.assertEqual(len(self.queue), 5)
+        self.queue.run()
+        pos = self.tmc.tmc_mc.current_pos
+        self.assertEqual(pos, 50, f"actual position: {pos}, expected position: 50")
+        self.assertEqual(len(self.queue), 0)
+
+    def test_stop(self):
+        """test_stop"""
+        for steps in [100, 100]:
+            self.queue.add(steps)
+        self.queue.stop()
+        self.assertEqual(len(self.queue), 0, "stop should clear the queue, even if it is not running")
+
+    def test_blending_is_faster(self):
+        """test_blending_is_faster"""
+        # the planned durations are compared, so that the test does not depend on the step timing
+        planned = []
+        self.tmc.tmc_mc.move_stats_callback = lambda stats: planned.append(stats.planned_duration_us)
+
+        self.tmc.run_to_position_steps(1000)
+        single = sum(planned)
+
+        for _ in range(10):
+            self.queue.add(100)
+        self.assertGreater(self.queue._compute_exit_speed(0.0), 0, "the junction speed should be > 0")
+        planned.clear()
+        self.queue.run()
+        blended = sum(planned)
+
+        self.queue.lookahead = 1
+        for _ in range(10):
+            self.queue.add(100)
+        self.assertEqual(self.queue._compute_exit_speed(0.0), 0, "without lookahead every movement should stop")
+        planned.clear()
+        self.queue.run()
+        stopping = sum(planned)
+
+        pos = self.tmc.tmc_mc.current_pos
+        self.assertEqual(pos, 3000, f"actual position: {pos}, expected position: 3000")
+        self.assertLess(blended, single * 1.2, "blended movements should not stop in between")
+        self.assertLess(blended, stopping, "blended movements should be faster than stopping ones")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+"""
+test for _tmc_mc_ramp.py
+"""
+
+import unittest
+from src.tmc_driver.tmc_2209 import *
+from src.tmc_driver.motion_control import _tmc_mc_ramp as tmc_ramp
+
+class TestTMCRamp(unittest.TestCase):
+    """TestTMCRamp"""
+
+    def setUp(self):
+        """setUp"""
+        self.tmc = Tmc2209(None, TmcMotionControlStepDir(16, 20))
+
+        # these values are normally set by reading the driver
+        self.tmc.mres = 2
+
+        self.tmc.acceleration_fullstep = 1000
+        self.tmc.max_speed_fullstep = 250
+
+    def tearDown(self):
+        """tearDown"""
+        self.tmc.set_deinitialize_true()
+
+    def legacy_intervals(self, distance):
+        """step intervals as computed step by step by compute_new_speed"""
+        tmc_mc = self.tmc.tmc_mc
+        tmc_mc.current_pos = 0
+        tmc_mc._target_pos = distance
+        tmc_mc._speed = 0.0
+        tmc_mc._n = 0
+        intervals = []
+        tmc_mc.compute_new_speed()
+        while tmc_mc.distance_to_go() != 0:
+            intervals.append(round(tmc_mc._step_interval))
+            tmc_mc._current_pos += 1
+            tmc_mc.compute_new_speed()
+        return intervals
+
+    def test_compute_ramp_equals_compute_new_speed(self):
+        """test_compute_ramp_equals_compute_new_speed"""
+        tmc_mc = self.tmc.tmc_mc
+        for distance in [1, 2, 3, 10, 101, 400, 5000]:
+            plan = tmc_ramp.compute_ramp(distance, tmc_mc.max_speed, tmc_mc.acceleration)
+            self.assertEqual(list(plan.intervals), self.legacy_intervals(distance),
+                             f"ramp differs for distance {distance}")
+
+    def test_compute_ramp_phases(self):
+        """test_compute_ramp_phases"""
+        tmc_mc = self.tmc.tmc_mc
+        plan = tmc_ramp.compute_ramp(5000, tmc_mc.max_speed, tmc_mc.acceleration)
+        cmin = round(1000000 / tmc_mc.max_speed)
+        self.assertTrue(0 < plan.cruise_start < plan.decel_start < len(plan))
+        self.assertEqual(plan.intervals[plan.cruise_start], cmin)
+        self.assertTrue(plan.intervals[plan.decel_start] > cmin)
+
+    def test_compute_ramp_cached(self):
+        """test_compute_ramp_cached"""
+        plan1 = tmc_ramp.compute_ramp(400, 500, 2000)
+        plan2 = tmc_ramp.compute_ramp(400, 500, 2000)
+        self.assertIs(plan1, plan2)
+
+    def test_compute_scurve_ramp(self):
+        """test_compute_scurve_ramp"""
+        for distance in [1, 10, 101, 5000]:
+            plan = tmc_ramp.compute_scurve_ramp(distance, 500, 2000, 20000)
+            self.assertEqual(len(plan), distance)
+            # acceleration and deceleration are mirrored
+            intervals = list(plan.intervals)
+            for i in range(distance // 2):
+                self.assertAlmostEqual(intervals[i], intervals[distance - 1 - i], delta=2)
+
+        plan = tmc_ramp.compute_scurve_ramp(5000, 500, 2000, 20000)
+        self.assertTrue(0 < plan.cruise_start < plan.decel_start < len(plan))
+        self.assertAlmostEqual(plan.intervals[plan.cruise_start], 2000, delta=1)
+
+    def test_scurve_invalid(self):
+        """test_scurve_invalid"""
+        with self.assertRaises(TmcMotionControlException):
+            TmcRampSCurve(0)
+        for max_speed, acceleration, jerk in [(0, 2000, 20000), (500, 0, 20000), (500, 2000, 0)]:
+            with self.assertRaises(TmcMotionControlException):
+                tmc_ramp.compute_scurve_ramp(100, max_speed, acceleration, jerk)
+        self.assertEqual(len(tmc_ramp.compute_scurve_ramp(0, 500, 2000, 20000)), 0)
+
+    def test_min_interval(self):
+        """test_min_interval"""
+        # a max speed above 1 MHz would round the intervals to 0
+        self.assertGreaterEqual(min(tmc_ramp.compute_ramp(2000, 3000000, 1e12, 0, 0).intervals), 1)
+        self.assertGreaterEqual(min(tmc_ramp.compute_scurve_ramp(2000, 3000000, 1e12, 1e18).intervals), 1)
+        self.assertGreaterEqual(min(tmc_ramp.compute_stop_ramp(0.3, 1e12, 100)), 1)
+
+    def test_run_scurve(self):
+        """test_run_scurve"""
+        self.tmc.tmc_mc.max_speed_fullstep = 2000
+        self.tmc.tmc_mc.acceleration_fullstep = 20000
+        self.tmc.run_to_position_steps(400, MovementAbsRel.RELATIVE, TmcRampSCurve(200000))
+        self.assertEqual(self.tmc.tmc_mc.current_pos, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+"""
+test for _tmc_reg.py
+"""
+
+import unittest
+from unittest import mock
+from src.tmc_driver.reg._tmc220x_reg import *
+from src.tmc_driver._tmc_exceptions import TmcComException
+
+
+class TestTmcReg(unittest.TestCase):
+    """TestTmcReg"""
+
+    def setUp(self):
+        """setUp"""
+        self.tmc_com = mock.Mock()
+        self.tmc_com.read_int.return_value = (0x00001F10, None)
+        self.ihold_irun = IHoldIRun(self.tmc_com)
+        self.gstat = GStat(self.tmc_com)
+        self.tmc_com.tmc_registers = {"ihold_irun": self.ihold_irun, "gstat": self.gstat}
+
+    def test_without_cache(self):
+        """test_without_cache"""
+        self.ihold_irun.modify("irun", 31)
+        self.ihold_irun.modify("irun", 31)
+        self.assertEqual(self.tmc_com.read_int.call_count, 2)
+        self.assertEqual(self.tmc_com.write_reg_check.call_count, 2)
+
+    def test_cache(self):
+        """test_cache"""
+        self.ihold_irun.cache_enabled = True
+        self.gstat.cache_enabled = True
+        self.assertFalse(self.gstat.cache_enabled, "status registers must not be cached")
+
+        self.ihold_irun.modify("irun", 31)
+        self.ihold_irun.modify("irun", 31)
+        self.assertEqual(self.tmc_com.read_int.call_count, 1)
+        self.tmc_com.write_reg_check.assert_not_called()
+
+        self.ihold_irun.modify("irun", 20)
+        self.ihold_irun.modify("ihold", 10)
+        self.assertEqual(self.tmc_com.read_int.call_count, 1)
+        self.assertEqual(self.tmc_com.write_reg_check.call_count, 2)
+        self.assertEqual(self.ihold_irun.data_int, 0x0000140A)
+
+        self.ihold_irun.read(force=True)
+        self.assertEqual(self.tmc_com.read_int.call_count, 2)
+
+    def test_cache_failed_write(self):
+        """test_cache_failed_write"""
+        self.ihold_irun.cache_enabled = True
+        self.ihold_irun.read()
+        self.tmc_com.write_reg_check.return_value = False
+        self.ihold_irun.modify("irun", 20)
+        self.assertFalse(self.ihold_irun.cached, "a failed write must not be cached")
+
+        self.ihold_irun.read()
+        self.tmc_com.write_reg_check.side_effect = TmcComException("no answer")
+        with self.assertRaises(TmcComException):
+            self.ihold_irun.modify("irun", 20)
+        self.assertFalse(self.ihold_irun.cached)
+
+    def test_cache_invalidate_on_reset(self):
+        """test_cache_invalidate_on_reset"""
+        self.ihold_irun.cache_enabled = True
+        self.ihold_irun.read()
+        self.assertTrue(self.ihold_irun.cached)
+
+        self.tmc_com.read_int.return_value = (0x0, None)
+        self.gstat.read()
+        self.assertTrue(self.ihold_irun.cached)
+
+        self.tmc_com.read_int.return_value = (0x1, None)
+        self.gstat.read()
+        self.assertFalse(self.ihold_irun.cached)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+"""
+test for _tmc_mc_scheduler.py
+"""
+
+import time
+import unittest
+from src.tmc_driver.motion_control._tmc_mc_scheduler import TmcStepScheduler
+
+class TestTMCStepScheduler(unittest.TestCase):
+    """TestTMCStepScheduler"""
+
+    def setUp(self):
+        """setUp"""
+        self.scheduler = TmcStepScheduler()
+
+    def test_wait(self):
+        """test_wait"""
+        # the interval is long, so that a late wakeup on a loaded machine does not restart the schedule
+        start = self.scheduler.start()
+        for _ in range(5):
+            self.scheduler.advance(20000)
+            while not self.scheduler.wait():
+                pass
+            self.assertGreaterEqual(time.perf_counter_ns(), self.scheduler.deadline)
+        self.assertEqual(self.scheduler.deadline, start + 5 * 20000000,
+                         "deadlines should not accumulate lateness")
+
+    def test_advance_resync(self):
+        """test_advance_resync"""
+        start = self.scheduler.start()
+        time.sleep(0.01)
+        deadline = self.scheduler.advance(1000)
+        self.assertGreaterEqual(deadline, start + 10000000,
+                                "a late schedule should restart at the current time")
+
+
+if __name__ == '__main__':
+    unittest.main()
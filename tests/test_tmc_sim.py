@@ -0,0 +1,90 @@
+"""
+test for the driver simulation
+"""
+
+import unittest
+from src.tmc_driver.tmc_2209 import *
+from src.tmc_driver.tmc_2240 import *
+from src.tmc_driver.sim._tmc_sim_device import TmcSim2209, TmcSim2240
+from src.tmc_driver.sim._tmc_sim_io import TmcSimSerial, TmcSimSpiDev, TmcSimPty
+
+
+class TestTmcSim(unittest.TestCase):
+    """TestTmcSim"""
+
+    def test_uart(self):
+        """test_uart"""
+        sim = TmcSim2209(0)
+        tmc_com = TmcComUart(None, 115200, 0, TmcLogger(Loglevel.ERROR))
+        tmc_com.ser = TmcSimSerial([sim, TmcSim2209(1)])
+        tmc = Tmc2209(None, TmcMotionControlStepDir(16, 20), tmc_com, loglevel=Loglevel.ERROR)
+
+        self.assertEqual(tmc.tmc_mc.steps_per_rev, 51200, "the microstep resolution should be read from the driver")
+        tmc.set_current(800)
+        self.assertEqual(sim.registers[0x10] >> 8 & 0x1F, 25, "IRUN should be written to the driver")
+        self.assertEqual(tmc_com.ser.devices[1].writes, 0, "other node addresses should ignore the datagrams")
+        tmc.set_deinitialize_true()
+
+    def test_uart_ioin(self):
+        """test_uart_ioin"""
+        sim = TmcSim2209(0)
+        tmc_com = TmcComUart(None, 115200, 0, TmcLogger(Loglevel.ERROR))
+        tmc_com.ser = TmcSimSerial([sim])
+        tmc = Tmc2209(None, None, tmc_com, loglevel=Loglevel.ERROR)
+
+        ioin = tmc.read_ioin()
+        self.assertEqual(ioin.addr, 0x06)
+        self.assertEqual(ioin.version, 0x21, "IOIN should be read from 0x06, not from NODECONF")
+        self.assertEqual(ioin.data_int, sim.registers[0x06])
+        tmc.set_deinitialize_true()
+
+    def test_uart_retry(self):
+        """test_uart_retry"""
+        sim = TmcSim2209(0)
+        tmc_com = TmcComUart(None, 115200, 0, TmcLogger(Loglevel.NONE))
+        tmc_com.ser = TmcSimSerial([sim])
+        tmc_com.tmc_registers = {"ifcnt": IfCnt(tmc_com)}
+
+        tmc_com.ser.inject_fault("crc", 2)
+        self.assertEqual(tmc_com.read_int(0x6C)[0], 0x10000053)
+        self.assertEqual(tmc_com.ser.datagrams, 3, "a corrupted reply should be read again")
+
+        # IFCNT read, write (lost), IFCNT read, write, IFCNT read
+        tmc_com.ser.inject_fault("drop", skip=1)
+        self.assertTrue(tmc_com.write_reg_check(0x00, 0x1C0))
+        self.assertEqual(sim.registers[0x00], 0x1C0)
+        self.assertEqual(sim.registers[0x02], 1, "the lost write should be repeated")
+
+    def test_spi(self):
+        """test_spi"""
+        sim = TmcSim2240()
+        tmc_com = TmcComSpi(0, 0)
+        tmc_com.spi = TmcSimSpiDev([sim])
+        tmc = Tmc2240(None, TmcMotionControlStepDir(16, 20), tmc_com, loglevel=Loglevel.ERROR)
+
+        drvstatus, _, tstep, adc_temp = tmc.read_status()
+        self.assertTrue(drvstatus.stst)
+        self.assertEqual(tstep.tstep, 0xFFFFF)
+        self.assertAlmostEqual(adc_temp.adc_temp_c, 25.0, delta=0.2)
+
+        sim.reset()
+        with self.assertRaises(TmcDriverException):
+            tmc.read_ioin()
+        tmc.set_deinitialize_true()
+
+    def test_pty(self):
+        """test_pty"""
+        sim_pty = TmcSimPty([TmcSim2209(0)], 460800, realtime=False)
+        tmc_com = TmcComUart(sim_pty.port, 460800, 0, TmcLogger(Loglevel.ERROR))
+        try:
+            tmc_com.init()
+            self.assertEqual(tmc_com.read_int(0x6C)[0], 0x10000053)
+            tmc_com.write_reg(0x6C, 0x10000054)
+            self.assertEqual(tmc_com.read_int(0x6C)[0], 0x10000054)
+        finally:
+            tmc_com.ser.close()
+            sim_pty.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+"""
+test for _tmc_sim_motor.py
+"""
+
+import unittest
+from src.tmc_driver.tmc_2209 import *
+from src.tmc_driver.motion_control._tmc_mc_ramp import compute_ramp
+from src.tmc_driver.sim._tmc_sim_motor import TmcGpioRecorder, TmcSimMotor
+
+
+class TestTmcSimMotor(unittest.TestCase):
+    """TestTmcSimMotor"""
+
+    def test_model(self):
+        """test_model"""
+        motor = TmcSimMotor(16, 20)
+        # two steps CW 1 ms apart, one step CCW 0.5 ms later
+        motor.feed([(0, 20, 1), (0, 16, 1), (1000, 16, 0),
+                    (1000000, 16, 1), (1001000, 16, 0),
+                    (1200000, 20, 0), (1500000, 16, 1), (1501000, 16, 0)])
+        self.assertEqual(motor.position, 1)
+        self.assertEqual(list(motor.positions), [1, 2, 1])
+        self.assertEqual(list(motor.velocities), [0.0, 1000.0, -2000.0])
+        self.assertAlmostEqual(motor.accelerations[2], -3000.0 / 0.00075)
+
+        stats = motor.timing_stats([0, 1000, 400], tolerance=50)
+        self.assertEqual(stats["steps"], 3)
+        self.assertEqual(stats["max_step_rate"], 2000.0)
+        self.assertEqual(stats["jitter_max_us"], 100.0)
+        self.assertEqual(stats["missed_deadlines"], 1)
+        self.assertEqual(stats["max_lateness_us"], 100.0)
+
+    def test_record_movement(self):
+        """test_record_movement"""
+        tmc = Tmc2209(None, TmcMotionControlStepDir(16, 20), loglevel=Loglevel.ERROR)
+        tmc.acceleration_fullstep = 1000
+        tmc.max_speed_fullstep = 250
+        tmc_mc = tmc.tmc_mc
+
+        motor = TmcSimMotor(16, 20)
+        with TmcGpioRecorder() as recorder:
+            tmc.run_to_position_steps(400, MovementAbsRel.RELATIVE)
+        motor.feed(recorder.edges)
+        plan = compute_ramp(400, tmc_mc.max_speed, tmc_mc.acceleration)
+        stats = motor.timing_stats(plan.intervals)
+        self.assertEqual(stats["steps"], 400)
+        self.assertIsNotNone(stats["jitter_rms_us"])
+        self.assertIsNotNone(stats["missed_deadlines"])
+
+        recorder.clear()
+        with recorder:
+            tmc.run_to_position_steps(-100, MovementAbsRel.RELATIVE)
+        motor.feed(recorder.edges)
+        self.assertEqual(motor.position, tmc_mc.current_pos)
+        tmc.set_deinitialize_true()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+"""
+test for _tmc_spi_chain.py
+"""
+
+import unittest
+from unittest import mock
+from src.tmc_driver._tmc_logger import *
+from src.tmc_driver.com._tmc_spi_chain import TmcSpiChain
+
+
+class FakeChain():
+    """emulates TMC2240 in a daisy chain"""
+
+    def __init__(self, length):
+        """constructor"""
+        self.registers = [{} for _ in range(length)]
+        self.previous = [0x00] * length
+        self.transfers = 0
+
+    def xfer2(self, tx):
+        """the first datagram is shifted through to the last driver"""
+        self.transfers += 1
+        length = len(self.registers)
+        rx = []
+        for position in range(length - 1, -1, -1):
+            frame = tx[(length - 1 - position) * 5:(length - position) * 5]
+            val = self.registers[position].get(self.previous[position], 0)
+            rx += [0x00, val >> 24 & 0xFF, val >> 16 & 0xFF, val >> 8 & 0xFF, val & 0xFF]
+            if frame[0] & 0x80:
+                self.registers[position][frame[0] & 0x7F] = int.from_bytes(bytes(frame[1:]), "big")
+            self.previous[position] = frame[0] & 0x7F
+        return rx
+
+
+class TestTmcSpiChain(unittest.TestCase):
+    """TestTmcSpiChain"""
+
+    def setUp(self):
+        """setUp"""
+        self.chain = TmcSpiChain(0, 0, 3, tmc_logger=TmcLogger())
+        self.fake = FakeChain(3)
+        self.chain._spi = mock.Mock()
+        self.chain._spi.xfer2.side_effect = self.fake.xfer2
+
+    def test_all(self):
+        """test_all"""
+        self.chain.write_reg_all(0x10, [0x100, 0x200, 0x300])
+        self.assertEqual(self.fake.transfers, 1)
+        self.assertEqual([val for val, _ in self.chain.read_int_all(0x10)], [0x100, 0x200, 0x300])
+        self.assertEqual(self.fake.transfers, 3, "reading all drivers should take 2 transfers")
+
+    def test_node(self):
+        """test_node"""
+        com1 = self.chain.get_com(1)
+        com1.write_reg(0x6C, 0x10000053)
+        self.assertEqual(self.fake.registers[1], {0x6C: 0x10000053})
+        self.assertEqual(self.fake.registers[0], {})
+        self.assertEqual(com1.read_int(0x6C)[0], 0x10000053)
+        self.assertEqual(self.chain.get_com(2).read_int(0x6C)[0], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
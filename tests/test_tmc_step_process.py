@@ -0,0 +1,128 @@
+"""
+test for _tmc_mc_shm_channel.py and _tmc_mc_step_dir_process.py
+"""
+
+import time
+import threading
+import unittest
+from unittest import mock
+from src.tmc_driver.tmc_2209 import *
+from src.tmc_driver.motion_control._tmc_mc_shm_channel import TmcShmChannel
+
+class TestTmcShmChannel(unittest.TestCase):
+    """TestTmcShmChannel"""
+
+    def test_ring(self):
+        """test_ring"""
+        buf = bytearray(TmcShmChannel.SIZE)
+        channel = TmcShmChannel(buf)
+        self.assertIsNone(channel.pop())
+        for i in range(TmcShmChannel.SLOTS):
+            self.assertEqual(channel.push(1, i, 1, 100.0, 200.0, 0.0), i + 1)
+        self.assertIsNone(channel.push(1))
+        self.assertEqual(channel.pending, TmcShmChannel.SLOTS)
+
+        self.assertEqual(channel.pop(), (1, 1, 0, 1, 100.0, 200.0, 0.0))
+        self.assertEqual(channel.push(2, -5), TmcShmChannel.SLOTS + 1)
+        for _ in range(TmcShmChannel.SLOTS - 1):
+            channel.pop()
+        self.assertEqual(channel.pop()[:3], (TmcShmChannel.SLOTS + 1, 2, -5))
+        self.assertIsNone(channel.pop())
+
+        channel.publish(-12, 400, 1500.5, MovementPhase.MAXSPEED.value, StopMode.SOFTSTOP.value)
+        self.assertEqual(channel.status(), (-12, 400, 1500.5, 2, 1))
+        self.assertEqual(channel.read_current_pos(), -12)
+        channel.release()
+
+
+class TestTmcMotionControlStepDirProcess(unittest.TestCase):
+    """TestTmcMotionControlStepDirProcess"""
+
+    def setUp(self):
+        """setUp"""
+        self.tmc = Tmc2209(None, TmcMotionControlStepDirProcess(16, 20, loglevel=Loglevel.ERROR),
+                           loglevel=Loglevel.ERROR)
+
+        # these values are normally set by reading the driver
+        self.tmc.mres = 2
+
+        self.tmc.acceleration_fullstep = 100000
+        self.tmc.max_speed_fullstep = 10000
+        self.tmc.movement_abs_rel = MovementAbsRel.RELATIVE
+
+    def tearDown(self):
+        """tearDown"""
+        self.tmc.tmc_mc.close()
+        self.tmc.set_deinitialize_true()
+
+    def test_run_to_position_steps(self):
+        """test_run_to_position_steps"""
+        tmc_mc = self.tmc.tmc_mc
+        self.assertEqual(self.tmc.run_to_position_steps(400), StopMode.NO)
+        self.assertEqual(tmc_mc.current_pos, 400)
+        self.assertEqual(tmc_mc.movement_phase, MovementPhase.STANDSTILL)
+
+        tmc_mc.ramp_profile = TmcRampSCurve(10000000)
+        tmc_mc.run_to_position_steps_threaded(-200)
+        tmc_mc.run_to_position_steps_threaded(100, MovementAbsRel.ABSOLUTE)
+        self.assertEqual(tmc_mc.wait_for_movement_finished_threaded(), StopMode.NO)
+        self.assertEqual(tmc_mc.current_pos, 100)
+
+        tmc_mc.current_pos = 0
+        self.assertEqual(tmc_mc.current_pos, 0)
+
+    def test_stop(self):
+        """test_stop"""
+        tmc_mc = self.tmc.tmc_mc
+        tmc_mc.run_to_position_steps_threaded(20000)
+        tmc_mc.run_to_position_steps_threaded(100)
+        while tmc_mc.current_pos == 0:
+            time.sleep(0.001)
+        tmc_mc.stop()
+        self.assertEqual(tmc_mc.wait_for_movement_finished_threaded(), StopMode.HARDSTOP)
+        self.assertLess(tmc_mc.current_pos, 20000)
+
+    def test_stop_thread(self):
+        """test_stop_thread"""
+        tmc_mc = self.tmc.tmc_mc
+        channel_push = tmc_mc._channel.push
+        pushing = []
+        overlaps = []
+
+        def push(*args):
+            # the channel has a single producer; a second thread must not enter push
+            pushing.append(None)
+            if len(pushing) > 1:
+                overlaps.append(None)
+            time.sleep(0.0001)
+            seq = channel_push(*args)
+            pushing.pop()
+            return seq
+
+        def stop():
+            for _ in range(20):
+                tmc_mc.stop()
+
+        moves = 2 * TmcShmChannel.SLOTS
+        with mock.patch.object(tmc_mc._channel, "push", side_effect=push):
+            thread = threading.Thread(target=stop)
+            thread.start()
+            for _ in range(moves):
+                tmc_mc.run_to_position_steps_threaded(10)
+            thread.join()
+            self.assertEqual(overlaps, [], "the threads should push one after the other")
+            self.assertEqual(tmc_mc.run_to_position_steps_threaded(10), moves + 20 + 1,
+                             "every command should get its own slot")
+        tmc_mc.wait_for_movement_finished_threaded()
+
+    def test_close(self):
+        """test_close"""
+        tmc_mc = self.tmc.tmc_mc
+        tmc_mc.close()
+        self.assertFalse(tmc_mc.process.is_alive())
+        with self.assertRaises(TmcMotionControlException):
+            tmc_mc.run_to_position_steps(100)
+
+
+if __name__ == '__main__':
+    unittest.main()
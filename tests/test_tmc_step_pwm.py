@@ -0,0 +1,114 @@
+"""
+test for _tmc_mc_step_pwm_dir.py
+"""
+
+import time
+import threading
+import unittest
+from src.tmc_driver.tmc_2209 import *
+from src.tmc_driver.motion_control._tmc_mc_stepped_ramp import compute_stepped_ramp
+from src.tmc_driver.sim._tmc_sim_device import TmcSim2209
+from src.tmc_driver.sim._tmc_sim_io import TmcSimSerial
+
+
+class TmcSim2209Mscnt(TmcSim2209):
+    """TmcSim2209, which answers the given MSCNT values one after another"""
+
+    def __init__(self, mscnt:list):
+        """constructor"""
+        super().__init__(0)
+        self.mscnt = mscnt
+
+    def _value(self, addr:int) -> int:
+        """returns the next MSCNT value"""
+        if addr == 0x6A:
+            return self.mscnt.pop(0)
+        return super()._value(addr)
+
+
+class TestTmcMotionControlStepPwmDir(unittest.TestCase):
+    """TestTmcMotionControlStepPwmDir"""
+
+    def create_tmc(self, tmc_com = None) -> Tmc2209:
+        """returns a Tmc2209 with STEP_PWM/DIR"""
+        tmc = Tmc2209(None, TmcMotionControlStepPwmDir(16, 20), tmc_com, loglevel=Loglevel.ERROR)
+        # these values are normally set by reading the driver
+        tmc.mres = 2
+        tmc.acceleration_fullstep = 100000
+        tmc.max_speed_fullstep = 10000
+        return tmc
+
+    def test_compute_stepped_ramp(self):
+        """test_compute_stepped_ramp"""
+        for steps in [25, 1000, 20000, 100001]:
+            segments = compute_stepped_ramp(steps, 20000, 200000, 0.01)
+            self.assertAlmostEqual(sum(f * d for f, d, _ in segments), steps)
+            self.assertLessEqual(max(f for f, _, _ in segments), 20000)
+            self.assertEqual(segments[0][2], MovementPhase.ACCELERATING)
+            self.assertEqual(segments[-1][2], MovementPhase.DECELERATING)
+        self.assertEqual(compute_stepped_ramp(5, 20000, 200000, 0.01), [])
+        for max_speed, acceleration in [(20000, 0), (0, 200000), (20000, -1)]:
+            with self.assertRaises(TmcMotionControlException):
+                compute_stepped_ramp(1000, max_speed, acceleration, 0.01)
+
+    def test_run_to_position_pwm(self):
+        """test_run_to_position_pwm"""
+        tmc = self.create_tmc()
+        tmc_mc = tmc.tmc_mc
+        self.assertEqual(tmc_mc.run_to_position_pwm(4000, MovementAbsRel.RELATIVE), StopMode.NO)
+        self.assertEqual(tmc_mc.current_pos, 4000)
+        self.assertEqual(tmc_mc.movement_phase, MovementPhase.STANDSTILL)
+        self.assertEqual(tmc_mc.run_to_position_pwm(-1000, MovementAbsRel.ABSOLUTE), StopMode.NO)
+        self.assertEqual(tmc_mc.current_pos, -1000)
+        tmc.set_deinitialize_true()
+
+    def test_stop(self):
+        """test_stop"""
+        tmc = self.create_tmc()
+        tmc_mc = tmc.tmc_mc
+        stop_state = {}
+
+        def stop(stop_mode):
+            stop_state["speed"] = tmc_mc.speed
+            stop_state["time"] = time.perf_counter()
+            tmc_mc.stop(stop_mode)
+
+        for stop_mode in [StopMode.HARDSTOP, StopMode.SOFTSTOP]:
+            tmc_mc.current_pos = 0
+            threading.Timer(0.1, stop, [stop_mode]).start()
+            self.assertEqual(tmc_mc.run_to_position_pwm(1000000, MovementAbsRel.RELATIVE), stop_mode)
+            stop_duration = time.perf_counter() - stop_state["time"]
+            self.assertGreater(tmc_mc.current_pos, 0)
+            self.assertLess(tmc_mc.current_pos, 1000000)
+            self.assertEqual(tmc_mc._target_pos, tmc_mc.current_pos)
+        # the softstop ramps down with the acceleration
+        self.assertGreater(stop_state["speed"], 0)
+        self.assertGreaterEqual(stop_duration, 0.8 * stop_state["speed"] / tmc_mc.acceleration - 0.01)
+        tmc.set_deinitialize_true()
+
+    def test_mscnt_correction(self):
+        """test_mscnt_correction"""
+        # the motor lost 3 µsteps: MSCNT advanced by 997 µsteps of 128 in CW and CCW direction
+        sim = TmcSim2209Mscnt([997 * 128 % 1024, -997 * 128 % 1024])
+        tmc_com = TmcComUart(None, 115200, 0, TmcLogger(Loglevel.ERROR))
+        tmc_com.ser = TmcSimSerial([sim])
+        tmc = self.create_tmc(tmc_com)
+        tmc_mc = tmc.tmc_mc
+
+        tmc_mc.current_pos = 1000
+        tmc_mc._correct_position_mscnt(0, 0)
+        self.assertEqual(tmc_mc.current_pos, 997)
+        tmc_mc.current_pos = -1000
+        tmc_mc._correct_position_mscnt(0, 0)
+        self.assertEqual(tmc_mc.current_pos, -997)
+
+        # the missing steps are made with STEP/DIR
+        tmc_mc.current_pos = 0
+        sim.mscnt = [0, 996 * 128 % 1024]
+        tmc_mc.run_to_position_pwm(996, MovementAbsRel.RELATIVE)
+        self.assertEqual(tmc_mc.current_pos, 996)
+        tmc.set_deinitialize_true()
+
+
+if __name__ == '__main__':
+    unittest.main()
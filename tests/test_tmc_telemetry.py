@@ -0,0 +1,114 @@
+"""
+test for _tmc_telemetry.py
+"""
+
+import time
+import unittest
+from unittest import mock
+from src.tmc_driver.tmc_2209 import *
+from src.tmc_driver.sim._tmc_sim_device import TmcSim2209
+from src.tmc_driver.sim._tmc_sim_io import TmcSimSerial
+from src.tmc_driver import _tmc_telemetry as tmc_telemetry
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class TestTmcTelemetry(unittest.TestCase):
+    """TestTmcTelemetry"""
+
+    def setUp(self):
+        """setUp"""
+        self.sim = TmcSim2209(0)
+        tmc_com = TmcComUart(None, 115200, 0, TmcLogger(Loglevel.ERROR))
+        tmc_com.ser = TmcSimSerial([self.sim])
+        self.tmc = Tmc2209(None, None, tmc_com, loglevel=Loglevel.ERROR)
+
+    def tearDown(self):
+        """tearDown"""
+        self.tmc.set_deinitialize_true()
+
+    def test_poll_array(self):
+        """test_poll_array"""
+        with mock.patch.object(tmc_telemetry, "np", None):
+            telemetry = self._check_poll()
+        self.assertIsInstance(telemetry._buffer, dict)
+
+    @unittest.skipUnless(numpy, "NumPy is not installed")
+    def test_poll_numpy(self):
+        """test_poll_numpy"""
+        telemetry = self._check_poll()
+        self.assertEqual(telemetry._buffer.dtype.names, tuple(telemetry.columns))
+
+    def _check_poll(self) -> TmcTelemetry:
+        """polls into a small ring buffer and checks the samples and stats"""
+        telemetry = TmcTelemetry(self.tmc, size=4)
+        # the TMC2209 has no ADC registers
+        self.assertEqual(telemetry.registers, ["drvstatus", "sgresult", "tstep"])
+        self.assertIsNone(telemetry.latest)
+        self.assertEqual(telemetry.stats(), {})
+
+        for i in range(6):
+            self.sim.registers[0x41] = 100 + i
+            telemetry.poll()
+        self.assertEqual(telemetry.count, 6)
+        self.assertEqual(telemetry.latest["sgresult"], 105)
+        self.assertEqual(telemetry.latest["stst"], 1)
+        self.assertEqual(telemetry.latest["tstep"], 0xFFFFF)
+
+        samples = telemetry.samples()
+        self.assertEqual(list(samples["sgresult"]), [102, 103, 104, 105])
+        self.assertEqual(list(samples["time"]), sorted(samples["time"]))
+        self.assertEqual(telemetry.stats()["sgresult"], (102, 103.5, 105))
+        self.assertEqual(telemetry.stats(0)["sgresult"], (105, 105, 105))
+        return telemetry
+
+    def test_private_registers(self):
+        """test_private_registers"""
+        sgresult = self.tmc.tmc_com.tmc_registers["sgresult"]
+        self.sim.registers[0x41] = 100
+        sgresult.read()
+        telemetry = TmcTelemetry(self.tmc)
+        self.sim.registers[0x41] = 200
+        telemetry.poll()
+        self.assertEqual(telemetry.latest["sgresult"], 200)
+        self.assertEqual(sgresult.sgresult, 100, "polling should not change the registers of the driver")
+        self.assertEqual(sgresult.data_int, 100)
+
+    def test_record(self):
+        """test_record"""
+        telemetry = TmcTelemetry(self.tmc)
+        telemetry.poll()
+        sample = telemetry.record({"sgresult": 300, "tstep": 1000})
+        self.assertEqual(sample["sgresult"], 300)
+        self.assertEqual(sample["tstep"], 1000)
+        self.assertEqual(sample["stst"], 1, "missing registers should keep their last value")
+        self.assertEqual(telemetry.count, 2)
+
+    def test_registers(self):
+        """test_registers"""
+        telemetry = TmcTelemetry(self.tmc, ("tstep",))
+        self.assertEqual(telemetry.columns, ["time", "tstep"])
+        with self.assertRaises(TmcDriverException):
+            TmcTelemetry(self.tmc, ("adc_temp",))
+
+    def test_start_stop(self):
+        """test_start_stop"""
+        telemetry = TmcTelemetry(self.tmc)
+        telemetry.start(0.01)
+        self.assertTrue(telemetry.running)
+        timeout = time.monotonic() + 5
+        while telemetry.count < 3 and time.monotonic() < timeout:
+            time.sleep(0.01)
+        telemetry.stop()
+        self.assertFalse(telemetry.running)
+        self.assertGreaterEqual(telemetry.count, 3)
+        reads = self.sim.reads
+        time.sleep(0.05)
+        self.assertEqual(self.sim.reads, reads, "no reads after stop")
+
+
+if __name__ == '__main__':
+    unittest.main()
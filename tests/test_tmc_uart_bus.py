@@ -0,0 +1,46 @@
+"""
+test for _tmc_uart_bus.py
+"""
+
+import unittest
+from unittest import mock
+from src.tmc_driver._tmc_logger import *
+from src.tmc_driver._tmc_exceptions import TmcComException
+from src.tmc_driver.com._tmc_uart_bus import TmcUartBus
+from src.tmc_driver.com._tmc_com_uart import TmcComUart
+from src.tmc_driver.reg._tmc220x_reg import TStep, DrvStatus
+
+
+class TestTmcUartBus(unittest.TestCase):
+    """TestTmcUartBus"""
+
+    def setUp(self):
+        """setUp"""
+        self.uart_bus = TmcUartBus("/dev/null", 115200, TmcLogger())
+
+    def test_get_com(self):
+        """test_get_com"""
+        com0 = self.uart_bus.get_com(0)
+        com1 = self.uart_bus.get_com(1)
+        self.assertIs(com0, self.uart_bus.get_com(0))
+        self.assertEqual(com1.mtr_id, 1)
+        self.assertIs(com0.ser, com1.ser)
+        self.assertIs(com0._lock, com1._lock)
+        self.assertIs(com0.bus, self.uart_bus)
+        with self.assertRaises(TmcComException):
+            self.uart_bus.get_com(4)
+
+    def test_sweep(self):
+        """test_sweep"""
+        for mtr_id in range(2):
+            tmc_com = self.uart_bus.get_com(mtr_id)
+            tmc_com.tmc_registers = {"tstep": TStep(tmc_com), "drvstatus": DrvStatus(tmc_com)}
+
+        with mock.patch.object(TmcComUart, 'read_int', side_effect=[(1, None), (2, None), (3, None), (4, None)]):
+            result = self.uart_bus.sweep()
+        self.assertEqual(result, {0: {"drvstatus": 1, "tstep": 2}, 1: {"drvstatus": 3, "tstep": 4}})
+        self.assertIs(self.uart_bus.last_sweep, result)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+"""
+test for _tmc_mc_vactual.py
+"""
+
+import threading
+import unittest
+from src.tmc_driver.tmc_2209 import *
+from src.tmc_driver.motion_control._tmc_mc_vactual import compute_vactual_schedule
+from src.tmc_driver.sim._tmc_sim_device import TmcSim2209
+from src.tmc_driver.sim._tmc_sim_io import TmcSimSerial
+import src.tmc_driver._tmc_math as tmc_math
+
+
+class TestTmcMotionControlVActual(unittest.TestCase):
+    """TestTmcMotionControlVActual"""
+
+    def setUp(self):
+        """setUp"""
+        self.sim = TmcSim2209(0)
+        tmc_com = TmcComUart(None, 115200, 0, TmcLogger(Loglevel.ERROR))
+        tmc_com.ser = TmcSimSerial([self.sim])
+        self.tmc = Tmc2209(None, TmcMotionControlVActual(), tmc_com, loglevel=Loglevel.ERROR)
+        self.tmc.set_microstepping_resolution(2)
+        self.tmc.acceleration_fullstep = 4000
+        self.tmc.max_speed_fullstep = 1000
+
+    def tearDown(self):
+        """tearDown"""
+        self.tmc.set_deinitialize_true()
+
+    def test_compute_vactual_schedule(self):
+        """test_compute_vactual_schedule"""
+        for steps in [3, 500, 5000, -5000]:
+            schedule = compute_vactual_schedule(steps, 2000, 8000, 100)
+            moved = sum(tmc_math.vactual_to_steps(v) * d for v, d, _ in schedule)
+            self.assertAlmostEqual(moved, steps)
+            self.assertLessEqual(max(abs(v) for v, _, _ in schedule), tmc_math.steps_to_vactual(2000))
+        # a larger velocity error needs fewer writes
+        self.assertLess(len(compute_vactual_schedule(5000, 2000, 8000, 400)),
+                        len(compute_vactual_schedule(5000, 2000, 8000, 100)))
+        for max_speed, acceleration in [(2000, 0), (0, 8000)]:
+            with self.assertRaises(TmcMotionControlException):
+                compute_vactual_schedule(5000, max_speed, acceleration, 100)
+
+    def test_run_to_position_steps(self):
+        """test_run_to_position_steps"""
+        tmc_mc = self.tmc.tmc_mc
+        reads = self.sim.reads
+        writes = self.sim.writes
+        self.assertEqual(tmc_mc.run_to_position_steps(1000, MovementAbsRel.RELATIVE), StopMode.NO)
+        # VACTUAL is only written
+        self.assertEqual(self.sim.reads, reads)
+        self.assertGreater(self.sim.writes - writes, 5, "VACTUAL should be ramped")
+        self.assertEqual(self.sim.registers[0x22], 0)
+        self.assertEqual(tmc_mc.movement_phase, MovementPhase.STANDSTILL)
+        self.assertAlmostEqual(tmc_mc.current_pos, 1000, delta=5)
+        self.assertAlmostEqual(tmc_mc.current_pos, self.sim.position, delta=10)
+
+        self.assertEqual(tmc_mc.run_to_position_steps(-200, MovementAbsRel.ABSOLUTE), StopMode.NO)
+        self.assertAlmostEqual(tmc_mc.current_pos, -200, delta=5)
+        self.assertAlmostEqual(tmc_mc.current_pos, self.sim.position, delta=10)
+
+    def test_stop(self):
+        """test_stop"""
+        tmc_mc = self.tmc.tmc_mc
+        for stop_mode in [StopMode.HARDSTOP, StopMode.SOFTSTOP]:
+            start = tmc_mc.current_pos
+            threading.Timer(0.2, tmc_mc.stop, [stop_mode]).start()
+            self.assertEqual(tmc_mc.run_to_position_steps(100000, MovementAbsRel.RELATIVE), stop_mode)
+            self.assertEqual(self.sim.registers[0x22], 0)
+            self.assertGreater(tmc_mc.current_pos, start)
+            self.assertLess(tmc_mc.current_pos, start + 100000)
+            self.assertAlmostEqual(tmc_mc.current_pos, self.sim.position, delta=10)
+
+    def test_feedback(self):
+        """test_feedback"""
+        tmc_mc = self.tmc.tmc_mc
+        # the motor follows VACTUAL 1 ms late, which the open loop integration does not know
+        self.sim.vactual_latency = 0.001
+        # MSCNT resolves the position within 4 fullsteps = 64 µsteps
+        self.tmc.set_microstepping_resolution(16)
+        self.tmc.acceleration_fullstep = 4000
+        self.tmc.max_speed_fullstep = 1000
+        tmc_mc.current_pos = 0
+        tmc_mc.feedback_interval = 0.02
+        for target in [8000, -2667, 80]:
+            self.assertEqual(tmc_mc.run_to_position_steps(target, MovementAbsRel.ABSOLUTE), StopMode.NO)
+            self.assertEqual(tmc_mc.current_pos, target)
+            self.assertEqual(round(self.sim.position), target)
+            self.assertEqual(self.sim.registers[0x22], 0)
+        self.assertEqual(tmc_mc.measured_speed, 0)
+
+        threading.Timer(0.2, tmc_mc.stop, [StopMode.HARDSTOP]).start()
+        self.assertEqual(tmc_mc.run_to_position_steps(100000, MovementAbsRel.RELATIVE), StopMode.HARDSTOP)
+        self.assertEqual(tmc_mc.current_pos, round(self.sim.position))
+
+
+if __name__ == '__main__':
+    unittest.main()
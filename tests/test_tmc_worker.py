@@ -0,0 +1,97 @@
+"""
+test for _tmc_mc_worker.py
+"""
+
+import gc
+import os
+import threading
+import unittest
+from src.tmc_driver.tmc_2209 import *
+
+class TestTmcStepWorker(unittest.TestCase):
+    """TestTmcStepWorker"""
+
+    def setUp(self):
+        """setUp"""
+        self.tmc = Tmc2209(None, TmcMotionControlStepDir(16, 20), loglevel=Loglevel.ERROR)
+
+        # these values are normally set by reading the driver
+        self.tmc.mres = 2
+
+        self.tmc.acceleration_fullstep = 100000
+        self.tmc.max_speed_fullstep = 10000
+        self.tmc.movement_abs_rel = MovementAbsRel.RELATIVE
+
+    def tearDown(self):
+        """tearDown"""
+        self.tmc.set_deinitialize_true()
+
+    def test_one_thread(self):
+        """test_one_thread"""
+        tmc_mc = self.tmc.tmc_mc
+        threads = set()
+        def record_thread(stop_mode):
+            threads.add(threading.get_ident())
+            return stop_mode
+
+        futures = [tmc_mc.run_to_position_steps_threaded(100) for _ in range(3)]
+        futures.append(tmc_mc.submit_movement(record_thread, StopMode.NO))
+        futures.append(tmc_mc.submit_movement(record_thread, StopMode.NO))
+        self.assertEqual(tmc_mc.wait_for_movement_finished_threaded(), StopMode.NO)
+        self.assertEqual([f.result() for f in futures], [StopMode.NO] * 5)
+        self.assertEqual(tmc_mc.current_pos, 300)
+        self.assertEqual(len(threads), 1)
+        self.assertNotIn(threading.get_ident(), threads)
+        self.assertIs(tmc_mc.step_worker.running, True)
+
+        tmc_mc.stop_step_worker()
+        self.assertIsNone(tmc_mc.step_worker)
+
+    def test_stop_cancels_pending(self):
+        """test_stop_cancels_pending"""
+        tmc_mc = self.tmc.tmc_mc
+        first = tmc_mc.run_to_position_steps_threaded(100000)
+        second = tmc_mc.run_to_position_steps_threaded(100)
+        while tmc_mc.current_pos == 0:
+            pass
+        tmc_mc.stop()
+        self.assertEqual(first.result(), StopMode.HARDSTOP)
+        self.assertTrue(second.cancelled())
+        self.assertLess(tmc_mc.current_pos, 100000)
+
+    def test_gc_mode(self):
+        """test_gc_mode"""
+        gc_state = []
+        def gc_info():
+            gc_state.append((gc.isenabled(), gc.get_freeze_count() > 0))
+
+        worker = TmcStepWorker(gc_mode=GcMode.DISABLE)
+        worker.submit(gc_info).result()
+        worker.stop()
+        worker = TmcStepWorker(gc_mode=GcMode.FREEZE)
+        worker.submit(gc_info).result()
+        worker.stop()
+        self.assertEqual(gc_state, [(False, False), (True, True)])
+        self.assertTrue(gc.isenabled())
+        self.assertEqual(gc.get_freeze_count(), 0)
+
+    def test_realtime(self):
+        """test_realtime"""
+        cpu = min(os.sched_getaffinity(0))
+        affinity = []
+        worker = TmcStepWorker(cpus={cpu}, priority=10, tmc_logger=TmcLogger(Loglevel.NONE))
+        worker.submit(lambda: affinity.append(os.sched_getaffinity(0))).result()
+        worker.stop()
+        self.assertEqual(affinity, [{cpu}])
+        # SCHED_FIFO needs CAP_SYS_NICE; without it, the worker still runs
+        if worker.realtime:
+            self.assertEqual(os.sched_getscheduler(0), os.SCHED_OTHER)
+
+        worker = TmcStepWorker(gc_mode=GcMode.NONE)
+        with self.assertRaises(ZeroDivisionError):
+            worker.submit(lambda: 1 / 0).result()
+        worker.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()